@@ -22,11 +22,11 @@ from chatkit.types import (
     UserMessageTextContent,
     WidgetItem,
 )
+from chatkit_store import ThreadStore, create_store
 from openai.types.responses import ResponseInputContentParam
 from pydantic import Field
 
 from .agents.cupid_agent import cupid_agent
-from .memory_store import MemoryStore
 from .request_context import RequestContext
 from .thread_item_converter import BasicThreadItemConverter
 from .widgets.profilecard_widget import build_profilecard_widget
@@ -37,7 +37,7 @@ logging.basicConfig(level=logging.INFO)
 class CupidAgentContext(AgentContext):
     """Context for the Cupid game agent."""
 
-    store: Annotated[MemoryStore, Field(exclude=True)]
+    store: Annotated[ThreadStore, Field(exclude=True)]
     request_context: RequestContext
 
 
@@ -45,7 +45,7 @@ class CupidServer(ChatKitServer[RequestContext]):
     """ChatKit server for Cupid romantic matchmaking game."""
 
     def __init__(self) -> None:
-        self.store: MemoryStore = MemoryStore()
+        self.store: ThreadStore = create_store()
         super().__init__(self.store)
         self.thread_item_converter = BasicThreadItemConverter()
 
@@ -1 +1,62 @@
 # Cupid agents package
+"""Agents and their context classes, imported on first attribute access.
+
+Each agent module reads its instructions file and builds its `Agent` when it
+is imported. Importing them here lazily (PEP 562) keeps that work out of
+server start-up, so the first chat that reaches a chapter pays it instead:
+
+    from . import agents as cupid_agents
+    cupid_agents.mortal_agent, cupid_agents.MortalContext(state_mortal=...)
+"""
+
+from __future__ import annotations
+
+import importlib
+import sys
+from typing import Any, Dict, List
+
+# Exported name -> module in this package that defines it
+_EXPORTS: Dict[str, str] = {
+    "introduction_agent": "introduction_agent",
+    "mortal_agent": "mortal_agent",
+    "MortalContext": "mortal_agent",
+    "match_agent": "match_agent",
+    "MatchContext": "match_agent",
+    "start_cupid_game_agent": "start_cupid_game_agent",
+    "cupid_evaluation_agent": "cupid_evaluation_agent",
+    "end_agent": "end_agent",
+    "display_mortal_agent": "display_mortal_agent",
+    "DisplayMortalContext": "display_mortal_agent",
+    "display_match_agent": "display_match_agent",
+    "DisplayMatchContext": "display_match_agent",
+    "display_compatibility_card_agent": "display_compatibility_card_agent",
+    "DisplayCompatibilityCardContext": "display_compatibility_card_agent",
+    "compatibility_analysis_agent": "compatibility_analysis_agent",
+    "display_choices_agent": "display_choices_agent",
+    "DisplayChoicesContext": "display_choices_agent",
+    "has_ended_agent": "has_ended_agent",
+    "HasEndedContext": "has_ended_agent",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(f".{module_name}", __name__)
+    # Importing the submodule binds its name (e.g. `mortal_agent`) to the module
+    # object here, so rebind every export it defines; later lookups then skip
+    # __getattr__ entirely.
+    for export, source in _EXPORTS.items():
+        if source == module_name:
+            globals()[export] = getattr(module, export)
+    return globals()[name]
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_EXPORTS))
+
+
+def loaded() -> List[str]:
+    """Agent modules imported so far."""
+    return sorted({module for module in _EXPORTS.values() if f"{__name__}.{module}" in sys.modules})
@@ -0,0 +1,215 @@
+"""Chapter execution mode and timings for CupidServer.
+
+In "parallel" mode (the default) the structured-output display agents, which only
+need the YAML context, start as soon as a chapter begins and run while the
+narrative streams. Their widgets are still emitted at the same point as in
+"sequential" mode, so the conversation looks the same; only the wall clock
+changes. Set CUPID_CHAPTER_MODE=sequential to run every agent one after another.
+
+Display runs can also be served from a `DisplayOutputCache`, in which case a
+repeated couple costs no model call at all.
+
+After each chapter 4 scene the HasEnded and DisplayChoices classifiers decide
+what comes next. CUPID_CHOICES_MODE picks how they run:
+
+- "serial" (default): HasEnded, then DisplayChoices if the story goes on.
+- "speculative": both start when the narrative ends; the choices are discarded
+  (and their run cancelled) if the story has ended.
+- "early": as speculative, but HasEnded starts on the partial narrative as soon
+  as an OPTION marker streams in. A narrative that is offering options has not
+  ended, and by the time the stream finishes the answer is usually in.
+  DisplayChoices still waits for the full narrative, since it needs every option.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import re
+import statistics
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Literal, Tuple
+
+from agents import Agent, Runner
+
+from .display_cache import DisplayOutputCache
+
+ChapterMode = Literal["sequential", "parallel"]
+ChoicesMode = Literal["serial", "speculative", "early"]
+
+# "OPTION A:" etc. in the StartCupidGame narrative
+OPTION_MARKER = re.compile(r"\bOPTION [A-D]\b")
+
+
+def chapter_mode_from_env() -> ChapterMode:
+    """Read CUPID_CHAPTER_MODE ("parallel" by default)."""
+    mode = os.getenv("CUPID_CHAPTER_MODE", "parallel").lower()
+    if mode not in ("sequential", "parallel"):
+        raise ValueError(f"Unknown CUPID_CHAPTER_MODE: {mode}")
+    return mode  # type: ignore[return-value]
+
+
+def choices_mode_from_env() -> ChoicesMode:
+    """Read CUPID_CHOICES_MODE ("serial" by default)."""
+    mode = os.getenv("CUPID_CHOICES_MODE", "serial").lower()
+    if mode not in ("serial", "speculative", "early"):
+        raise ValueError(f"Unknown CUPID_CHOICES_MODE: {mode}")
+    return mode  # type: ignore[return-value]
+
+
+@dataclass
+class ChapterStats:
+    """Accumulated timings for one chapter in one execution mode."""
+
+    turns: int = 0
+    wall_seconds: float = 0.0
+    # Time display agents ran concurrently with the narrative (0 in sequential mode).
+    overlap_seconds: float = 0.0
+
+
+class ChapterTimings:
+    """Per-chapter wall clock, split by execution mode."""
+
+    def __init__(self, max_samples: int = 1000) -> None:
+        self._stats: Dict[Tuple[int, ChapterMode], ChapterStats] = {}
+        # Seconds from the end of a chapter 4 narrative to its choice widget, per mode
+        self._choice_latency: Dict[ChoicesMode, Deque[float]] = {}
+        self._max_samples = max_samples
+
+    def stats(self, chapter: int, mode: ChapterMode) -> ChapterStats:
+        return self._stats.setdefault((chapter, mode), ChapterStats())
+
+    def record_turn(self, chapter: int, mode: ChapterMode, wall_seconds: float) -> None:
+        stats = self.stats(chapter, mode)
+        stats.turns += 1
+        stats.wall_seconds += wall_seconds
+
+    def record_choice_latency(self, mode: ChoicesMode, seconds: float) -> None:
+        samples = self._choice_latency.setdefault(mode, deque(maxlen=self._max_samples))
+        samples.append(seconds)
+
+    def report(self) -> Dict[str, Any]:
+        """Mean wall clock per chapter and mode, and the time saved by parallel mode.
+
+        `saved_ms` is the mean time display agents ran concurrently with the narrative;
+        `vs_sequential_ms` compares mean wall clock when both modes were observed.
+        `choices` has the median and p95 time from the end of a chapter 4 narrative
+        to its choice widget, per CUPID_CHOICES_MODE, over the latest turns.
+        """
+        report: Dict[str, Any] = {}
+        for (chapter, mode), stats in sorted(self._stats.items()):
+            if not stats.turns:
+                continue
+            entry = report.setdefault(f"chapter_{chapter}", {})
+            entry[mode] = {
+                "turns": stats.turns,
+                "mean_wall_ms": round(stats.wall_seconds / stats.turns * 1000, 1),
+                "saved_ms": round(stats.overlap_seconds / stats.turns * 1000, 1),
+            }
+        for entry in report.values():
+            if "sequential" in entry and "parallel" in entry:
+                entry["vs_sequential_ms"] = round(
+                    entry["sequential"]["mean_wall_ms"] - entry["parallel"]["mean_wall_ms"], 1
+                )
+        for mode, samples in sorted(self._choice_latency.items()):
+            ordered = sorted(samples)
+            report.setdefault("choices", {})[mode] = {
+                "turns": len(ordered),
+                "median_ms": round(statistics.median(ordered) * 1000, 1),
+                "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 1),
+            }
+        return report
+
+
+class PendingAgentRun:
+    """A non-streaming agent run that starts now (parallel) or when awaited (sequential).
+
+    Call `output()` where the final output is needed and `cancel()` in a `finally` so
+    an early-started run never outlives its chapter. The first outcome (output or
+    exception) is kept, so later `output()` calls never run the agent again. With a
+    `cache`, the output is
+    looked up by the agent and `cache_input` (the data string the context was built
+    from) before running. A known `output` (e.g. prerendered at startup) skips the run.
+    """
+
+    def __init__(
+        self,
+        agent: Agent[Any],
+        input: str,
+        context: Any,
+        mode: ChapterMode,
+        stats: ChapterStats,
+        cache: DisplayOutputCache | None = None,
+        cache_input: str | None = None,
+        output: Any = None,
+    ) -> None:
+        self._agent = agent
+        self._input = input
+        self._context = context
+        self._stats = stats
+        self._cache = cache if cache_input is not None else None
+        self._cache_input = cache_input
+        self._started: float | None = None
+        self._finished: float | None = None
+        self._output = output
+        self._has_output = output is not None
+        self._error: Exception | None = None
+        self._task: asyncio.Task[Any] | None = None
+        if mode == "parallel" and output is None:
+            self._task = asyncio.create_task(self._run())
+            # Retrieve the outcome even if nobody awaits it (e.g. the story ended and
+            # the choices run was discarded), so a failure isn't reported as
+            # "Task exception was never retrieved"
+            self._task.add_done_callback(_consume_outcome)
+
+    async def _run(self) -> Any:
+        self._started = time.perf_counter()
+        if self._cache is None or self._cache_input is None:
+            output = await self._run_agent()
+        else:
+            key = await self._cache.key(self._agent, self._context, self._cache_input)
+            output = await self._cache.get_or_run(key, self._agent.output_type, self._run_agent)
+        self._finished = time.perf_counter()
+        return output
+
+    async def _run_agent(self) -> Any:
+        result = await Runner.run(self._agent, self._input, context=self._context)
+        return result.final_output
+
+    async def output(self) -> Any:
+        if self._error is not None:
+            raise self._error
+        if self._has_output:
+            return self._output
+        try:
+            if self._task is None:
+                self._output = await self._run()
+            else:
+                self._output = await self._task
+        except Exception as exc:
+            self._error = exc
+            raise
+        self._has_output = True
+        return self._output
+
+    def record_overlap(self, started: float, finished: float) -> None:
+        """Credit the time this run shared with another span (e.g. the narrative stream).
+
+        Both are `time.perf_counter()` values; in sequential mode the spans never
+        overlap, so nothing is credited.
+        """
+        if self._started is None or self._finished is None:
+            return
+        overlap = min(self._finished, finished) - max(self._started, started)
+        self._stats.overlap_seconds += max(0.0, overlap)
+
+    def cancel(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+
+
+def _consume_outcome(task: asyncio.Task[Any]) -> None:
+    if not task.cancelled():
+        task.exception()
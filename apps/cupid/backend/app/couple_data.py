@@ -0,0 +1,192 @@
+"""Interned couple data referenced from thread.metadata.
+
+A thread used to carry full copies of the mortal, match and compatibility dicts
+in its metadata. Every save deep-copied them, and every chapter turn re-dumped
+them to YAML. Threads now store a small reference instead:
+
+    thread.metadata["couple"] = {"match_id": "ethan_murphy", "version": "3f9c..."}
+
+`version` is a content hash of the three dicts. `CoupleRegistry` maps it to a
+single shared `CoupleData` holding the dicts and their pre-dumped YAML, so
+every thread playing the same couple shares one copy. Each distinct couple is
+also written once to `<data>/couples/<version>.json`, so references still
+resolve after a restart or after today's data has been rotated.
+
+Couples come from client POSTs, so the directory is capped at `max_files`:
+resolving a couple refreshes its file's mtime, and the least recently used
+files not resident in memory are deleted once the cap is exceeded. A thread whose file was pruned
+falls back to the default couple, like any unresolvable reference.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict
+
+from .yaml_cache import render_yaml
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CoupleData:
+    """One couple's data and its YAML, shared by every thread that plays it."""
+
+    version: str
+    mortal: Dict[str, Any]
+    match: Dict[str, Any]
+    compatibility: Dict[str, Any]
+    mortal_str: str
+    match_str: str
+    compatibility_str: str
+
+    @property
+    def mortal_name(self) -> str:
+        return self.mortal.get("name", "")
+
+    @property
+    def match_name(self) -> str:
+        return self.match.get("name", "")
+
+
+class CoupleRegistry:
+    """Content-addressed couples: in-memory LRU backed by a bounded LRU of JSON files."""
+
+    def __init__(
+        self,
+        data_dir: Path | None = None,
+        max_entries: int = 1024,
+        max_files: int = 10_000,
+    ) -> None:
+        self._data_dir = data_dir
+        self._max_entries = max_entries
+        self._max_files = max(1, max_files)
+        # Files on disk, counted on first write; other workers' writes are only
+        # seen at the next prune, which recounts
+        self._file_count: int | None = None
+        self._couples: OrderedDict[str, CoupleData] = OrderedDict()
+
+    @staticmethod
+    def version_of(mortal: Dict[str, Any], match: Dict[str, Any], compatibility: Dict[str, Any]) -> str:
+        # Same canonical form as yaml_cache, so YAML-only types (dates) hash too
+        canonical = json.dumps(
+            [mortal, match, compatibility], sort_keys=True, separators=(",", ":"), default=str
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:24]
+
+    def register(
+        self,
+        mortal: Dict[str, Any],
+        match: Dict[str, Any],
+        compatibility: Dict[str, Any],
+    ) -> CoupleData:
+        """Intern a couple, returning the shared instance for identical data."""
+        version = self.version_of(mortal, match, compatibility)
+        couple = self._get(version)
+        if couple is not None:
+            return couple
+        couple = self._build(version, mortal, match, compatibility)
+        self._persist(couple)
+        return couple
+
+    def resolve(self, version: str) -> CoupleData | None:
+        """The couple for a reference's version, from memory or disk."""
+        couple = self._get(version)
+        if couple is not None or self._data_dir is None:
+            return couple
+        path = self._data_dir / f"{version}.json"
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            # Mark it recently used, so pruning keeps couples that are still played
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return self._build(version, data["mortal"], data["match"], data["compatibility"])
+
+    @staticmethod
+    def reference(couple: CoupleData, match_id: str | None) -> Dict[str, Any]:
+        """The compact form stored in thread.metadata["couple"]."""
+        return {"match_id": match_id, "version": couple.version}
+
+    def stats(self) -> Dict[str, Any]:
+        return {"couples": len(self._couples)}
+
+    def _get(self, version: str) -> CoupleData | None:
+        couple = self._couples.get(version)
+        if couple is not None:
+            self._couples.move_to_end(version)
+        return couple
+
+    def _build(
+        self,
+        version: str,
+        mortal: Dict[str, Any],
+        match: Dict[str, Any],
+        compatibility: Dict[str, Any],
+    ) -> CoupleData:
+        couple = CoupleData(
+            version=version,
+            mortal=mortal,
+            match=match,
+            compatibility=compatibility,
+            # Shared renderings: today's mortal is dumped once for all of its couples
+            mortal_str=render_yaml(mortal),
+            match_str=render_yaml(match),
+            compatibility_str=render_yaml(compatibility),
+        )
+        self._couples[version] = couple
+        while len(self._couples) > self._max_entries:
+            self._couples.popitem(last=False)
+        return couple
+
+    def _persist(self, couple: CoupleData) -> None:
+        if self._data_dir is None:
+            return
+        path = self._data_dir / f"{couple.version}.json"
+        if path.exists():
+            os.utime(path)
+            return
+        self._data_dir.mkdir(parents=True, exist_ok=True)
+        if self._file_count is None:
+            self._file_count = sum(1 for _ in self._data_dir.glob("*.json"))
+        payload = {"mortal": couple.mortal, "match": couple.match, "compatibility": couple.compatibility}
+        # Write then rename so a concurrent worker never reads a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=self._data_dir, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False, default=str)
+        os.replace(tmp_path, path)
+        self._file_count += 1
+        if self._file_count > self._max_files:
+            self._prune()
+
+    def _prune(self) -> None:
+        """Delete the least recently used files, down to 90% of `max_files`.
+
+        Couples resident in this process are kept even if their files are old.
+        """
+        assert self._data_dir is not None
+        files = []
+        for path in self._data_dir.glob("*.json"):
+            try:
+                files.append((path.stat().st_mtime, path))
+            except FileNotFoundError:
+                continue  # pruned by another worker
+        files.sort()
+        excess = len(files) - int(self._max_files * 0.9)
+        removed = 0
+        for _, path in files:
+            if removed >= excess:
+                break
+            if path.stem in self._couples:
+                continue
+            path.unlink(missing_ok=True)
+            removed += 1
+        self._file_count = len(files) - removed
+        logger.info(f"Pruned {removed} couple files from {self._data_dir}")
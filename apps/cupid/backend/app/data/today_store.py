@@ -1,19 +1,61 @@
 """Today's data store for Cupid Deluxe.
 
 Handles loading mortal, matches, and compatibility data from YAML files.
+
+The loaded data is an immutable `TodaySnapshot`. Reloading re-parses only the
+files whose mtime or size changed, builds a new snapshot (including the
+serialized and gzipped `/api/today` body and its ETag) and swaps it in with a single
+assignment, so readers never block on or observe a partial reload.
+`start_watching()` polls the directory and reloads when the daily data is rotated.
 """
 
 from __future__ import annotations
 
+import asyncio
+import gzip
+import hashlib
+import json
 import logging
+import threading
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Tuple
 
 import yaml
 
 logger = logging.getLogger(__name__)
 
 
+def _person_id(path: Path) -> str:
+    """ID from a person filename (e.g., ethan_murphy_person.yaml -> ethan_murphy)."""
+    return path.stem.replace("_person", "")
+
+
+@dataclass(frozen=True)
+class TodaySnapshot:
+    """One consistent version of today's data."""
+
+    mortal: Dict[str, Any]
+    mortal_id: str
+    matches: List[Dict[str, Any]]
+    # Compatibility data for today's mortal, keyed by match ID
+    compatibility: Dict[str, Dict[str, Any]]
+    # (mortal_id, match_id) -> compatibility data, for every file in compatibility/
+    compatibility_index: Mapping[Tuple[str, str], Dict[str, Any]]
+    # JSON body served by /api/today, pre-compressed copy, and ETag (a quoted content hash)
+    body: bytes
+    gzip_body: bytes
+    etag: str
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "mortal": self.mortal,
+            "matches": self.matches,
+            "compatibility": self.compatibility,
+        }
+
+
 class TodayDataStore:
     """Loads and provides access to today's matchmaking data."""
 
@@ -21,77 +63,173 @@ class TodayDataStore:
         if data_dir is None:
             data_dir = Path(__file__).parent / "today"
         self._data_dir = data_dir
-        self._cache: Dict[str, Any] | None = None
-
-    def _load_mortal(self) -> Dict[str, Any]:
+        self._snapshot: TodaySnapshot | None = None
+        # path -> ((mtime_ns, size), parsed YAML); lets a reload skip unchanged files
+        self._files: Dict[Path, Tuple[Tuple[int, int], Any]] = {}
+        # (mtime_ns, size) of every YAML file as of the last reload
+        self._signatures: Dict[Path, Tuple[int, int]] = {}
+        self._reload_lock = threading.Lock()
+        self._reload_listeners: List[Callable[[Dict[str, Any]], None]] = []
+        self._watch_task: asyncio.Task[None] | None = None
+
+    def add_reload_listener(self, listener: Callable[[Dict[str, Any]], None]) -> None:
+        """Call `listener` with the new data every time the files are (re)loaded."""
+        self._reload_listeners.append(listener)
+
+    def _read_yaml(self, path: Path, files: Dict[Path, Tuple[Tuple[int, int], Any]]) -> Any:
+        """Parse `path`, reusing the previous parse if the file is unchanged."""
+        stat = path.stat()
+        signature = (stat.st_mtime_ns, stat.st_size)
+        cached = self._files.get(path)
+        if cached is not None and cached[0] == signature:
+            data = cached[1]
+        else:
+            with open(path, "r", encoding="utf-8") as f:
+                data = yaml.safe_load(f)
+        files[path] = (signature, data)
+        return data
+
+    def _load_mortal(self, files: Dict[Path, Tuple[Tuple[int, int], Any]]) -> Tuple[str, Dict[str, Any]]:
         """Load the mortal's data (single file in mortal directory)."""
         mortal_dir = self._data_dir / "mortal"
-        mortal_files = list(mortal_dir.glob("*.yaml"))
+        mortal_files = sorted(mortal_dir.glob("*.yaml"))
         if not mortal_files:
             raise FileNotFoundError("No mortal data found")
-        with open(mortal_files[0], "r", encoding="utf-8") as f:
-            return yaml.safe_load(f)
+        return _person_id(mortal_files[0]), self._read_yaml(mortal_files[0], files)
 
-    def _load_matches(self) -> List[Dict[str, Any]]:
+    def _load_matches(self, files: Dict[Path, Tuple[Tuple[int, int], Any]]) -> List[Dict[str, Any]]:
         """Load all matches from the matches directory."""
         matches_dir = self._data_dir / "matches"
-        matches = []
-        for match_file in sorted(matches_dir.glob("*.yaml")):
-            with open(match_file, "r", encoding="utf-8") as f:
-                match_data = yaml.safe_load(f)
-            # Extract ID from filename (e.g., ethan_murphy_person.yaml -> ethan_murphy)
-            match_id = match_file.stem.replace("_person", "")
-            matches.append({"id": match_id, "data": match_data})
-        return matches
-
-    def _load_compatibility(self, mortal_name: str) -> Dict[str, Dict[str, Any]]:
-        """Load compatibility data for all matches."""
+        return [
+            {"id": _person_id(match_file), "data": self._read_yaml(match_file, files)}
+            for match_file in sorted(matches_dir.glob("*.yaml"))
+        ]
+
+    def _load_compatibility(
+        self,
+        person_ids: List[str],
+        files: Dict[Path, Tuple[Tuple[int, int], Any]],
+    ) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """Index compatibility files ({mortal}_{match}_compatibility.yaml) by (mortal, match)."""
         compat_dir = self._data_dir / "compatibility"
-        compatibility: Dict[str, Dict[str, Any]] = {}
-        mortal_name_normalized = mortal_name.lower().replace(" ", "_")
-
-        for compat_file in compat_dir.glob("*.yaml"):
-            with open(compat_file, "r", encoding="utf-8") as f:
-                compat_data = yaml.safe_load(f)
-            # Parse: {mortal}_{match}_compatibility.yaml
+        # Longest first, so "ana_lee" wins over "ana" when both are known
+        prefixes = sorted(person_ids, key=len, reverse=True)
+        index: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for compat_file in sorted(compat_dir.glob("*.yaml")):
             stem = compat_file.stem.replace("_compatibility", "")
-            if stem.startswith(mortal_name_normalized):
-                match_id = stem[len(mortal_name_normalized) + 1:]  # +1 for underscore
-                compatibility[match_id] = compat_data
-
-        return compatibility
+            mortal_id = next((p for p in prefixes if stem.startswith(p + "_")), None)
+            if mortal_id is None:
+                continue
+            match_id = stem[len(mortal_id) + 1:]  # +1 for underscore
+            index[(mortal_id, match_id)] = self._read_yaml(compat_file, files)
+        return index
+
+    def _build_snapshot(self) -> Tuple[TodaySnapshot, Dict[Path, Tuple[Tuple[int, int], Any]]]:
+        files: Dict[Path, Tuple[Tuple[int, int], Any]] = {}
+        mortal_id, mortal = self._load_mortal(files)
+        matches = self._load_matches(files)
+        index = self._load_compatibility([mortal_id] + [m["id"] for m in matches], files)
+
+        compatibility = {
+            match_id: compat for (m_id, match_id), compat in index.items() if m_id == mortal_id
+        }
+        data = {"mortal": mortal, "matches": matches, "compatibility": compatibility}
+        # Same encoding as FastAPI's JSONResponse; YAML dates are written as strings,
+        # as couple_data and yaml_cache do, instead of failing the reload
+        body = json.dumps(data, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+        snapshot = TodaySnapshot(
+            mortal=mortal,
+            mortal_id=mortal_id,
+            matches=matches,
+            compatibility=compatibility,
+            compatibility_index=MappingProxyType(index),
+            body=body,
+            # mtime=0 keeps the compressed bytes identical across reloads and workers
+            gzip_body=gzip.compress(body, compresslevel=9, mtime=0),
+            etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+        )
+        return snapshot, files
+
+    def snapshot(self, force_reload: bool = False) -> TodaySnapshot:
+        """The current snapshot, loading it on first use."""
+        snapshot = self._snapshot
+        if snapshot is not None and not force_reload:
+            return snapshot
+        self.reload()
+        assert self._snapshot is not None
+        return self._snapshot
+
+    def reload(self) -> bool:
+        """Re-read changed files and swap in a new snapshot if anything changed.
+
+        Returns True (and notifies the reload listeners) when the content changed.
+        """
+        with self._reload_lock:
+            logger.info("Loading today's matchmaking data")
+            signatures = self._current_signatures()
+            snapshot, files = self._build_snapshot()
+            previous = self._snapshot
+            self._files = files
+            self._signatures = signatures
+            if previous is not None and previous.etag == snapshot.etag:
+                return False
+            self._snapshot = snapshot
+        data = snapshot.as_dict()
+        for listener in self._reload_listeners:
+            listener(data)
+        return True
+
+    def reload_if_changed(self) -> bool:
+        """Reload if any file under the data directory was added, removed or modified."""
+        if self._snapshot is not None and self._current_signatures() == self._signatures:
+            return False
+        return self.reload()
+
+    def _current_signatures(self) -> Dict[Path, Tuple[int, int]]:
+        signatures: Dict[Path, Tuple[int, int]] = {}
+        for subdir in ("mortal", "matches", "compatibility"):
+            for path in (self._data_dir / subdir).glob("*.yaml"):
+                stat = path.stat()
+                signatures[path] = (stat.st_mtime_ns, stat.st_size)
+        return signatures
+
+    def start_watching(self, poll_interval: float = 5.0) -> None:
+        """Poll for changes from a background task (call from a running event loop)."""
+        if self._watch_task is None and poll_interval > 0:
+            self._watch_task = asyncio.create_task(self._watch(poll_interval))
+
+    async def stop_watching(self) -> None:
+        if self._watch_task is not None:
+            self._watch_task.cancel()
+            await asyncio.gather(self._watch_task, return_exceptions=True)
+            self._watch_task = None
+
+    async def _watch(self, poll_interval: float) -> None:
+        while True:
+            await asyncio.sleep(poll_interval)
+            try:
+                if await asyncio.to_thread(self.reload_if_changed):
+                    logger.info("Today's data changed on disk; swapped in the new snapshot")
+            except (FileNotFoundError, yaml.YAMLError) as e:
+                # Mid-rotation: keep serving the previous snapshot and retry next poll
+                logger.warning(f"Today's data unavailable, keeping previous snapshot: {e}")
 
     def load(self, force_reload: bool = False) -> Dict[str, Any]:
         """Load today's data, using cache if available."""
-        if self._cache is not None and not force_reload:
-            return self._cache
-
-        logger.info("Loading today's matchmaking data")
-        mortal = self._load_mortal()
-        matches = self._load_matches()
-        compatibility = self._load_compatibility(mortal["name"])
-
-        self._cache = {
-            "mortal": mortal,
-            "matches": matches,
-            "compatibility": compatibility,
-        }
-        return self._cache
+        return self.snapshot(force_reload).as_dict()
 
     def get_mortal(self) -> Dict[str, Any]:
         """Get just the mortal data."""
-        data = self.load()
-        return data["mortal"]
+        return self.snapshot().mortal
 
     def get_matches(self) -> List[Dict[str, Any]]:
         """Get the list of matches."""
-        data = self.load()
-        return data["matches"]
+        return self.snapshot().matches
 
-    def get_compatibility(self, match_id: str) -> Dict[str, Any] | None:
-        """Get compatibility data for a specific match."""
-        data = self.load()
-        return data["compatibility"].get(match_id)
+    def get_compatibility(self, match_id: str, mortal_id: str | None = None) -> Dict[str, Any] | None:
+        """Get compatibility data for a specific match (and today's mortal by default)."""
+        snapshot = self.snapshot()
+        return snapshot.compatibility_index.get((mortal_id or snapshot.mortal_id, match_id))
 
 
 # Singleton instance
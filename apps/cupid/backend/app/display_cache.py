@@ -0,0 +1,173 @@
+"""Content-addressed cache for deterministic display-agent outputs.
+
+DisplayMortal, DisplayMatch and DisplayCompatibilityCard are pure functions of
+the YAML strings they are given, and every player who picks the same couple
+gives them identical input. Their validated `final_output` is cached under
+sha256(agent name, model, instructions hash, context hash), so repeated couples
+render their cards without an LLM round trip.
+
+Tiers: an in-memory LRU, plus an optional directory of JSON files that survives
+restarts and can be shared by several workers.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, TypeVar
+
+from agents import Agent, RunContextWrapper
+from pydantic import BaseModel, ValidationError
+
+logger = logging.getLogger(__name__)
+
+TOutput = TypeVar("TOutput", bound=BaseModel)
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class DisplayCacheStats:
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    # Callers that waited for an identical in-flight run instead of starting their own.
+    coalesced: int = 0
+
+
+class DisplayOutputCache:
+    """Two-tier (memory LRU, optional disk) cache of structured agent outputs."""
+
+    def __init__(self, max_entries: int = 256, cache_dir: str | Path | None = None) -> None:
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, BaseModel] = OrderedDict()
+        self._cache_dir = Path(cache_dir) if cache_dir else None
+        if self._cache_dir is not None:
+            self._cache_dir.mkdir(parents=True, exist_ok=True)
+        self._inflight: Dict[str, asyncio.Future[BaseModel]] = {}
+        self._stats = DisplayCacheStats()
+
+    @staticmethod
+    async def key(agent: Agent[Any], context: Any, context_str: str) -> str:
+        """Cache key for running `agent` with `context`, whose data is `context_str`.
+
+        The instructions are resolved the same way the Runner resolves them, so
+        editing an instructions file or template invalidates the entry.
+        """
+        instructions = await agent.get_system_prompt(RunContextWrapper(context=context)) or ""
+        parts = [agent.name, str(agent.model), _sha256(instructions), _sha256(context_str)]
+        return _sha256(json.dumps(parts))
+
+    async def get_or_run(
+        self,
+        key: str,
+        output_type: type[TOutput],
+        run: Callable[[], Awaitable[TOutput]],
+    ) -> TOutput:
+        """Return the cached output for `key`, or run and cache it.
+
+        Concurrent callers with the same key share a single run. If that run is
+        cancelled (with its chapter), the first waiter to resume starts a new one
+        and the others share it.
+        """
+        while True:
+            cached = self._get(key, output_type)
+            if cached is not None:
+                return cached
+
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                break
+            self._stats.coalesced += 1
+            try:
+                return await asyncio.shield(inflight)  # type: ignore[return-value]
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise
+                # The run we were waiting on was cancelled; look again.
+
+        self._stats.misses += 1
+        future: asyncio.Future[BaseModel] = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            output = await run()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            # Waiters get the error; don't warn about it being unretrieved.
+            future.exception()
+            raise
+        else:
+            future.set_result(output)
+            self._put(key, output)
+            return output
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def stats(self) -> Dict[str, Any]:
+        return {**asdict(self._stats), "entries": len(self._entries)}
+
+    def _get(self, key: str, output_type: type[TOutput]) -> TOutput | None:
+        output = self._entries.get(key)
+        if output is not None:
+            self._entries.move_to_end(key)
+            self._stats.memory_hits += 1
+            # Callers may mutate what they get back, so hand out copies.
+            return output.model_copy(deep=True)  # type: ignore[return-value]
+
+        if self._cache_dir is None:
+            return None
+        path = self._cache_dir / f"{key}.json"
+        try:
+            output = output_type.model_validate_json(path.read_bytes())
+        except FileNotFoundError:
+            return None
+        except ValidationError:
+            # Written by an older schema; it will be replaced on the next run.
+            logger.warning(f"Ignoring stale display cache entry {path.name}")
+            return None
+        self._stats.disk_hits += 1
+        self._remember(key, output)
+        return output.model_copy(deep=True)
+
+    def _put(self, key: str, output: BaseModel) -> None:
+        self._remember(key, output.model_copy(deep=True))
+        if self._cache_dir is None:
+            return
+        # Write then rename so concurrent workers never read a partial file.
+        fd, tmp_path = tempfile.mkstemp(dir=self._cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(output.model_dump_json())
+        os.replace(tmp_path, self._cache_dir / f"{key}.json")
+
+    def _remember(self, key: str, output: BaseModel) -> None:
+        if self._max_entries <= 0:
+            return
+        self._entries[key] = output
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+
+def display_cache_from_env() -> DisplayOutputCache | None:
+    """Build the cache from CUPID_DISPLAY_CACHE_SIZE / CUPID_DISPLAY_CACHE_DIR.
+
+    Returns None (no caching) when both the memory size is 0 and no directory is set.
+    """
+    max_entries = int(os.getenv("CUPID_DISPLAY_CACHE_SIZE", "256"))
+    cache_dir = os.getenv("CUPID_DISPLAY_CACHE_DIR")
+    if max_entries <= 0 and not cache_dir:
+        return None
+    return DisplayOutputCache(max_entries=max_entries, cache_dir=cache_dir)
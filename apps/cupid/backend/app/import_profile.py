@@ -0,0 +1,96 @@
+"""Import-time profile of the backend, with an optional budget for CI.
+
+Usage (from backend/):
+    python -m app.import_profile
+    python -m app.import_profile --top 30 --budget-ms 4000
+
+Imports the module in a fresh interpreter under `python -X importtime` and
+reports the total, the packages that cost the most, and the app's own modules.
+With a budget (`--budget-ms` or CUPID_IMPORT_BUDGET_MS) it exits with status 1
+when the total goes over it, so cold-start regressions fail the build.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List
+
+BACKEND_DIR = Path(__file__).parent.parent
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+@dataclass
+class ImportTiming:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def profile_imports(module: str) -> List[ImportTiming]:
+    """Import `module` in a subprocess and parse its -X importtime output."""
+    env = {**os.environ, "PYTHONPATH": str(BACKEND_DIR)}
+    env.setdefault("OPENAI_API_KEY", "import-profile")
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{completed.stderr[-2000:]}")
+    timings = []
+    for line in completed.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            timings.append(ImportTiming(name, int(self_us), int(cumulative_us), len(indent) // 2))
+    return timings
+
+
+def report(module: str, top: int) -> int:
+    """Print the profile and return the total import time in microseconds."""
+    timings = profile_imports(module)
+    total_us = next(t.cumulative_us for t in timings if t.module == module)
+    by_package: Dict[str, int] = defaultdict(int)
+    for timing in timings:
+        by_package[timing.module.split(".")[0]] += timing.self_us
+
+    print(f"import {module}: {total_us / 1000:.0f} ms ({len(timings)} modules)")
+    print(f"\nTop {top} packages by self time:")
+    for package, self_us in sorted(by_package.items(), key=lambda item: -item[1])[:top]:
+        print(f"  {self_us / 1000:8.1f} ms  {package}")
+    app_package = module.split(".")[0]
+    print(f"\n{app_package} modules by cumulative time:")
+    own = [t for t in timings if t.module.split(".")[0] == app_package]
+    for timing in sorted(own, key=lambda t: -t.cumulative_us)[:top]:
+        print(f"  {timing.cumulative_us / 1000:8.1f} ms  {timing.module} (self {timing.self_us / 1000:.1f} ms)")
+    return total_us
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--budget-ms", type=float, default=float(os.getenv("CUPID_IMPORT_BUDGET_MS", "0")))
+    args = parser.parse_args()
+
+    total_ms = report(args.module, args.top) / 1000
+    if args.budget_ms and total_ms > args.budget_ms:
+        print(f"\nOver budget: {total_ms:.0f} ms > {args.budget_ms:.0f} ms")
+        sys.exit(1)
+    if args.budget_ms:
+        print(f"\nWithin budget: {total_ms:.0f} ms <= {args.budget_ms:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
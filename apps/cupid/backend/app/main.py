@@ -5,7 +5,15 @@ Following the pattern from OpenAI's news-guide/main.py and customer-support/main
 
 from __future__ import annotations
 
+import time
+
+# Start of the cold-start window reported by /api/metrics/startup
+_IMPORT_STARTED = time.perf_counter()
+
+import asyncio
 import logging
+import os
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 load_dotenv()
 
@@ -16,13 +24,10 @@ from langfuse import get_client
 
 OpenAIAgentsInstrumentor().instrument()
 
-# Verify Langfuse connection
+# The client (and its exporter) is set up now; the auth check is a network round
+# trip, so it runs from the lifespan in the background (see _check_langfuse).
 _langfuse = get_client()
 _logger = logging.getLogger(__name__)
-if _langfuse.auth_check():
-    _logger.info("Langfuse connected successfully")
-else:
-    _logger.warning("Langfuse authentication failed - traces will not be recorded")
 
 from chatkit.server import StreamingResult
 from fastapi import Depends, FastAPI, HTTPException, Request, status
@@ -31,12 +36,67 @@ from pydantic import BaseModel
 from starlette.responses import JSONResponse
 from typing import Any, Dict
 
+from . import agents as cupid_agents
 from .data.today_store import today_store
 from .match_session_store import match_session_store
 from .request_context import RequestContext
 from .server import CupidServer, create_chatkit_server
+from .telemetry import telemetry_sink
+from .widgets.widget_template import widget_templates
+from .yaml_cache import yaml_render_cache
+
+# Filled in at the end of the import and by the lifespan
+_startup: Dict[str, Any] = {"langfuse": "pending"}
+
+
+async def _check_langfuse() -> None:
+    """Verify the Langfuse credentials without holding up startup."""
+    try:
+        connected = await asyncio.to_thread(_langfuse.auth_check)
+    except Exception as e:
+        _startup["langfuse"] = "error"
+        _logger.warning(f"Langfuse auth check failed: {e} - traces may not be recorded")
+        return
+    _startup["langfuse"] = "connected" if connected else "unauthorized"
+    if connected:
+        _logger.info("Langfuse connected successfully")
+    else:
+        _logger.warning("Langfuse authentication failed - traces will not be recorded")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    lifespan_started = time.perf_counter()
+    langfuse_check = asyncio.create_task(_check_langfuse())
+    # Export streaming usage to Langfuse in batches, off the request path
+    telemetry_sink.start()
+
+    # Drop match selections that were never picked up by a chat
+    match_session_store.start_reaper()
+
+    # Reload changed files under data/today in the background
+    today_store.start_watching(poll_interval=float(os.getenv("CUPID_TODAY_POLL_SECONDS", "5")))
+
+    # Opt in to prerendering today's profile and compatibility cards, re-warming on
+    # every reload. Each worker runs the display agents itself, so enable it on one
+    # worker, or share CUPID_DISPLAY_CACHE_DIR so warm-ups reuse the disk cache.
+    warm = os.getenv("CUPID_WARM_TODAY", "0") == "1"
+    if warm and _chatkit_server is not None:
+        _chatkit_server.today_widgets.start()
 
-app = FastAPI(title="Cupid Deluxe API")
+    _startup["lifespan_seconds"] = round(time.perf_counter() - lifespan_started, 4)
+    yield
+
+    langfuse_check.cancel()
+    await telemetry_sink.stop()
+    if warm and _chatkit_server is not None:
+        await _chatkit_server.today_widgets.stop()
+    await today_store.stop_watching()
+    await match_session_store.stop_reaper()
+    await match_session_store.close()
+
+
+app = FastAPI(title="Cupid Deluxe API", lifespan=lifespan)
 
 
 class MatchSelectionRequest(BaseModel):
@@ -65,24 +125,128 @@ def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/api/metrics/store")
+def get_store_metrics(server: CupidServer = Depends(get_chatkit_server)):
+    """Return thread store residency metrics (memory backend only)."""
+    metrics = getattr(server.store, "metrics", None)
+    return metrics() if metrics else {}
+
+
+@app.get("/api/metrics/chapters")
+def get_chapter_metrics(server: CupidServer = Depends(get_chatkit_server)):
+    """Return per-chapter wall clock by execution mode and the time saved by parallel mode."""
+    return server.chapter_timings.report()
+
+
+@app.get("/api/metrics/display-cache")
+def get_display_cache_metrics(server: CupidServer = Depends(get_chatkit_server)):
+    """Return display-agent output cache hits and misses (empty when disabled)."""
+    return server.display_cache.stats() if server.display_cache else {}
+
+
+@app.get("/api/metrics/match-sessions")
+async def get_match_session_metrics():
+    """Return pending match selections and this worker's hit/miss/expired/evicted counters."""
+    return await match_session_store.stats()
+
+
+@app.get("/api/metrics/couples")
+def get_couple_metrics(server: CupidServer = Depends(get_chatkit_server)):
+    """Return interned couples and the hit rate of the shared YAML rendering cache."""
+    return {**server.couples.stats(), "yaml": yaml_render_cache.stats()}
+
+
+@app.get("/api/metrics/telemetry")
+def get_telemetry_metrics():
+    """Return the Langfuse usage queue depth and recorded/exported/dropped counters."""
+    return telemetry_sink.stats()
+
+
+@app.get("/api/metrics/startup")
+def get_startup_metrics():
+    """Return cold-start timings, the Langfuse check result, and what has been lazily loaded."""
+    return {
+        **_startup,
+        "agent_modules_loaded": cupid_agents.loaded(),
+        "widget_templates_loaded": widget_templates.loaded(),
+    }
+
+
+@app.get("/api/metrics/today-widgets")
+def get_today_widget_metrics(server: CupidServer = Depends(get_chatkit_server)):
+    """Return how many of today's cards are prerendered and how often chapters used them."""
+    return server.today_widgets.stats()
+
+
+# Browsers may reuse /api/today for this long before revalidating (0: always revalidate)
+TODAY_MAX_AGE = int(os.getenv("CUPID_TODAY_MAX_AGE", "0"))
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against `etag` (RFC 9110 13.1.2)."""
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """Whether an Accept-Encoding header allows gzip, honouring q-values (RFC 9110 12.5.3).
+
+    An explicit `gzip` entry wins over `*`; either is refused with `q=0`.
+    """
+    qualities: dict[str, float] = {}
+    for entry in accept_encoding.lower().split(","):
+        coding, *params = (part.strip() for part in entry.split(";"))
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding:
+            qualities[coding] = quality
+    quality = qualities.get("gzip", qualities.get("x-gzip", qualities.get("*", 0.0)))
+    return quality > 0
+
+
 @app.get("/api/today")
-def get_today_data():
-    """Return today's mortal, matches, and compatibility data for the selection flow."""
+def get_today_data(request: Request):
+    """Return today's mortal, matches, and compatibility data for the selection flow.
+
+    The body is serialized (and gzipped) once per data version, so a request only
+    picks bytes; clients revalidate with If-None-Match and get a 304 while unchanged.
+    """
     try:
-        return today_store.load()
+        snapshot = today_store.snapshot()
     except FileNotFoundError as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+    use_gzip = _accepts_gzip(request.headers.get("accept-encoding", ""))
+    # Each encoding is its own representation, so it gets its own strong ETag
+    etag = snapshot.etag[:-1] + '-gzip"' if use_gzip else snapshot.etag
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={TODAY_MAX_AGE}, must-revalidate",
+        "Vary": "Accept-Encoding",
+    }
+    if _etag_matches(request.headers.get("if-none-match", ""), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    if use_gzip:
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=snapshot.gzip_body, media_type="application/json", headers=headers)
+    return Response(content=snapshot.body, media_type="application/json", headers=headers)
+
 
 @app.post("/api/match-selection")
-def store_match_selection(selection: MatchSelectionRequest):
+async def store_match_selection(selection: MatchSelectionRequest):
     """Store a match selection and return a session ID.
 
     The frontend calls this before starting the chat. The returned session_id
     is then passed via the x-match-session-id header so the backend
     can retrieve the selection data without exposing it in the chat.
     """
-    session_id = match_session_store.store({
+    session_id = await match_session_store.store({
         "mortal_data": selection.mortal_data,
         "match_data": selection.match_data,
         "compatibility_data": selection.compatibility_data,
@@ -98,15 +262,24 @@ async def chatkit_endpoint(
 ) -> Response:
     """ChatKit protocol endpoint.
 
-    Extracts x-match-session-id header and passes it via RequestContext.
+    Extracts x-match-session-id and x-user-id headers and passes them via RequestContext.
     Following the pattern from news-guide where article-id is extracted from headers.
     """
     payload = await request.body()
     match_session_id = request.headers.get("x-match-session-id")
-    context = RequestContext(request=request, match_session_id=match_session_id)
+    user_id = request.headers.get("x-user-id")
+    context = RequestContext(
+        request=request,
+        match_session_id=match_session_id,
+        user_id=user_id,
+    )
     result = await server.process(payload, context)
     if isinstance(result, StreamingResult):
         return StreamingResponse(result, media_type="text/event-stream")
     if hasattr(result, "json"):
         return Response(content=result.json, media_type="application/json")
     return JSONResponse(result)
+
+
+_startup["import_seconds"] = round(time.perf_counter() - _IMPORT_STARTED, 4)
+_logger.info(f"app.main imported in {_startup['import_seconds'] * 1000:.0f} ms")
@@ -0,0 +1,286 @@
+"""Shared match session backends, so any worker can consume any selection.
+
+`SQLiteMatchSessionStore` shares a WAL-mode SQLite file between the workers on
+one host. `RedisMatchSessionStore` speaks the Redis protocol (RESP2) directly
+over asyncio streams, so it needs no client library and works against Redis,
+Valkey, KeyDB or the local `app.resp_standin`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+from urllib.parse import urlparse
+
+from .match_session_store import MatchSessionBackend
+
+
+class SQLiteMatchSessionStore(MatchSessionBackend):
+    """Match sessions in a SQLite file shared by every worker on the host."""
+
+    def __init__(self, path: str | Path, ttl_seconds: float = 1800.0, max_sessions: int = 10_000) -> None:
+        super().__init__(ttl_seconds, max_sessions)
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        # Statements are single-row and sub-millisecond; they run on a worker
+        # thread, one at a time per process.
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        self._conn.executescript(
+            """
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            PRAGMA busy_timeout=5000;
+            CREATE TABLE IF NOT EXISTS match_sessions (
+                id TEXT PRIMARY KEY,
+                expires_at REAL NOT NULL,
+                data TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_match_sessions_expires_at ON match_sessions(expires_at);
+            """
+        )
+
+    async def _execute(self, sql: str, params: Tuple[Any, ...] = ()) -> List[Tuple[Any, ...]]:
+        def run() -> List[Tuple[Any, ...]]:
+            with self._lock:
+                return self._conn.execute(sql, params).fetchall()
+
+        return await asyncio.to_thread(run)
+
+    async def _put(self, session_id: str, data: Dict[str, Any], expires_at: float) -> int:
+        def run() -> int:
+            with self._lock:
+                self._conn.execute("BEGIN IMMEDIATE")
+                try:
+                    self._conn.execute(
+                        "INSERT INTO match_sessions (id, expires_at, data) VALUES (?, ?, ?)",
+                        (session_id, expires_at, json.dumps(data)),
+                    )
+                    cursor = self._conn.execute(
+                        """
+                        DELETE FROM match_sessions WHERE id IN (
+                            SELECT id FROM match_sessions ORDER BY expires_at
+                            LIMIT max(0, (SELECT COUNT(*) FROM match_sessions) - ?)
+                        )
+                        """,
+                        (self._max_sessions,),
+                    )
+                    self._conn.execute("COMMIT")
+                except BaseException:
+                    self._conn.execute("ROLLBACK")
+                    raise
+                return cursor.rowcount
+
+        return await asyncio.to_thread(run)
+
+    async def _get(self, session_id: str) -> Tuple[float, Dict[str, Any]] | None:
+        rows = await self._execute(
+            "SELECT expires_at, data FROM match_sessions WHERE id = ?", (session_id,)
+        )
+        return (rows[0][0], json.loads(rows[0][1])) if rows else None
+
+    async def _pop(self, session_id: str) -> Tuple[float, Dict[str, Any]] | None:
+        # DELETE ... RETURNING makes consumption atomic across workers
+        rows = await self._execute(
+            "DELETE FROM match_sessions WHERE id = ? RETURNING expires_at, data", (session_id,)
+        )
+        return (rows[0][0], json.loads(rows[0][1])) if rows else None
+
+    async def _reap(self, now: float) -> int:
+        rows = await self._execute(
+            "DELETE FROM match_sessions WHERE expires_at <= ? RETURNING id", (now,)
+        )
+        return len(rows)
+
+    async def _count(self) -> int:
+        rows = await self._execute("SELECT COUNT(*) FROM match_sessions")
+        return rows[0][0]
+
+    async def close(self) -> None:
+        self._conn.close()
+
+
+class RESPError(Exception):
+    """An error reply from a Redis-protocol server."""
+
+
+class RESPConnection:
+    """A minimal RESP2 client: one connection, pipelined commands, reconnect on failure."""
+
+    def __init__(self, url: str) -> None:
+        parsed = urlparse(url)
+        self._host = parsed.hostname or "localhost"
+        self._port = parsed.port or 6379
+        self._password = parsed.password
+        self._db = int(parsed.path.lstrip("/") or 0)
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._lock = asyncio.Lock()
+
+    async def execute(self, *command: Any) -> Any:
+        (reply,) = await self.pipeline([command])
+        return reply
+
+    async def pipeline(self, commands: List[Tuple[Any, ...]]) -> List[Any]:
+        """Send `commands` in one write and return their replies in order.
+
+        Error replies are raised after all replies have been read, so the
+        connection stays in sync. Any other failure between the write and the
+        last read (including cancellation) drops the connection, so unread
+        replies can never be handed to the next caller.
+        """
+        async with self._lock:
+            for attempt in range(2):
+                try:
+                    if self._writer is None:
+                        await self._connect()
+                    return await self._roundtrip(commands)
+                except RESPError:
+                    raise
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    await self._disconnect()
+                    if attempt:
+                        raise
+                except BaseException:
+                    await self._disconnect()
+                    raise
+        raise AssertionError("unreachable")
+
+    async def _connect(self) -> None:
+        self._reader, self._writer = await asyncio.open_connection(self._host, self._port)
+        setup: List[Tuple[Any, ...]] = []
+        if self._password:
+            setup.append(("AUTH", self._password))
+        if self._db:
+            setup.append(("SELECT", self._db))
+        if setup:
+            try:
+                await self._roundtrip(setup)
+            except RESPError:
+                # Don't keep a connection that failed AUTH or SELECT
+                await self._disconnect()
+                raise
+
+    async def _disconnect(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+
+    async def _roundtrip(self, commands: List[Tuple[Any, ...]]) -> List[Any]:
+        assert self._reader is not None and self._writer is not None
+        self._writer.write(b"".join(encode_command(command) for command in commands))
+        await self._writer.drain()
+        replies = [await read_reply(self._reader) for _ in commands]
+        for reply in replies:
+            if isinstance(reply, RESPError):
+                raise reply
+        return replies
+
+    async def close(self) -> None:
+        async with self._lock:
+            await self._disconnect()
+
+
+def encode_command(command: Tuple[Any, ...]) -> bytes:
+    """Encode a command as a RESP array of bulk strings."""
+    parts = [b"*%d\r\n" % len(command)]
+    for arg in command:
+        data = arg if isinstance(arg, bytes) else str(arg).encode("utf-8")
+        parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+    return b"".join(parts)
+
+
+async def read_reply(reader: asyncio.StreamReader) -> Any:
+    """Read one RESP2 reply; error replies are returned as RESPError."""
+    line = await reader.readuntil(b"\r\n")
+    kind, payload = line[:1], line[1:-2]
+    if kind == b"+":
+        return payload.decode("utf-8")
+    if kind == b"-":
+        return RESPError(payload.decode("utf-8"))
+    if kind == b":":
+        return int(payload)
+    if kind == b"$":
+        length = int(payload)
+        if length < 0:
+            return None
+        return (await reader.readexactly(length + 2))[:-2]
+    if kind == b"*":
+        length = int(payload)
+        if length < 0:
+            return None
+        return [await read_reply(reader) for _ in range(length)]
+    raise ConnectionError(f"Unexpected RESP reply: {line!r}")
+
+
+class RedisMatchSessionStore(MatchSessionBackend):
+    """Match sessions in a Redis-protocol server, shared across hosts.
+
+    Each session is a string key with a PX expiry, so the server drops expired
+    sessions itself. A sorted set of session IDs by expiry enforces max_sessions.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        ttl_seconds: float = 1800.0,
+        max_sessions: int = 10_000,
+        prefix: str = "cupid:match-session:",
+    ) -> None:
+        super().__init__(ttl_seconds, max_sessions)
+        self._conn = RESPConnection(url)
+        self._prefix = prefix
+        self._index = f"{prefix}index"
+
+    async def _put(self, session_id: str, data: Dict[str, Any], expires_at: float) -> int:
+        value = json.dumps({"expires_at": expires_at, "data": data})
+        ttl_ms = max(1, int(self._ttl_seconds * 1000))
+        replies = await self._conn.pipeline(
+            [
+                ("SET", self._prefix + session_id, value, "PX", ttl_ms),
+                ("ZADD", self._index, expires_at, session_id),
+                # Sessions the server already expired no longer count towards the cap
+                ("ZREMRANGEBYSCORE", self._index, "-inf", expires_at - self._ttl_seconds),
+                ("ZCARD", self._index),
+            ]
+        )
+        excess = replies[-1] - self._max_sessions
+        if excess <= 0:
+            return 0
+        popped = await self._conn.execute("ZPOPMIN", self._index, excess)
+        evicted_ids = popped[::2]  # [member, score, member, score, ...]
+        if evicted_ids:
+            await self._conn.execute("DEL", *(self._prefix.encode() + member for member in evicted_ids))
+        return len(evicted_ids)
+
+    async def _get(self, session_id: str) -> Tuple[float, Dict[str, Any]] | None:
+        return self._decode(await self._conn.execute("GET", self._prefix + session_id))
+
+    async def _pop(self, session_id: str) -> Tuple[float, Dict[str, Any]] | None:
+        # GETDEL (Redis 6.2+) makes consumption atomic across workers
+        value, _ = await self._conn.pipeline(
+            [("GETDEL", self._prefix + session_id), ("ZREM", self._index, session_id)]
+        )
+        return self._decode(value)
+
+    async def _reap(self, now: float) -> int:
+        # The server expires the keys; only the index needs trimming, and those
+        # sessions were never seen expired by this process, so nothing is counted.
+        await self._conn.execute("ZREMRANGEBYSCORE", self._index, "-inf", now)
+        return 0
+
+    async def _count(self) -> int:
+        return await self._conn.execute("ZCARD", self._index)
+
+    async def close(self) -> None:
+        await self._conn.close()
+
+    @staticmethod
+    def _decode(value: bytes | None) -> Tuple[float, Dict[str, Any]] | None:
+        if value is None:
+            return None
+        entry = json.loads(value)
+        return entry["expires_at"], entry["data"]
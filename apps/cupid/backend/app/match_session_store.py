@@ -2,52 +2,221 @@
 
 Manages temporary storage of match selections before chat sessions begin.
 Following the pattern from customer-support/airline_state.py.
+
+The POST to /api/match-selection and the /chatkit request that consumes the
+session may be served by different workers, so the storage is pluggable:
+
+- `memory` (default): process-local, fine for a single worker.
+- `sqlite`: a file shared by every worker on one host.
+- `redis`: any Redis-protocol server, shared across hosts (see
+  `app.resp_standin` for a local stand-in).
+
+Select one with CUPID_MATCH_SESSION_BACKEND.
 """
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import os
+import time
 import uuid
-from typing import Any, Dict
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Tuple
 
 logger = logging.getLogger(__name__)
 
 
-class MatchSessionStore:
-    """In-memory store for pending match selections.
+@dataclass
+class MatchSessionStats:
+    stored: int = 0
+    hits: int = 0
+    misses: int = 0
+    # Found but past their TTL (dropped on access or by the reaper)
+    expired: int = 0
+    # Dropped to stay under max_sessions
+    evicted: int = 0
+
+
+class MatchSessionBackend(ABC):
+    """Pending match selections, keyed by a random session ID.
 
     When a user completes the match selection flow, the frontend stores the
     selection data here and receives a session_id. The session_id is then
     passed via the x-match-session-id header when starting the chat, allowing
     the backend to retrieve the selection without exposing it in the chat.
+
+    Selections that are never retrieved expire after `ttl_seconds`, and at most
+    `max_sessions` are kept (oldest evicted first), so abandoned or scripted
+    selections cannot grow memory without bound. Counters are per process.
     """
 
-    def __init__(self) -> None:
-        self._sessions: Dict[str, Dict[str, Any]] = {}
+    def __init__(self, ttl_seconds: float = 1800.0, max_sessions: int = 10_000) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._max_sessions = max_sessions
+        self._stats = MatchSessionStats()
+        self._reaper_task: asyncio.Task[None] | None = None
 
-    def store(self, data: Dict[str, Any]) -> str:
+    async def store(self, data: Dict[str, Any]) -> str:
         """Store match selection data and return a new session ID."""
         session_id = str(uuid.uuid4())
-        self._sessions[session_id] = data
+        # Wall clock, since shared backends compare it across processes
+        evicted = await self._put(session_id, data, time.time() + self._ttl_seconds)
+        self._stats.stored += 1
+        self._stats.evicted += evicted
         logger.info(f"Stored match session: {session_id}")
         return session_id
 
-    def retrieve(self, session_id: str) -> Dict[str, Any] | None:
+    async def retrieve(self, session_id: str) -> Dict[str, Any] | None:
         """Retrieve and remove match selection by session ID.
 
-        Returns None if session_id not found or already consumed.
+        Returns None if session_id not found, expired or already consumed.
         """
-        data = self._sessions.pop(session_id, None)
+        data = self._live(await self._pop(session_id))
         if data:
             logger.info(f"Retrieved match session: {session_id}")
         else:
             logger.warning(f"Match session not found or expired: {session_id}")
         return data
 
-    def peek(self, session_id: str) -> Dict[str, Any] | None:
+    async def peek(self, session_id: str) -> Dict[str, Any] | None:
         """Retrieve match selection without removing it."""
+        entry = await self._get(session_id)
+        data = self._live(entry)
+        if entry is not None and data is None:
+            await self._pop(session_id)
+        return data
+
+    def _live(self, entry: Tuple[float, Dict[str, Any]] | None) -> Dict[str, Any] | None:
+        """Data of `entry` if it exists and has not expired, updating the counters."""
+        if entry is None:
+            self._stats.misses += 1
+            return None
+        expires_at, data = entry
+        if expires_at <= time.time():
+            self._stats.expired += 1
+            self._stats.misses += 1
+            return None
+        self._stats.hits += 1
+        return data
+
+    async def reap(self) -> int:
+        """Drop expired sessions; returns how many were dropped."""
+        reaped = await self._reap(time.time())
+        self._stats.expired += reaped
+        return reaped
+
+    async def stats(self) -> Dict[str, Any]:
+        return {**asdict(self._stats), "sessions": await self._count()}
+
+    def start_reaper(self, interval: float = 60.0) -> None:
+        """Reap expired sessions every `interval` seconds (call from a running event loop)."""
+        if self._reaper_task is None:
+            self._reaper_task = asyncio.create_task(self._reap_periodically(interval))
+
+    async def stop_reaper(self) -> None:
+        if self._reaper_task is not None:
+            self._reaper_task.cancel()
+            await asyncio.gather(self._reaper_task, return_exceptions=True)
+            self._reaper_task = None
+
+    async def close(self) -> None:
+        """Release connections held by the backend."""
+
+    async def _reap_periodically(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                reaped = await self.reap()
+            except Exception:
+                logger.exception("Failed to reap match sessions")
+                continue
+            if reaped:
+                logger.info(f"Reaped {reaped} expired match sessions")
+
+    @abstractmethod
+    async def _put(self, session_id: str, data: Dict[str, Any], expires_at: float) -> int:
+        """Insert a session and evict the oldest beyond max_sessions; returns evictions."""
+
+    @abstractmethod
+    async def _get(self, session_id: str) -> Tuple[float, Dict[str, Any]] | None:
+        """(expires_at, data) for a session, or None."""
+
+    @abstractmethod
+    async def _pop(self, session_id: str) -> Tuple[float, Dict[str, Any]] | None:
+        """Atomically remove and return (expires_at, data) for a session."""
+
+    @abstractmethod
+    async def _reap(self, now: float) -> int:
+        """Delete sessions that expired before `now`; returns how many."""
+
+    @abstractmethod
+    async def _count(self) -> int:
+        """Number of stored sessions, including expired ones not yet reaped."""
+
+
+class MatchSessionStore(MatchSessionBackend):
+    """In-memory store for pending match selections (a single worker only)."""
+
+    def __init__(self, ttl_seconds: float = 1800.0, max_sessions: int = 10_000) -> None:
+        super().__init__(ttl_seconds, max_sessions)
+        # session_id -> (expires_at, data); insertion order is expiry order, since
+        # every entry gets the same TTL
+        self._sessions: OrderedDict[str, Tuple[float, Dict[str, Any]]] = OrderedDict()
+
+    async def _put(self, session_id: str, data: Dict[str, Any], expires_at: float) -> int:
+        self._sessions[session_id] = (expires_at, data)
+        evicted = 0
+        while len(self._sessions) > self._max_sessions:
+            self._sessions.popitem(last=False)
+            evicted += 1
+        return evicted
+
+    async def _get(self, session_id: str) -> Tuple[float, Dict[str, Any]] | None:
         return self._sessions.get(session_id)
 
+    async def _pop(self, session_id: str) -> Tuple[float, Dict[str, Any]] | None:
+        return self._sessions.pop(session_id, None)
+
+    async def _reap(self, now: float) -> int:
+        reaped = 0
+        while self._sessions:
+            session_id, (expires_at, _) = next(iter(self._sessions.items()))
+            if expires_at > now:
+                break
+            del self._sessions[session_id]
+            reaped += 1
+        return reaped
+
+    async def _count(self) -> int:
+        return len(self._sessions)
+
+
+def create_match_session_store() -> MatchSessionBackend:
+    """Build the store from CUPID_MATCH_SESSION_* environment variables."""
+    backend = os.getenv("CUPID_MATCH_SESSION_BACKEND", "memory").lower()
+    options = {
+        "ttl_seconds": float(os.getenv("CUPID_MATCH_SESSION_TTL", "1800")),
+        "max_sessions": int(os.getenv("CUPID_MATCH_SESSION_MAX", "10000")),
+    }
+    if backend == "memory":
+        return MatchSessionStore(**options)
+    if backend == "sqlite":
+        from .match_session_backends import SQLiteMatchSessionStore
+
+        default_path = Path(__file__).parent.parent / "data" / "match-sessions.db"
+        return SQLiteMatchSessionStore(os.getenv("CUPID_MATCH_SESSION_PATH", str(default_path)), **options)
+    if backend == "redis":
+        from .match_session_backends import RedisMatchSessionStore
+
+        return RedisMatchSessionStore(
+            os.getenv("CUPID_MATCH_SESSION_REDIS_URL", "redis://localhost:6379/0"), **options
+        )
+    raise ValueError(f"Unknown CUPID_MATCH_SESSION_BACKEND: {backend}")
+
 
 # Singleton instance
-match_session_store = MatchSessionStore()
+match_session_store = create_match_session_store()
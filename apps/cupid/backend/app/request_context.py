@@ -10,6 +10,7 @@ from __future__ import annotations
 
 from typing import Annotated
 
+from chatkit_store import DEFAULT_OWNER
 from fastapi import Request
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -24,3 +25,10 @@ class RequestContext(BaseModel):
 
     request: Annotated[Request | None, Field(default=None, exclude=True)]
     match_session_id: str | None = None
+    user_id: str | None = None
+
+    @property
+    def owner_id(self) -> str:
+        """Partition key for thread storage (from the x-user-id header)."""
+        return self.user_id or DEFAULT_OWNER
+
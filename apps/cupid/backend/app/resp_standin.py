@@ -0,0 +1,182 @@
+"""Local stand-in for a Redis server, for development and tests.
+
+Implements the subset of commands `RedisMatchSessionStore` uses, in memory and
+over the real Redis protocol, so several Cupid workers can share match sessions
+without installing Redis:
+
+    python -m app.resp_standin --port 6379
+    CUPID_MATCH_SESSION_BACKEND=redis uvicorn app.main:app --workers 4
+
+Not for production: there is no persistence and no eviction policy.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from .match_session_backends import RESPError, read_reply
+
+logger = logging.getLogger(__name__)
+
+
+def _encode_reply(reply: Any) -> bytes:
+    if reply is None:
+        return b"$-1\r\n"
+    if isinstance(reply, RESPError):
+        return b"-%s\r\n" % str(reply).encode("utf-8")
+    if isinstance(reply, bool):
+        return b"+OK\r\n" if reply else b"$-1\r\n"
+    if isinstance(reply, int):
+        return b":%d\r\n" % reply
+    if isinstance(reply, str):
+        return b"+%s\r\n" % reply.encode("utf-8")
+    if isinstance(reply, bytes):
+        return b"$%d\r\n%s\r\n" % (len(reply), reply)
+    if isinstance(reply, list):
+        return b"*%d\r\n" % len(reply) + b"".join(_encode_reply(item) for item in reply)
+    raise TypeError(f"Cannot encode {type(reply).__name__}")
+
+
+def _score(value: bytes) -> float:
+    # float() accepts "-inf"/"+inf", which is all the range syntax the store needs
+    return float(value)
+
+
+class RESPStandIn:
+    """In-memory keyspace with string keys (optional expiry) and sorted sets."""
+
+    def __init__(self) -> None:
+        self._strings: Dict[bytes, Tuple[bytes, float | None]] = {}
+        self._zsets: Dict[bytes, Dict[bytes, float]] = {}
+        self._commands: Dict[bytes, Callable[[List[bytes]], Any]] = {
+            b"PING": lambda args: "PONG",
+            b"AUTH": lambda args: True,
+            b"SELECT": lambda args: True,
+            b"SET": self._set,
+            b"GET": lambda args: self._get(args[0]),
+            b"GETDEL": self._getdel,
+            b"DEL": self._del,
+            b"DBSIZE": lambda args: len(self._strings) + len(self._zsets),
+            b"FLUSHALL": self._flushall,
+            b"ZADD": self._zadd,
+            b"ZREM": self._zrem,
+            b"ZCARD": lambda args: len(self._zsets.get(args[0], {})),
+            b"ZREMRANGEBYSCORE": self._zremrangebyscore,
+            b"ZPOPMIN": self._zpopmin,
+        }
+
+    def execute(self, command: List[bytes]) -> Any:
+        handler = self._commands.get(command[0].upper())
+        if handler is None:
+            return RESPError(f"ERR unknown command '{command[0].decode('utf-8', 'replace')}'")
+        try:
+            return handler(command[1:])
+        except (IndexError, ValueError):
+            return RESPError(f"ERR wrong arguments for '{command[0].decode('utf-8', 'replace')}'")
+
+    def _get(self, key: bytes) -> bytes | None:
+        entry = self._strings.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.time():
+            del self._strings[key]
+            return None
+        return value
+
+    def _set(self, args: List[bytes]) -> bool:
+        key, value, options = args[0], args[1], [a.upper() for a in args[2:]]
+        expires_at = None
+        if b"PX" in options:
+            expires_at = time.time() + int(args[2 + options.index(b"PX") + 1]) / 1000
+        elif b"EX" in options:
+            expires_at = time.time() + int(args[2 + options.index(b"EX") + 1])
+        self._strings[key] = (value, expires_at)
+        return True
+
+    def _getdel(self, args: List[bytes]) -> bytes | None:
+        value = self._get(args[0])
+        self._strings.pop(args[0], None)
+        return value
+
+    def _del(self, args: List[bytes]) -> int:
+        deleted = 0
+        for key in args:
+            if self._strings.pop(key, None) is not None or self._zsets.pop(key, None) is not None:
+                deleted += 1
+        return deleted
+
+    def _flushall(self, args: List[bytes]) -> bool:
+        self._strings.clear()
+        self._zsets.clear()
+        return True
+
+    def _zadd(self, args: List[bytes]) -> int:
+        zset = self._zsets.setdefault(args[0], {})
+        added = 0
+        for score, member in zip(args[1::2], args[2::2]):
+            added += member not in zset
+            zset[member] = _score(score)
+        return added
+
+    def _zrem(self, args: List[bytes]) -> int:
+        zset = self._zsets.get(args[0], {})
+        return sum(zset.pop(member, None) is not None for member in args[1:])
+
+    def _zremrangebyscore(self, args: List[bytes]) -> int:
+        zset = self._zsets.get(args[0], {})
+        low, high = _score(args[1]), _score(args[2])
+        doomed = [member for member, score in zset.items() if low <= score <= high]
+        for member in doomed:
+            del zset[member]
+        return len(doomed)
+
+    def _zpopmin(self, args: List[bytes]) -> List[bytes]:
+        zset = self._zsets.get(args[0], {})
+        count = int(args[1]) if len(args) > 1 else 1
+        popped = sorted(zset.items(), key=lambda item: (item[1], item[0]))[:count]
+        reply: List[bytes] = []
+        for member, score in popped:
+            del zset[member]
+            reply.extend([member, repr(score).encode("utf-8")])
+        return reply
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                command = await read_reply(reader)
+                writer.write(_encode_reply(self.execute(command)))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(host: str = "127.0.0.1", port: int = 6379) -> asyncio.AbstractServer:
+    """Start the stand-in; the caller owns the returned server."""
+    return await asyncio.start_server(RESPStandIn().handle, host, port)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6379)
+    args = parser.parse_args()
+
+    async def run() -> None:
+        server = await serve(args.host, args.port)
+        logger.info(f"RESP stand-in listening on {args.host}:{args.port}")
+        async with server:
+            await server.serve_forever()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -3,56 +3,58 @@
 from __future__ import annotations
 
 import logging
+import os
+import time
 import yaml
 from datetime import datetime
 from pathlib import Path
 from typing import Annotated, Any, AsyncIterator
 
-from agents import Runner, RunResultStreaming
+from agents import Agent, Runner, RunResultStreaming
 from langfuse import propagate_attributes
 from chatkit.agents import AgentContext, stream_agent_response
 from chatkit.server import ChatKitServer
 from chatkit.types import (
     Action,
+    AssistantMessageContentPartTextDelta,
     AssistantMessageItem,
     Attachment,
     HiddenContextItem,
     InferenceOptions,
     ProgressUpdateEvent,
     ThreadItemDoneEvent,
+    ThreadItemUpdatedEvent,
     ThreadMetadata,
     ThreadStreamEvent,
     UserMessageItem,
     UserMessageTextContent,
     WidgetItem,
 )
+from chatkit_store import ThreadStore, create_store
 from openai.types.responses import ResponseInputContentParam
 from pydantic import Field
 
-# Import all agents
-from .agents.introduction_agent import introduction_agent
-from .agents.mortal_agent import mortal_agent, MortalContext
-from .agents.match_agent import match_agent, MatchContext
-from .agents.start_cupid_game_agent import start_cupid_game_agent
-from .agents.cupid_evaluation_agent import cupid_evaluation_agent
-from .agents.end_agent import end_agent
-from .agents.display_mortal_agent import display_mortal_agent, DisplayMortalContext
-from .agents.display_match_agent import display_match_agent, DisplayMatchContext
-# Note: display_continue_card_agent removed - using direct widget calls for static messages
-from .agents.display_compatibility_card_agent import display_compatibility_card_agent, DisplayCompatibilityCardContext
-from .agents.compatibility_analysis_agent import compatibility_analysis_agent
-from .agents.display_choices_agent import display_choices_agent, DisplayChoicesContext
-from .agents.has_ended_agent import has_ended_agent, HasEndedContext
-
-from .memory_store import MemoryStore
+# Agents are built on first use (see app/agents/__init__.py)
+from . import agents as cupid_agents
+
+from .chapter_execution import (
+    OPTION_MARKER,
+    ChapterTimings,
+    PendingAgentRun,
+    chapter_mode_from_env,
+    choices_mode_from_env,
+)
+from .couple_data import CoupleData, CoupleRegistry
+from .data.today_store import today_store
+from .display_cache import display_cache_from_env
 from .request_context import RequestContext
+from .telemetry import UsageRecord, current_trace, telemetry_sink
 from .thread_item_converter import BasicThreadItemConverter
+from .today_widgets import TodayWidgets
 
 # Import widget builders
-from .widgets.profilecard_widget import build_profilecard_widget
 from .widgets.continue_card_widget import build_continue_card_widget
 from .widgets.choice_list_widget import build_choice_list_widget
-from .widgets.compatibility_analysis_widget import build_compatibility_analysis_widget
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -61,7 +63,7 @@ logger = logging.getLogger(__name__)
 class CupidAgentContext(AgentContext):
     """Context for the Cupid game agent."""
 
-    store: Annotated[MemoryStore, Field(exclude=True)]
+    store: Annotated[ThreadStore, Field(exclude=True)]
     request_context: RequestContext
 
 
@@ -69,9 +71,21 @@ class CupidServer(ChatKitServer[RequestContext]):
     """ChatKit server for Cupid Deluxe romantic matchmaking game."""
 
     def __init__(self) -> None:
-        self.store: MemoryStore = MemoryStore()
+        # Backend selected by CUPID_STORE_BACKEND ("memory", "sqlite" or "log").
+        self.store: ThreadStore = create_store(
+            env_prefix="CUPID_STORE",
+            data_dir=Path(__file__).parent.parent / "data",
+            name="cupid-threads",
+        )
         super().__init__(self.store)
         self.thread_item_converter = BasicThreadItemConverter()
+        self.chapter_mode = chapter_mode_from_env()
+        self.choices_mode = choices_mode_from_env()
+        self.chapter_timings = ChapterTimings()
+        # Display-agent outputs keyed by agent and input data (CUPID_DISPLAY_CACHE_*)
+        self.display_cache = display_cache_from_env()
+        # Today's cards, prerendered from the app lifespan and kept fresh on reload
+        self.today_widgets = TodayWidgets(today_store, self.display_cache)
 
         # Load character and compatibility data from YAML files
         data_dir = Path(__file__).parent / "data"
@@ -82,30 +96,43 @@ class CupidServer(ChatKitServer[RequestContext]):
         with open(data_dir / "compatibility.yaml", "r", encoding="utf-8") as f:
             self.compatibility_data = yaml.safe_load(f)
 
-        # Pre-compute YAML strings for default data (used when thread.metadata data matches)
-        self._default_mortal_str = yaml.dump(self.mortal_data, default_flow_style=False)
-        self._default_match_str = yaml.dump(self.match_data, default_flow_style=False)
-        self._default_compatibility_str = yaml.dump(self.compatibility_data, default_flow_style=False)
+        # Threads reference their couple by content version (see couple_data)
+        self.couples = CoupleRegistry(
+            Path(__file__).parent.parent / "data" / "couples",
+            max_files=int(os.getenv("CUPID_COUPLE_MAX_FILES", "10000")),
+        )
+        self.default_couple = self.couples.register(
+            self.mortal_data, self.match_data, self.compatibility_data
+        )
+
+    def _get_couple(self, thread: ThreadMetadata) -> CoupleData:
+        """Resolve the couple referenced by thread.metadata["couple"] (defaults if none)."""
+        reference = (thread.metadata or {}).get("couple")
+        if not reference:
+            return self.default_couple
+        couple = self.couples.resolve(reference["version"])
+        if couple is None:
+            logger.warning(f"Couple {reference['version']} not found; using default match data")
+            return self.default_couple
+        return couple
 
     def _get_data_strings(self, thread: ThreadMetadata) -> tuple[str, str, str]:
-        """Get YAML data strings for agents, using thread.metadata if different from defaults.
+        """Get YAML data strings for agents, dumped once per distinct couple."""
+        couple = self._get_couple(thread)
+        return couple.mortal_str, couple.match_str, couple.compatibility_str
 
-        This allows per-thread couple data in the future while optimizing for the common case
-        where all threads use the same default couple.
-        """
+    def _migrate_couple_reference(self, thread: ThreadMetadata) -> bool:
+        """Replace full couple dicts in older threads' metadata with a reference."""
         metadata = thread.metadata or {}
-
-        # Check if thread has custom data (future: different couples per thread)
-        mortal_data = metadata.get("mortal_data", self.mortal_data)
-        match_data = metadata.get("match_data", self.match_data)
-        compat_data = metadata.get("compatibility_data", self.compatibility_data)
-
-        # Use pre-computed strings if data matches defaults (optimization)
-        mortal_str = self._default_mortal_str if mortal_data is self.mortal_data else yaml.dump(mortal_data, default_flow_style=False)
-        match_str = self._default_match_str if match_data is self.match_data else yaml.dump(match_data, default_flow_style=False)
-        compat_str = self._default_compatibility_str if compat_data is self.compatibility_data else yaml.dump(compat_data, default_flow_style=False)
-
-        return mortal_str, match_str, compat_str
+        if "couple" in metadata or "mortal_data" not in metadata:
+            return False
+        couple = self.couples.register(
+            metadata.pop("mortal_data"),
+            metadata.pop("match_data", self.match_data),
+            metadata.pop("compatibility_data", self.compatibility_data),
+        )
+        metadata["couple"] = self.couples.reference(couple, metadata.get("selected_match_id"))
+        return True
 
     def _generate_widget_id(self, thread: ThreadMetadata) -> str:
         """Generate a unique widget ID."""
@@ -132,13 +159,10 @@ class CupidServer(ChatKitServer[RequestContext]):
         if thread.title is not None:
             return
 
-        metadata = thread.metadata or {}
-        mortal_data = metadata.get("mortal_data")
-        match_data = metadata.get("match_data")
-
-        if mortal_data and match_data:
-            mortal_first = mortal_data.get("name", "").split()[0]
-            match_first = match_data.get("name", "").split()[0]
+        couple = self._get_couple(thread)
+        if couple.mortal_name and couple.match_name:
+            mortal_first = couple.mortal_name.split()[0]
+            match_first = couple.match_name.split()[0]
             thread.title = f"{mortal_first} & {match_first}"
             await self.store.save_thread(thread, context=context)
 
@@ -212,29 +236,34 @@ class CupidServer(ChatKitServer[RequestContext]):
             thread.metadata["chapter"] = 0
 
             # Check for match session ID in context (populated from header by main.py)
-            match_data_loaded = False
+            couple = None
             if context.match_session_id:
                 from .match_session_store import match_session_store
-                match_selection = match_session_store.retrieve(context.match_session_id)
+                match_selection = await match_session_store.retrieve(context.match_session_id)
 
                 if match_selection:
                     thread.metadata["selected_match_id"] = match_selection.get("selected_match_id")
-                    thread.metadata["mortal_data"] = match_selection.get("mortal_data", self.mortal_data)
-                    thread.metadata["match_data"] = match_selection.get("match_data", self.match_data)
-                    thread.metadata["compatibility_data"] = match_selection.get("compatibility_data", self.compatibility_data)
-                    match_data_loaded = True
+                    couple = self.couples.register(
+                        match_selection.get("mortal_data", self.mortal_data),
+                        match_selection.get("match_data", self.match_data),
+                        match_selection.get("compatibility_data", self.compatibility_data),
+                    )
                     logger.info(f"Using match data from session: {context.match_session_id}")
 
-            if not match_data_loaded:
+            if couple is None:
                 # Legacy: use default files (backwards compatibility)
                 logger.info("Using default match data (legacy mode)")
-                thread.metadata["mortal_data"] = self.mortal_data
-                thread.metadata["match_data"] = self.match_data
-                thread.metadata["compatibility_data"] = self.compatibility_data
+                couple = self.default_couple
 
-            thread.metadata["current_compatibility"] = thread.metadata.get(
-                "compatibility_data", {}
-            ).get("overall_compatibility", 69)
+            # Only a reference is stored; the data itself is shared between threads
+            thread.metadata["couple"] = self.couples.reference(
+                couple, thread.metadata.get("selected_match_id")
+            )
+            thread.metadata["current_compatibility"] = couple.compatibility.get(
+                "overall_compatibility", 69
+            )
+            await self.store.save_thread(thread, context)
+        elif self._migrate_couple_reference(thread):
             await self.store.save_thread(thread, context)
 
         # Set thread title on first message (format: "Mortal & Match")
@@ -247,23 +276,15 @@ class CupidServer(ChatKitServer[RequestContext]):
             request_context=context,
         )
 
-        # Load all thread items for conversation history
-        items_page = await self.store.load_thread_items(
-            thread.id,
-            after=None,
-            limit=100,
-            order="desc",
-            context=context,
+        # Convert the latest 100 items to agent input format; items already converted
+        # on earlier turns are reused, so only the new ones are converted
+        input_items = await self.thread_item_converter.thread_to_agent_input(
+            self.store, thread.id, context, limit=100
         )
 
-        # Reverse to get chronological order
-        items = list(reversed(items_page.data))
-
-        # Convert to agent input format
-        input_items = await self.thread_item_converter.to_agent_input(items)
-
         # Get current chapter from thread.metadata (authoritative source)
         chapter = thread.metadata.get("chapter", 0)
+        couple = self._get_couple(thread)
         logger.info(f"Processing chapter {chapter}")
 
         # Wrap agent calls with Langfuse tracing metadata
@@ -273,11 +294,13 @@ class CupidServer(ChatKitServer[RequestContext]):
             user_id=context.match_session_id or "anonymous",
             tags=[f"chapter_{chapter}", "cupid"],
             metadata={
-                "mortal": thread.metadata.get("mortal_data", {}).get("name"),
-                "match": thread.metadata.get("match_data", {}).get("name"),
+                "mortal": couple.mortal_name or None,
+                "match": couple.match_name or None,
                 "compatibility": thread.metadata.get("current_compatibility"),
             }
         ):
+            started = time.perf_counter()
+
             # Yield events directly from chapter handlers (enables streaming)
             if chapter == 0:
                 async for event in self._handle_chapter_0(thread, input_items, agent_context, context):
@@ -307,6 +330,35 @@ class CupidServer(ChatKitServer[RequestContext]):
                 async for event in self._handle_chapter_final(thread, input_items, agent_context, context):
                     yield event
 
+            elapsed = time.perf_counter() - started
+            self.chapter_timings.record_turn(chapter, self.chapter_mode, elapsed)
+            logger.info(f"Chapter {chapter} took {elapsed * 1000:.0f} ms ({self.chapter_mode} mode)")
+
+    def _start_agent_run(
+        self,
+        chapter: int,
+        agent: Agent[Any],
+        input: str,
+        context: Any,
+        cache_input: str | None = None,
+    ) -> PendingAgentRun:
+        """Start a structured-output agent early in parallel mode (see chapter_execution).
+
+        Pass `cache_input` (the data string `context` was built from) for agents whose
+        output depends on nothing else, so prerendered or repeated inputs skip the model.
+        """
+        output = self.today_widgets.output(agent, cache_input) if cache_input is not None else None
+        return PendingAgentRun(
+            agent,
+            input,
+            context,
+            self.chapter_mode,
+            self.chapter_timings.stats(chapter, self.chapter_mode),
+            cache=self.display_cache,
+            cache_input=cache_input,
+            output=output,
+        )
+
     async def _handle_chapter_0(
         self,
         thread: ThreadMetadata,
@@ -326,23 +378,30 @@ class CupidServer(ChatKitServer[RequestContext]):
         # Show progress indicator
         yield ProgressUpdateEvent(text="Introducing Cupid...")
 
-        # Run Introduction agent - stream events directly
-        result = Runner.run_streamed(introduction_agent, conversation_history, context=agent_context)
-        async for event in stream_agent_response(agent_context, result):
-            yield event
-        conversation_history.extend([item.to_input_item() for item in result.new_items])
-
-        # Run DisplayMortal agent (pass minimal input - only needs context data, not conversation history)
-        display_context = DisplayMortalContext(state_mortal=mortal_str)
-        display_result = await Runner.run(
-            display_mortal_agent,
-            "display",
-            context=display_context,
+        # DisplayMortal only needs context data, not conversation history, so in parallel
+        # mode it runs while the introduction streams
+        display_context = cupid_agents.DisplayMortalContext(state_mortal=mortal_str)
+        display_run = self._start_agent_run(
+            0, cupid_agents.display_mortal_agent, "display", display_context, cache_input=mortal_str
         )
+        try:
+            # Run Introduction agent - stream events directly
+            narrative_started = time.perf_counter()
+            result = Runner.run_streamed(cupid_agents.introduction_agent, conversation_history, context=agent_context)
+            async for event in stream_agent_response(agent_context, result):
+                yield event
+            conversation_history.extend([item.to_input_item() for item in result.new_items])
+            narrative_finished = time.perf_counter()
+
+            # Widget is emitted after the narrative, as in sequential mode
+            display_output = await display_run.output()
+        finally:
+            display_run.cancel()
+        display_run.record_overlap(narrative_started, narrative_finished)
 
         # Build and yield ProfileCard widget
-        profile_data = display_result.final_output.model_dump()
-        profilecard_widget = build_profilecard_widget(profile_data)
+        profile_data = display_output.model_dump()
+        profilecard_widget = self.today_widgets.profile_card(cupid_agents.display_mortal_agent, mortal_str, display_output)
         widget_item = WidgetItem(
             thread_id=thread.id,
             id=self._generate_widget_id(thread),
@@ -374,24 +433,31 @@ class CupidServer(ChatKitServer[RequestContext]):
         # Show progress indicator
         yield ProgressUpdateEvent(text="Presenting your mortal...")
 
-        # Run Mortal agent with context - stream events directly
-        mortal_context = MortalContext(state_mortal=mortal_str)
-        result = Runner.run_streamed(mortal_agent, conversation_history, context=mortal_context)
-        async for event in stream_agent_response(agent_context, result):
-            yield event
-        conversation_history.extend([item.to_input_item() for item in result.new_items])
-
-        # Run DisplayMatch agent (pass [] - only needs context data, not conversation history)
-        display_context = DisplayMatchContext(state_match=match_str)
-        display_result = await Runner.run(
-            display_match_agent,
-            "display",
-            context=display_context,
+        # DisplayMatch only needs context data, not conversation history, so in parallel
+        # mode it runs while the mortal narrative streams
+        display_context = cupid_agents.DisplayMatchContext(state_match=match_str)
+        display_run = self._start_agent_run(
+            1, cupid_agents.display_match_agent, "display", display_context, cache_input=match_str
         )
+        try:
+            # Run Mortal agent with context - stream events directly
+            narrative_started = time.perf_counter()
+            mortal_context = cupid_agents.MortalContext(state_mortal=mortal_str)
+            result = Runner.run_streamed(cupid_agents.mortal_agent, conversation_history, context=mortal_context)
+            async for event in stream_agent_response(agent_context, result):
+                yield event
+            conversation_history.extend([item.to_input_item() for item in result.new_items])
+            narrative_finished = time.perf_counter()
+
+            # Widget is emitted after the narrative, as in sequential mode
+            display_output = await display_run.output()
+        finally:
+            display_run.cancel()
+        display_run.record_overlap(narrative_started, narrative_finished)
 
         # Build and yield ProfileCard widget for match
-        profile_data = display_result.final_output.model_dump()
-        profilecard_widget = build_profilecard_widget(profile_data)
+        profile_data = display_output.model_dump()
+        profilecard_widget = self.today_widgets.profile_card(cupid_agents.display_match_agent, match_str, display_output)
         widget_item = WidgetItem(
             thread_id=thread.id,
             id=self._generate_widget_id(thread),
@@ -424,8 +490,8 @@ class CupidServer(ChatKitServer[RequestContext]):
         yield ProgressUpdateEvent(text="Presenting the match...")
 
         # Run Match agent with context - stream events directly
-        match_context = MatchContext(state_match=match_str)
-        result = Runner.run_streamed(match_agent, conversation_history, context=match_context)
+        match_context = cupid_agents.MatchContext(state_match=match_str)
+        result = Runner.run_streamed(cupid_agents.match_agent, conversation_history, context=match_context)
         async for event in stream_agent_response(agent_context, result):
             yield event
         conversation_history.extend([item.to_input_item() for item in result.new_items])
@@ -463,34 +529,46 @@ class CupidServer(ChatKitServer[RequestContext]):
         yield ProgressUpdateEvent(text="Analyzing compatibility...")
 
         # Run DisplayCompatibilityCard agent (pass [] - only needs context data)
-        compat_context = DisplayCompatibilityCardContext(state_compatibility=compat_str)
-        display_result = await Runner.run(
-            display_compatibility_card_agent,
-            "display",
-            context=compat_context,
+        compat_context = cupid_agents.DisplayCompatibilityCardContext(state_compatibility=compat_str)
+        display_run = self._start_agent_run(
+            3, cupid_agents.display_compatibility_card_agent, "display", compat_context, cache_input=compat_str
         )
 
-        # Build and yield CompatibilityAnalysis widget
-        compat_data = display_result.final_output.model_dump()
-        compat_widget = build_compatibility_analysis_widget(
-            title=compat_data["title"],
-            subtitle=compat_data["subtitle"],
-            overall=int(compat_data["overall"]),
-            items=compat_data["items"],
-        )
-        widget_item = WidgetItem(
-            thread_id=thread.id,
-            id=self._generate_widget_id(thread),
-            created_at=datetime.now(),
-            widget=compat_widget,
-        )
-        yield ThreadItemDoneEvent(item=widget_item)
+        # In parallel mode the analysis starts now as well; the streamed run buffers its
+        # events until they are consumed after the card, so the order is unchanged
+        analysis_result = None
+        narrative_started = time.perf_counter()
+        if self.chapter_mode == "parallel":
+            analysis_result = Runner.run_streamed(
+                cupid_agents.compatibility_analysis_agent, conversation_history, context=agent_context
+            )
+        try:
+            display_output = await display_run.output()
 
-        # Run CompatibilityAnalysis agent - streams The Big Four narrative
-        analysis_result = Runner.run_streamed(compatibility_analysis_agent, conversation_history, context=agent_context)
-        async for event in stream_agent_response(agent_context, analysis_result):
-            yield event
-        conversation_history.extend([item.to_input_item() for item in analysis_result.new_items])
+            # Build and yield CompatibilityAnalysis widget
+            compat_widget = self.today_widgets.compatibility_card(
+                cupid_agents.display_compatibility_card_agent, compat_str, display_output
+            )
+            widget_item = WidgetItem(
+                thread_id=thread.id,
+                id=self._generate_widget_id(thread),
+                created_at=datetime.now(),
+                widget=compat_widget,
+            )
+            yield ThreadItemDoneEvent(item=widget_item)
+
+            # Run CompatibilityAnalysis agent - streams The Big Four narrative
+            if analysis_result is None:
+                narrative_started = time.perf_counter()
+                analysis_result = Runner.run_streamed(cupid_agents.compatibility_analysis_agent, conversation_history, context=agent_context)
+            async for event in stream_agent_response(agent_context, analysis_result):
+                yield event
+            conversation_history.extend([item.to_input_item() for item in analysis_result.new_items])
+        finally:
+            display_run.cancel()
+            if analysis_result is not None and not analysis_result.is_complete:
+                analysis_result.cancel()
+        display_run.record_overlap(narrative_started, time.perf_counter())
 
         # Build Continue Card widget directly (no need for agent - fixed message)
         continue_widget = build_continue_card_widget("Ok, we can start the story. Ready for the meet-cute?")
@@ -521,82 +599,122 @@ class CupidServer(ChatKitServer[RequestContext]):
         # Show progress indicator
         yield ProgressUpdateEvent(text="Starting the date...")
 
-        # Run StartCupidGame agent - stream events directly
-        result = Runner.run_streamed(start_cupid_game_agent, conversation_history, context=agent_context)
-        async for event in stream_agent_response(agent_context, result):
-            yield event
-        conversation_history.extend([item.to_input_item() for item in result.new_items])
-
-        # Extract last assistant message content for HasEnded check
-        last_narrative_content = ""
-        for item in reversed(conversation_history):
-            role = item.get("role") if isinstance(item, dict) else getattr(item, "role", None)
-            if role == "assistant":
-                content = item.get("content") if isinstance(item, dict) else getattr(item, "content", None)
-                text_content = ""
-                if isinstance(content, list):
-                    for block in content:
-                        if isinstance(block, dict) and block.get("type") == "output_text":
-                            text_content = block.get("text", "")
-                            break
-                        elif hasattr(block, "text"):
-                            text_content = block.text
-                            break
-                elif isinstance(content, str):
-                    text_content = content
-                # Use this message if it looks like narrative (not structured output)
-                if text_content and not text_content.startswith("{"):
-                    last_narrative_content = text_content
-                    break
-
-        # Run HasEnded agent to check if story has concluded
-        hasended_context = HasEndedContext(narrative_content=last_narrative_content)
-        ended_result = await Runner.run(
-            has_ended_agent,
-            "analyze",
-            context=hasended_context,
-        )
-        ended_data = ended_result.final_output.model_dump()
-        logger.info(f"HasEnded result: {ended_data}, narrative length: {len(last_narrative_content)}")
-
-        if ended_data.get("has_ended", False):
-            # Story has ended - show Continue Card with evaluation prompt
-            continue_widget = build_continue_card_widget(
-                "Ok, our story has ended. Would you like to see your evaluation? I have notes."
-            )
-            widget_item = WidgetItem(
-                thread_id=thread.id,
-                id=self._generate_widget_id(thread),
-                created_at=datetime.now(),
-                widget=continue_widget,
-            )
-            yield ThreadItemDoneEvent(item=widget_item)
-
-            # Move to evaluation chapter
-            await self._set_chapter(thread, context, 5)
-        else:
-            # Story continues - show choices
-            choices_context = DisplayChoicesContext(message_content=last_narrative_content)
-            choices_result = await Runner.run(
-                display_choices_agent,
+        # In "early" choices mode HasEnded starts on the partial narrative once it
+        # offers options (see chapter_execution)
+        stats = self.chapter_timings.stats(4, self.chapter_mode)
+        has_ended_run: PendingAgentRun | None = None
+        choices_run: PendingAgentRun | None = None
+        partial_text: dict[str, str] = {}
+
+        try:
+            # Run StartCupidGame agent - stream events directly
+            result = Runner.run_streamed(cupid_agents.start_cupid_game_agent, conversation_history, context=agent_context)
+            async for event in stream_agent_response(agent_context, result):
+                yield event
+                if (
+                    self.choices_mode == "early"
+                    and has_ended_run is None
+                    and isinstance(event, ThreadItemUpdatedEvent)
+                    and isinstance(event.update, AssistantMessageContentPartTextDelta)
+                ):
+                    text = partial_text.get(event.item_id, "") + event.update.delta
+                    partial_text[event.item_id] = text
+                    if OPTION_MARKER.search(text):
+                        has_ended_run = PendingAgentRun(
+                            cupid_agents.has_ended_agent,
+                            "analyze",
+                            cupid_agents.HasEndedContext(narrative_content=text),
+                            "parallel",
+                            stats,
+                        )
+            narrative_finished = time.perf_counter()
+            conversation_history.extend([item.to_input_item() for item in result.new_items])
+
+            # Extract last assistant message content for HasEnded check
+            last_narrative_content = ""
+            for item in reversed(conversation_history):
+                role = item.get("role") if isinstance(item, dict) else getattr(item, "role", None)
+                if role == "assistant":
+                    content = item.get("content") if isinstance(item, dict) else getattr(item, "content", None)
+                    text_content = ""
+                    if isinstance(content, list):
+                        for block in content:
+                            if isinstance(block, dict) and block.get("type") == "output_text":
+                                text_content = block.get("text", "")
+                                break
+                            elif hasattr(block, "text"):
+                                text_content = block.text
+                                break
+                    elif isinstance(content, str):
+                        text_content = content
+                    # Use this message if it looks like narrative (not structured output)
+                    if text_content and not text_content.startswith("{"):
+                        last_narrative_content = text_content
+                        break
+
+            # Run HasEnded agent to check if story has concluded; in the speculative
+            # modes DisplayChoices runs alongside it
+            concurrent = "sequential" if self.choices_mode == "serial" else "parallel"
+            if has_ended_run is None:
+                has_ended_run = PendingAgentRun(
+                    cupid_agents.has_ended_agent,
+                    "analyze",
+                    cupid_agents.HasEndedContext(narrative_content=last_narrative_content),
+                    concurrent,
+                    stats,
+                )
+            choices_run = PendingAgentRun(
+                cupid_agents.display_choices_agent,
                 "extract",
-                context=choices_context,
+                cupid_agents.DisplayChoicesContext(message_content=last_narrative_content),
+                concurrent,
+                stats,
             )
+            ended_data = (await has_ended_run.output()).model_dump()
+            logger.info(f"HasEnded result: {ended_data}, narrative length: {len(last_narrative_content)}")
 
-            # Build and yield Choice list widget
-            choices_data = choices_result.final_output.model_dump()
-            choices_widget = build_choice_list_widget(choices_data["items"])
-            widget_item = WidgetItem(
-                thread_id=thread.id,
-                id=self._generate_widget_id(thread),
-                created_at=datetime.now(),
-                widget=choices_widget,
-            )
-            yield ThreadItemDoneEvent(item=widget_item)
+            if ended_data.get("has_ended", False):
+                # Story has ended - discard any speculative choices
+                choices_run.cancel()
+
+                # Show Continue Card with evaluation prompt
+                continue_widget = build_continue_card_widget(
+                    "Ok, our story has ended. Would you like to see your evaluation? I have notes."
+                )
+                widget_item = WidgetItem(
+                    thread_id=thread.id,
+                    id=self._generate_widget_id(thread),
+                    created_at=datetime.now(),
+                    widget=continue_widget,
+                )
+                yield ThreadItemDoneEvent(item=widget_item)
+
+                # Move to evaluation chapter
+                await self._set_chapter(thread, context, 5)
+            else:
+                # Story continues - show choices
+                choices_data = (await choices_run.output()).model_dump()
+
+                # Build and yield Choice list widget
+                choices_widget = build_choice_list_widget(choices_data["items"])
+                widget_item = WidgetItem(
+                    thread_id=thread.id,
+                    id=self._generate_widget_id(thread),
+                    created_at=datetime.now(),
+                    widget=choices_widget,
+                )
+                self.chapter_timings.record_choice_latency(
+                    self.choices_mode, time.perf_counter() - narrative_finished
+                )
+                yield ThreadItemDoneEvent(item=widget_item)
 
-            # Stay in chapter 4 (loop) - don't increment chapter
+                # Stay in chapter 4 (loop) - don't increment chapter
+        finally:
+            for run in (has_ended_run, choices_run):
+                if run is not None:
+                    run.cancel()
 
-    async def _log_streaming_usage_to_langfuse(
+    def _log_streaming_usage_to_langfuse(
         self,
         agent_name: str,
         model: str,
@@ -609,33 +727,24 @@ class CupidServer(ChatKitServer[RequestContext]):
         streaming response usage data.
         See: https://github.com/Arize-ai/openinference/issues/2530
 
-        Uses Langfuse SDK v3 context manager API.
+        Only queues the usage; the telemetry sink creates the generations and
+        flushes them in the background, under the trace that is current here.
         """
-        from langfuse import Langfuse
-
-        langfuse = Langfuse()
+        trace_id, observation_id = current_trace()
         for response in result.raw_responses:
-            # Use v3 context manager API to create a generation
-            with langfuse.start_as_current_observation(
-                name=agent_name,
-                as_type="generation",
-                model=model,
-                input={"note": "See parent trace for full input"},
-                metadata={
-                    "workaround": "streaming_usage_capture",
-                    "thread_id": thread.id,
-                    "issue": "https://github.com/Arize-ai/openinference/issues/2530",
-                },
-            ) as generation:
-                generation.update(
+            telemetry_sink.record(
+                UsageRecord(
+                    agent_name=agent_name,
+                    model=model,
+                    thread_id=thread.id,
                     output={"text": output_text} if output_text else {"response_id": getattr(response, "response_id", None)},
-                    usage_details={
-                        "input_tokens": response.usage.input_tokens,
-                        "output_tokens": response.usage.output_tokens,
-                        "total_tokens": response.usage.total_tokens,
-                    },
+                    input_tokens=response.usage.input_tokens,
+                    output_tokens=response.usage.output_tokens,
+                    total_tokens=response.usage.total_tokens,
+                    trace_id=trace_id,
+                    parent_observation_id=observation_id,
                 )
-        langfuse.flush()
+            )
 
     async def _handle_chapter_5(
         self,
@@ -651,7 +760,7 @@ class CupidServer(ChatKitServer[RequestContext]):
         yield ProgressUpdateEvent(text="Preparing your evaluation...")
 
         # Run CupidEvaluation agent - stream events and capture text content
-        result = Runner.run_streamed(cupid_evaluation_agent, input_items, context=agent_context)
+        result = Runner.run_streamed(cupid_agents.cupid_evaluation_agent, input_items, context=agent_context)
         captured_text = []
         async for event in stream_agent_response(agent_context, result):
             yield event
@@ -664,7 +773,7 @@ class CupidServer(ChatKitServer[RequestContext]):
         # Workaround: manually log usage for streaming agents
         # https://github.com/Arize-ai/openinference/issues/2530
         output_text = "\n\n".join(captured_text)
-        await self._log_streaming_usage_to_langfuse("CupidEvaluation", "gpt-5.1", result, thread, output_text)
+        self._log_streaming_usage_to_langfuse("CupidEvaluation", "gpt-5.1", result, thread, output_text)
 
         # Move to final chapter (End agent)
         await self._set_chapter(thread, context, 6)
@@ -683,7 +792,7 @@ class CupidServer(ChatKitServer[RequestContext]):
         yield ProgressUpdateEvent(text="Wrapping up...")
 
         # Run End agent - stream events and capture text content
-        result = Runner.run_streamed(end_agent, input_items, context=agent_context)
+        result = Runner.run_streamed(cupid_agents.end_agent, input_items, context=agent_context)
         captured_text = []
         async for event in stream_agent_response(agent_context, result):
             yield event
@@ -696,7 +805,7 @@ class CupidServer(ChatKitServer[RequestContext]):
         # Workaround: manually log usage for streaming agents
         # https://github.com/Arize-ai/openinference/issues/2530
         output_text = "\n\n".join(captured_text)
-        await self._log_streaming_usage_to_langfuse("End", "gpt-5.1", result, thread, output_text)
+        self._log_streaming_usage_to_langfuse("End", "gpt-5.1", result, thread, output_text)
 
     async def to_message_content(self, _input: Attachment) -> ResponseInputContentParam:
         raise RuntimeError("File attachments are not supported.")
@@ -0,0 +1,189 @@
+"""Process-wide sink for the streaming usage generations sent to Langfuse.
+
+openinference-instrumentation-openai-agents does not capture usage for streamed
+responses (https://github.com/Arize-ai/openinference/issues/2530), so chapters 5
+and 6 report it themselves. Doing that inline meant a client per call and a
+blocking `flush()` on the event loop before the chapter could advance.
+
+Chapters now only append a `UsageRecord` to a bounded in-memory queue, which
+costs microseconds. A background task drains the queue in batches: it creates
+the generations on a worker thread with the shared Langfuse client, then
+flushes once per batch. Each record carries the trace and observation that
+were current when it was recorded, so its generation is still attached to the
+chat turn's trace. When the exporter falls behind and the queue is full,
+records are dropped (oldest first by default) and counted.
+
+Configured with CUPID_TELEMETRY_QUEUE_SIZE, CUPID_TELEMETRY_BATCH_SIZE,
+CUPID_TELEMETRY_FLUSH_SECONDS and CUPID_TELEMETRY_DROP ("oldest" or "newest").
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Any, Deque, Dict, List, Tuple
+
+from langfuse import get_client
+from opentelemetry import trace as otel_trace
+
+logger = logging.getLogger(__name__)
+
+ISSUE_URL = "https://github.com/Arize-ai/openinference/issues/2530"
+
+
+@dataclass(frozen=True)
+class UsageRecord:
+    """Token usage of one raw response, as captured at the end of a streamed run."""
+
+    agent_name: str
+    model: str
+    thread_id: str
+    output: Dict[str, Any]
+    input_tokens: int
+    output_tokens: int
+    total_tokens: int
+    trace_id: str | None = None
+    parent_observation_id: str | None = None
+
+
+@dataclass
+class TelemetryStats:
+    recorded: int = 0
+    exported: int = 0
+    # Dropped because the queue was full
+    dropped: int = 0
+    batches: int = 0
+    # Batches that failed to export (their records are lost)
+    failed_batches: int = 0
+
+
+class TelemetrySink:
+    """Bounded queue of usage records with a batching background exporter."""
+
+    def __init__(
+        self,
+        max_queue: int = 1000,
+        batch_size: int = 50,
+        flush_interval: float = 2.0,
+        drop: str = "oldest",
+    ) -> None:
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.drop = drop
+        self._queue: Deque[UsageRecord] = deque()
+        self._stats = TelemetryStats()
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+
+    def record(self, record: UsageRecord) -> None:
+        """Queue a record without blocking; drops one when the queue is full."""
+        if len(self._queue) >= self.max_queue:
+            self._stats.dropped += 1
+            if self.drop == "newest":
+                return
+            self._queue.popleft()
+        self._queue.append(record)
+        self._stats.recorded += 1
+        if len(self._queue) >= self.batch_size:
+            self._wakeup.set()
+
+    def start(self) -> None:
+        """Start the background exporter (call from a running event loop)."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the exporter after exporting whatever is still queued."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        while self._queue:
+            await self._export_batch()
+
+    def stats(self) -> Dict[str, Any]:
+        return {**asdict(self._stats), "queued": len(self._queue), "max_queue": self.max_queue}
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            while self._queue:
+                await self._export_batch()
+
+    async def _export_batch(self) -> None:
+        batch = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+        try:
+            await asyncio.to_thread(_export, batch)
+        except Exception:
+            self._stats.failed_batches += 1
+            logger.exception(f"Failed to export {len(batch)} usage records to Langfuse")
+            return
+        self._stats.batches += 1
+        self._stats.exported += len(batch)
+
+
+def _export(batch: List[UsageRecord]) -> None:
+    """Create one generation per record and flush them together (worker thread)."""
+    langfuse = get_client()
+    for record in batch:
+        trace_context: Dict[str, str] | None = None
+        if record.trace_id:
+            trace_context = {"trace_id": record.trace_id}
+            if record.parent_observation_id:
+                trace_context["parent_span_id"] = record.parent_observation_id
+        generation = langfuse.start_observation(
+            trace_context=trace_context,  # type: ignore[arg-type]
+            name=record.agent_name,
+            as_type="generation",
+            model=record.model,
+            input={"note": "See parent trace for full input"},
+            output=record.output,
+            metadata={
+                "workaround": "streaming_usage_capture",
+                "thread_id": record.thread_id,
+                "issue": ISSUE_URL,
+            },
+            usage_details={
+                "input_tokens": record.input_tokens,
+                "output_tokens": record.output_tokens,
+                "total_tokens": record.total_tokens,
+            },
+        )
+        generation.end()
+    langfuse.flush()
+
+
+def current_trace() -> Tuple[str | None, str | None]:
+    """(trace_id, observation_id) of the caller's active span, if any.
+
+    Read from OpenTelemetry directly: the Langfuse helpers log an error when
+    there is no active span, which is the normal case outside agent runs.
+    """
+    span_context = otel_trace.get_current_span().get_span_context()
+    if not span_context.is_valid:
+        return None, None
+    return format(span_context.trace_id, "032x"), format(span_context.span_id, "016x")
+
+
+def telemetry_sink_from_env() -> TelemetrySink:
+    drop = os.getenv("CUPID_TELEMETRY_DROP", "oldest").lower()
+    if drop not in ("oldest", "newest"):
+        raise ValueError(f"Unknown CUPID_TELEMETRY_DROP: {drop}")
+    return TelemetrySink(
+        max_queue=int(os.getenv("CUPID_TELEMETRY_QUEUE_SIZE", "1000")),
+        batch_size=int(os.getenv("CUPID_TELEMETRY_BATCH_SIZE", "50")),
+        flush_interval=float(os.getenv("CUPID_TELEMETRY_FLUSH_SECONDS", "2")),
+        drop=drop,
+    )
+
+
+# Singleton instance, started and stopped by the app lifespan
+telemetry_sink = telemetry_sink_from_env()
@@ -2,14 +2,45 @@
 
 from __future__ import annotations
 
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, List
+
+from agents import TResponseInputItem
 from chatkit.agents import ThreadItemConverter
-from chatkit.types import HiddenContextItem
+from chatkit.store import Store
+from chatkit.types import HiddenContextItem, ThreadItem
+from chatkit_store import LogCursor
 from openai.types.responses import ResponseInputTextParam
 from openai.types.responses.response_input_item_param import Message
 
 
+@dataclass
+class _ConvertedItem:
+    seq: int
+    item: ThreadItem
+    # Conversion as a non-final message; computed on demand.
+    converted: List[TResponseInputItem] | None = None
+
+
+@dataclass
+class _ThreadInput:
+    cursor: LogCursor
+    items: Deque[_ConvertedItem] = field(default_factory=deque)
+
+
 class BasicThreadItemConverter(ThreadItemConverter):
-    """Adds HiddenContextItem support."""
+    """Adds HiddenContextItem support and incremental conversion of thread history.
+
+    `thread_to_agent_input` caches converted items per (thread, seq) and, on each
+    turn, only converts the items appended since the previous turn. The cache for
+    a thread is dropped when the store's log epoch changes, i.e. when an older
+    item was saved or deleted.
+    """
+
+    def __init__(self, max_threads: int = 1024) -> None:
+        self._threads: OrderedDict[str, _ThreadInput] = OrderedDict()
+        self._max_threads = max_threads
 
     async def hidden_context_to_input(self, item: HiddenContextItem):
         return Message(
@@ -22,3 +53,46 @@ class BasicThreadItemConverter(ThreadItemConverter):
             ],
             role="user",
         )
+
+    async def thread_to_agent_input(
+        self,
+        store: Store[Any],
+        thread_id: str,
+        context: Any,
+        limit: int = 100,
+    ) -> list[TResponseInputItem]:
+        """Convert the latest `limit` items of a thread, oldest first.
+
+        Equivalent to `to_agent_input` over those items. The returned input items
+        are shared with the cache and must not be mutated.
+        """
+        load_item_log = getattr(store, "load_item_log", None)
+        if load_item_log is None:
+            page = await store.load_thread_items(thread_id, None, limit, "desc", context)
+            return await self.to_agent_input(list(reversed(page.data)))
+
+        cached = self._threads.pop(thread_id, None)
+        log = await load_item_log(thread_id, cached.cursor if cached else None, limit, context)
+        if cached is None or log.reset:
+            cached = _ThreadInput(cursor=log.cursor, items=deque(maxlen=limit))
+        cached.cursor = log.cursor
+        cached.items.extend(_ConvertedItem(seq, item) for seq, item in log.items)
+
+        self._threads[thread_id] = cached
+        while len(self._threads) > self._max_threads:
+            self._threads.popitem(last=False)
+
+        output: list[TResponseInputItem] = []
+        for index, entry in enumerate(cached.items):
+            if index == len(cached.items) - 1:
+                # The last message converts differently (e.g. quoted text), so it is
+                # never served from the cache.
+                output.extend(await self._thread_item_to_input_item(entry.item))
+                continue
+            if entry.converted is None:
+                entry.converted = await self._thread_item_to_input_item(
+                    entry.item, is_last_message=False
+                )
+            output.extend(entry.converted)
+        return output
+
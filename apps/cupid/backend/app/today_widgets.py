@@ -0,0 +1,182 @@
+"""Prerendered profile and compatibility cards for today's couples.
+
+`TodayDataStore` knows the day's mortal, every candidate match and each
+compatibility file before any player arrives. `TodayWidgets.warm()` runs the
+display agents for all of them (through the display cache, so a warm restart
+costs no tokens) and builds their widgets up front. Chapters 0, 1 and 3 then
+take both the agent output and the widget from memory, leaving only the
+narrative stream on the critical path.
+
+Entries are keyed by the agent and the exact YAML string the chapter passes to
+it, so a thread whose data is not today's simply misses and runs as before.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Tuple
+
+from agents import Agent, Runner
+from chatkit.widgets import WidgetRoot
+from pydantic import BaseModel
+
+from . import agents as cupid_agents
+from .data.today_store import TodayDataStore
+from .display_cache import DisplayOutputCache
+from .widgets.compatibility_analysis_widget import build_compatibility_analysis_widget
+from .widgets.profilecard_widget import build_profilecard_widget
+from .yaml_cache import render_yaml
+
+logger = logging.getLogger(__name__)
+
+
+def render_profile_card(output: BaseModel) -> WidgetRoot:
+    """Build the ProfileCard widget from a DisplayMortal/DisplayMatch output."""
+    return build_profilecard_widget(output.model_dump())
+
+
+def render_compatibility_card(output: BaseModel) -> WidgetRoot:
+    """Build the CompatibilityAnalysis widget from a DisplayCompatibilityCard output."""
+    compat_data = output.model_dump()
+    return build_compatibility_analysis_widget(
+        title=compat_data["title"],
+        subtitle=compat_data["subtitle"],
+        overall=int(compat_data["overall"]),
+        items=compat_data["items"],
+    )
+
+
+@dataclass(frozen=True)
+class PrerenderedCard:
+    """A display agent output and the widget built from it."""
+
+    output: BaseModel
+    # Shared by every thread that shows this card; never mutated after warm-up.
+    widget: WidgetRoot
+
+
+class TodayWidgets:
+    """Warms and serves today's display cards from memory."""
+
+    def __init__(
+        self,
+        today_store: TodayDataStore,
+        display_cache: DisplayOutputCache | None,
+        concurrency: int = 4,
+    ) -> None:
+        self._today_store = today_store
+        self._display_cache = display_cache
+        self._concurrency = concurrency
+        # Replaced wholesale after each warm-up, so readers never see a partial set.
+        self._cards: Dict[Tuple[str, str], PrerenderedCard] = {}
+        self._warm_task: asyncio.Task[None] | None = None
+        self.hits = 0
+        self.misses = 0
+
+    def output(self, agent: Agent[Any], data_str: str) -> BaseModel | None:
+        """The prerendered output of `agent` for `data_str`, if warmed."""
+        card = self._cards.get((agent.name, data_str))
+        if card is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return card.output
+
+    def profile_card(self, agent: Agent[Any], data_str: str, output: BaseModel) -> WidgetRoot:
+        """The prerendered ProfileCard for `data_str`, or one built from `output`."""
+        card = self._cards.get((agent.name, data_str))
+        return card.widget if card is not None else render_profile_card(output)
+
+    def compatibility_card(self, agent: Agent[Any], data_str: str, output: BaseModel) -> WidgetRoot:
+        """The prerendered CompatibilityAnalysis card for `data_str`, or one built from `output`."""
+        card = self._cards.get((agent.name, data_str))
+        return card.widget if card is not None else render_compatibility_card(output)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"cards": len(self._cards), "hits": self.hits, "misses": self.misses}
+
+    async def warm(self) -> None:
+        """Run the display agents for all of today's data and swap in the new cards."""
+        data = self._today_store.load()
+        jobs: List[Tuple[Agent[Any], Any, str, Callable[[BaseModel], WidgetRoot]]] = []
+
+        # Same rendering as the couple registry, so keys match CupidServer._get_data_strings.
+        mortal_str = render_yaml(data["mortal"])
+        mortal_context = cupid_agents.DisplayMortalContext(state_mortal=mortal_str)
+        jobs.append((cupid_agents.display_mortal_agent, mortal_context, mortal_str, render_profile_card))
+        for match in data["matches"]:
+            match_str = render_yaml(match["data"])
+            match_context = cupid_agents.DisplayMatchContext(state_match=match_str)
+            jobs.append((cupid_agents.display_match_agent, match_context, match_str, render_profile_card))
+        for compat in data["compatibility"].values():
+            compat_str = render_yaml(compat)
+            jobs.append(
+                (
+                    cupid_agents.display_compatibility_card_agent,
+                    cupid_agents.DisplayCompatibilityCardContext(state_compatibility=compat_str),
+                    compat_str,
+                    render_compatibility_card,
+                )
+            )
+
+        semaphore = asyncio.Semaphore(self._concurrency)
+
+        async def render(
+            agent: Agent[Any], context: Any, data_str: str, build: Callable[[BaseModel], WidgetRoot]
+        ) -> Tuple[Tuple[str, str], PrerenderedCard] | None:
+            async with semaphore:
+                try:
+                    output = await self._run(agent, context, data_str)
+                except Exception:
+                    logger.exception(f"Failed to warm {agent.name} card")
+                    return None
+            return (agent.name, data_str), PrerenderedCard(output=output, widget=build(output))
+
+        results = await asyncio.gather(*(render(*job) for job in jobs))
+        self._cards = dict(result for result in results if result is not None)
+        logger.info(f"Warmed {len(self._cards)}/{len(jobs)} display cards for today's data")
+
+    async def _run(self, agent: Agent[Any], context: Any, data_str: str) -> BaseModel:
+        async def run() -> BaseModel:
+            result = await Runner.run(agent, "display", context=context)
+            return result.final_output
+
+        if self._display_cache is None:
+            return await run()
+        key = await self._display_cache.key(agent, context, data_str)
+        return await self._display_cache.get_or_run(key, agent.output_type, run)
+
+    def start(self) -> None:
+        """Warm in the background and re-warm whenever TodayDataStore reloads.
+
+        Must be called from a running event loop (e.g. the app lifespan).
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            # Load before listening, so the initial load doesn't trigger a second warm-up.
+            self._today_store.load()
+        except FileNotFoundError as e:
+            logger.warning(f"Today's data unavailable: {e}")
+        # Reloads may happen on a worker thread (see TodayDataStore.start_watching).
+        self._today_store.add_reload_listener(
+            lambda _data: loop.call_soon_threadsafe(self._schedule_warm)
+        )
+        self._schedule_warm()
+
+    async def stop(self) -> None:
+        if self._warm_task is not None:
+            self._warm_task.cancel()
+            await asyncio.gather(self._warm_task, return_exceptions=True)
+
+    def _schedule_warm(self) -> None:
+        if self._warm_task is not None and not self._warm_task.done():
+            self._warm_task.cancel()
+        self._warm_task = asyncio.create_task(self._warm_logged())
+
+    async def _warm_logged(self) -> None:
+        try:
+            await self.warm()
+        except FileNotFoundError as e:
+            logger.warning(f"Skipping display card warm-up: {e}")
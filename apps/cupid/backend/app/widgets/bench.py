@@ -0,0 +1,124 @@
+"""Microbenchmark of the widget build paths.
+
+Usage:
+    python -m app.widgets.bench
+    python -m app.widgets.bench --iterations 5000
+
+For `build_choice_list_widget` and `build_profilecard_widget` this compares:
+- original: render with Jinja's HTML-safe tojson, parse, and validate the whole
+  tree (the build path before templates were compiled against a skeleton).
+- skeleton: render with the plain JSON tojson and parse, then reuse unchanged
+  components from the prevalidated skeleton (new data on every call).
+- memo: a repeated call with the same data.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from jinja2 import Environment
+
+from . import choice_list_widget, profilecard_widget
+from .choice_list_widget import build_choice_list_widget
+from .profilecard_widget import build_profilecard_widget
+from .widget_template import WidgetTemplate, root_adapter, widget_templates
+
+SIGNS = ["Aries", "Taurus", "Gemini", "Cancer", "Leo", "Virgo", "Libra", "Scorpio"]
+
+
+def _choice_data(i: int) -> Dict[str, Any]:
+    return {
+        "items": [
+            {"key": key, "title": f"Option {key} for turn {i}: say something {random.random():.6f}"}
+            for key in "ABCD"
+        ]
+    }
+
+
+def _profile_data(i: int) -> Dict[str, Any]:
+    return {
+        "name": f"Person {i}",
+        "age": 20 + i % 50,
+        "occupation": "Lighthouse keeper",
+        "location": "Portland, ME",
+        "birthdate": f"1990-01-{1 + i % 28:02d}",
+        "origin": {"city": "Bangor", "state": "ME", "country": "USA"},
+        "astrological_notes": {
+            "sun_sign": random.choice(SIGNS),
+            "moon_sign": random.choice(SIGNS),
+            "venus_sign": random.choice(SIGNS),
+            "mars_sign": random.choice(SIGNS),
+        },
+    }
+
+
+def _timed(operation: Callable[[int], Any], count: int) -> List[float]:
+    timings = []
+    for i in range(count):
+        start = time.perf_counter()
+        operation(i)
+        timings.append((time.perf_counter() - start) * 1_000_000)
+    return timings
+
+
+def _report(label: str, timings: List[float]) -> None:
+    timings.sort()
+    p95 = timings[int(len(timings) * 0.95)]
+    print(f"  {label:<10} median {statistics.median(timings):8.1f} µs   p95 {p95:8.1f} µs")
+
+
+def _original_build(widget_path: Path) -> Callable[[Dict[str, Any]], Any]:
+    definition = json.loads(widget_path.read_text(encoding="utf-8"))
+    template = Environment(autoescape=False).from_string(definition["template"])
+    return lambda data: root_adapter().validate_python(json.loads(template.render(**data)))
+
+
+def bench(
+    name: str,
+    widget_path: Path,
+    template: WidgetTemplate,
+    build: Callable[[Dict[str, Any]], Any],
+    make_data: Callable[[int], Dict[str, Any]],
+    iterations: int,
+) -> None:
+    datasets = [make_data(i) for i in range(iterations)]
+    print(name)
+    original = _original_build(widget_path)
+    _report("original", _timed(lambda i: original(datasets[i]), iterations))
+    template.build_uncached(datasets[0])  # builds the skeleton
+    _report("skeleton", _timed(lambda i: template.build_uncached(datasets[i]), iterations))
+    build(datasets[0])
+    _report("memo", _timed(lambda i: build(datasets[0]), iterations))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    bench(
+        "build_choice_list_widget",
+        choice_list_widget.WIDGET_PATH,
+        widget_templates.get(choice_list_widget.WIDGET_FILE),
+        lambda data: build_choice_list_widget(data["items"]),
+        _choice_data,
+        args.iterations,
+    )
+    bench(
+        "build_profilecard_widget",
+        profilecard_widget.WIDGET_PATH,
+        widget_templates.get(profilecard_widget.WIDGET_FILE),
+        build_profilecard_widget,
+        _profile_data,
+        args.iterations,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -7,13 +7,11 @@ from typing import Any, List
 
 from chatkit.widgets import WidgetRoot
 
-from .widget_template import WidgetTemplate
+from .widget_template import widget_templates
 
-# Locate the widget file relative to this file
-WIDGET_PATH = Path(__file__).parent / "Choice list.widget"
-
-# Load the Choice list widget template
-choice_list_template = WidgetTemplate.from_file(str(WIDGET_PATH))
+# The registry reads and compiles this file on the first build
+WIDGET_FILE = "Choice list.widget"
+WIDGET_PATH = Path(__file__).parent / WIDGET_FILE
 
 
 def build_choice_list_widget(items: List[dict[str, str]]) -> WidgetRoot:
@@ -27,4 +25,4 @@ def build_choice_list_widget(items: List[dict[str, str]]) -> WidgetRoot:
     Returns:
         WidgetRoot ready to be streamed to the frontend
     """
-    return choice_list_template.build({"items": items})
+    return widget_templates.get(WIDGET_FILE).build({"items": items})
@@ -7,13 +7,11 @@ from typing import Any, List
 
 from chatkit.widgets import WidgetRoot
 
-from .widget_template import WidgetTemplate
+from .widget_template import widget_templates
 
-# Locate the widget file relative to this file
-WIDGET_PATH = Path(__file__).parent / "CompatibilityAnalysis.widget"
-
-# Load the CompatibilityAnalysis widget template
-compatibility_analysis_template = WidgetTemplate.from_file(str(WIDGET_PATH))
+# The registry reads and compiles this file on the first build
+WIDGET_FILE = "CompatibilityAnalysis.widget"
+WIDGET_PATH = Path(__file__).parent / WIDGET_FILE
 
 
 def build_compatibility_analysis_widget(
@@ -40,7 +38,7 @@ def build_compatibility_analysis_widget(
     Returns:
         WidgetRoot ready to be streamed to the frontend
     """
-    return compatibility_analysis_template.build({
+    return widget_templates.get(WIDGET_FILE).build({
         "title": title,
         "subtitle": subtitle,
         "overall": overall,
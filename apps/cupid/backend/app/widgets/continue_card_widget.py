@@ -7,13 +7,11 @@ from typing import Any
 
 from chatkit.widgets import WidgetRoot
 
-from .widget_template import WidgetTemplate
+from .widget_template import widget_templates
 
-# Locate the widget file relative to this file
-WIDGET_PATH = Path(__file__).parent / "Continue Card.widget"
-
-# Load the Continue Card widget template
-continue_card_template = WidgetTemplate.from_file(str(WIDGET_PATH))
+# The registry reads and compiles this file on the first build
+WIDGET_FILE = "Continue Card.widget"
+WIDGET_PATH = Path(__file__).parent / WIDGET_FILE
 
 
 def build_continue_card_widget(confirmation_message: str) -> WidgetRoot:
@@ -25,4 +23,4 @@ def build_continue_card_widget(confirmation_message: str) -> WidgetRoot:
     Returns:
         WidgetRoot ready to be streamed to the frontend
     """
-    return continue_card_template.build({"confirmation_message": confirmation_message})
+    return widget_templates.get(WIDGET_FILE).build({"confirmation_message": confirmation_message})
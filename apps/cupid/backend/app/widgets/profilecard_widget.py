@@ -7,13 +7,11 @@ from typing import Any
 
 from chatkit.widgets import WidgetRoot
 
-from .widget_template import WidgetTemplate
+from .widget_template import widget_templates
 
-# Locate the widget file relative to this file
-WIDGET_PATH = Path(__file__).parent / "ProfileCard02.widget"
-
-# Load the ProfileCard widget template
-profilecard_template = WidgetTemplate.from_file(str(WIDGET_PATH))
+# The registry reads and compiles this file on the first build
+WIDGET_FILE = "ProfileCard02.widget"
+WIDGET_PATH = Path(__file__).parent / WIDGET_FILE
 
 
 def build_profilecard_widget(character_data: dict[str, Any]) -> WidgetRoot:
@@ -28,4 +26,4 @@ def build_profilecard_widget(character_data: dict[str, Any]) -> WidgetRoot:
     Returns:
         WidgetRoot ready to be streamed to the frontend
     """
-    return profilecard_template.build(character_data)
+    return widget_templates.get(WIDGET_FILE).build(character_data)
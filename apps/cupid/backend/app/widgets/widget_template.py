@@ -4,10 +4,13 @@ from __future__ import annotations
 
 import inspect
 import json
+import threading
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, TypeVar
+from typing import Any, Dict, List, Tuple, TypeVar
 
-from chatkit.widgets import WidgetRoot
+from chatkit.widgets import WidgetComponent, WidgetRoot
 from jinja2 import Environment
 from pydantic import BaseModel, TypeAdapter
 
@@ -15,18 +18,46 @@ T = TypeVar("T", bound=BaseModel)
 
 # Jinja2 environment for rendering templates
 env = Environment(autoescape=False, enable_async=False)
+# Templates render JSON, not HTML: the default tojson also HTML-escapes and wraps
+# in Markup, which parses to the same values but costs about a third of a render.
+env.filters["tojson"] = lambda value: json.dumps(value, ensure_ascii=False)
+
+
+# Building the validators for the widget unions takes tens of milliseconds, so
+# it happens on the first build rather than at import.
+@lru_cache(maxsize=None)
+def root_adapter() -> TypeAdapter[WidgetRoot]:
+    return TypeAdapter(WidgetRoot)
+
+
+@lru_cache(maxsize=None)
+def component_adapter() -> TypeAdapter[WidgetComponent]:
+    return TypeAdapter(WidgetComponent)
 
 
 class WidgetTemplate:
-    """Utility for loading and building widgets from a .widget file."""
+    """Utility for loading and building widgets from a .widget file.
+
+    Most of the cost of a build is pydantic validation of the whole component
+    tree, and most of a rendered tree is identical from one build to the next
+    (layout, icons, styling). The first build is validated in full and kept as
+    a skeleton; later builds reuse the skeleton's validated components wherever
+    the rendered JSON is unchanged and validate only the components that differ.
+    Results are also memoized by input data.
 
-    adapter: TypeAdapter[WidgetRoot] = TypeAdapter(WidgetRoot)
+    Built widgets are shared between calls (and with the skeleton) and must not
+    be mutated.
+    """
 
-    def __init__(self, definition: dict[str, Any]):
+    def __init__(self, definition: dict[str, Any], memo_size: int = 128):
         self.version = definition["version"]
         self.name = definition["name"]
         self.template = env.from_string(definition["template"])
         self.data_schema = definition.get("jsonSchema", {})
+        self._memo_size = memo_size
+        self._memo: OrderedDict[str, WidgetRoot] = OrderedDict()
+        # (rendered dict, validated widget) from the first build
+        self._skeleton: Tuple[dict[str, Any], WidgetRoot] | None = None
 
     @classmethod
     def from_file(cls, file_path: str) -> "WidgetTemplate":
@@ -50,9 +81,97 @@ class WidgetTemplate:
         if isinstance(data, BaseModel):
             data = data.model_dump()
 
-        # Render Jinja2 template
-        rendered = self.template.render(**data)
+        key = json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+        widget = self._memo.get(key)
+        if widget is not None:
+            self._memo.move_to_end(key)
+            return widget
+
+        widget = self.build_uncached(data)
+        if self._memo_size > 0:
+            self._memo[key] = widget
+            while len(self._memo) > self._memo_size:
+                self._memo.popitem(last=False)
+        return widget
+
+    def build_uncached(self, data: dict[str, Any]) -> WidgetRoot:
+        """Render and validate, reusing the skeleton's unchanged components."""
+        widget_dict = json.loads(self.template.render(**data))
+        if self._skeleton is None:
+            widget = root_adapter().validate_python(widget_dict)
+            self._skeleton = (widget_dict, widget)
+            return widget
+        return _reuse_validated(widget_dict, *self._skeleton, root_adapter())
+
+
+class WidgetTemplateRegistry:
+    """The .widget files in a directory, each read and compiled on first use.
+
+    Builder modules look their template up here when they build, so importing
+    them (and the server) does no file I/O or template compilation.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self._directory = directory
+        self._templates: Dict[str, WidgetTemplate] = {}
+        self._lock = threading.Lock()
+
+    def get(self, filename: str) -> WidgetTemplate:
+        template = self._templates.get(filename)
+        if template is None:
+            with self._lock:
+                template = self._templates.get(filename)
+                if template is None:
+                    template = WidgetTemplate.from_file(str(self._directory / filename))
+                    self._templates[filename] = template
+        return template
+
+    def loaded(self) -> List[str]:
+        return sorted(self._templates)
+
+
+widget_templates = WidgetTemplateRegistry(Path(__file__).parent)
+
+
+def _reuse_validated(
+    rendered: Any,
+    skeleton_dict: Any,
+    skeleton: Any,
+    adapter: TypeAdapter[Any],
+) -> Any:
+    """Validate `rendered` against `adapter`, reusing `skeleton` for unchanged subtrees.
+
+    Children are matched to the skeleton's by position. A component whose own
+    fields changed is re-validated in one call, with its unchanged children
+    passed as the skeleton's instances (which pydantic accepts as they are)
+    and its changed leaf children passed as plain dicts.
+    """
+    if rendered == skeleton_dict:
+        return skeleton
+    if not _same_component(rendered, skeleton_dict, skeleton):
+        return adapter.validate_python(rendered)
+
+    children = rendered.get("children")
+    skeleton_children = getattr(skeleton, "children", None)
+    if not (isinstance(children, list) and isinstance(skeleton_children, list)):
+        return type(skeleton).model_validate(rendered)
+
+    reused: list[Any] = []
+    for child, child_dict, child_model in zip(children, skeleton_dict.get("children") or [], skeleton_children):
+        if child == child_dict:
+            reused.append(child_model)
+        elif isinstance(child, dict) and "children" in child and _same_component(child, child_dict, child_model):
+            reused.append(_reuse_validated(child, child_dict, child_model, component_adapter()))
+        else:
+            reused.append(child)
+    reused.extend(children[len(reused):])
+    return type(skeleton).model_validate({**rendered, "children": reused})
+
 
-        # Parse JSON and validate
-        widget_dict = json.loads(rendered)
-        return self.adapter.validate_python(widget_dict)
+def _same_component(rendered: Any, skeleton_dict: Any, skeleton: Any) -> bool:
+    return (
+        isinstance(rendered, dict)
+        and isinstance(skeleton_dict, dict)
+        and isinstance(skeleton, BaseModel)
+        and rendered.get("type") == skeleton_dict.get("type")
+    )
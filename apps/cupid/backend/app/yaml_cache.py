@@ -0,0 +1,66 @@
+"""Process-wide LRU of YAML renderings, keyed by content hash.
+
+Agents receive couple data as YAML (`yaml.dump(data, default_flow_style=False)`),
+and `yaml.dump` is pure Python and takes milliseconds for a person file. The
+same person appears in many couples (today's mortal is in all of them) and in
+many threads, so renderings are memoized by a hash of the data's canonical JSON.
+That is cheap to compute and identical for equal dicts, whatever their identity
+or key order.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from collections import OrderedDict
+from typing import Any, Dict
+
+import yaml
+
+
+class YAMLRenderCache:
+    """Content-hash keyed LRU of `yaml.dump` output, with hit/miss counters."""
+
+    def __init__(self, max_entries: int = 512) -> None:
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, str] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def content_hash(data: Any) -> str:
+        canonical = json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def render(self, data: Any) -> str:
+        """YAML for `data`, rendered at most once per distinct content while cached."""
+        key = self.content_hash(data)
+        rendered = self._entries.get(key)
+        if rendered is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return rendered
+        self.misses += 1
+        rendered = yaml.dump(data, default_flow_style=False)
+        self._entries[key] = rendered
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+        return rendered
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+        }
+
+
+# Shared by the couple registry and the startup warm stage
+yaml_render_cache = YAMLRenderCache()
+
+
+def render_yaml(data: Any) -> str:
+    """YAML passed to the agents' instructions, via the shared cache."""
+    return yaml_render_cache.render(data)
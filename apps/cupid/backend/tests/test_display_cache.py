@@ -0,0 +1,47 @@
+"""Regression tests for DisplayOutputCache's shared in-flight runs.
+
+Run from backend/ with `python -m pytest -q`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from pydantic import BaseModel
+
+from app.display_cache import DisplayOutputCache
+
+
+class Output(BaseModel):
+    x: int
+
+
+def test_waiters_share_the_replacement_of_a_cancelled_run() -> None:
+    async def scenario() -> None:
+        cache = DisplayOutputCache(max_entries=8)
+        runs = 0
+        started = asyncio.Event()
+
+        async def run() -> Output:
+            nonlocal runs
+            runs += 1
+            started.set()
+            await asyncio.sleep(0.05)
+            return Output(x=runs)
+
+        owner = asyncio.create_task(cache.get_or_run("k", Output, run))
+        await started.wait()
+        waiters = [asyncio.create_task(cache.get_or_run("k", Output, run)) for _ in range(2)]
+        await asyncio.sleep(0)
+        owner.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await owner
+
+        # Both waiters share one replacement run, and neither trips over the other's entry
+        assert [output.x for output in await asyncio.gather(*waiters)] == [2, 2]
+        assert runs == 2
+        assert cache._inflight == {}
+        assert (await cache.get_or_run("k", Output, run)).x == 2
+
+    asyncio.run(scenario())
@@ -0,0 +1,56 @@
+"""Regression tests for the RESP client behind RedisMatchSessionStore.
+
+Run from backend/ with `python -m pytest -q`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.match_session_backends import RESPConnection, read_reply
+
+SLOW_REPLY_SECONDS = 0.2
+
+
+async def _echo_server() -> asyncio.AbstractServer:
+    """Replies to `ECHO <value>` with the value, delaying the reply for `slow`."""
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                _, value = await read_reply(reader)
+                if value == b"slow":
+                    await asyncio.sleep(SLOW_REPLY_SECONDS)
+                writer.write(b"$%d\r\n%s\r\n" % (len(value), value))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle, "127.0.0.1", 0)
+
+
+def test_cancelled_pipeline_does_not_leak_replies() -> None:
+    async def scenario() -> None:
+        server = await _echo_server()
+        port = server.sockets[0].getsockname()[1]
+        conn = RESPConnection(f"redis://127.0.0.1:{port}/0")
+        try:
+            # Cancel after the command is written, while the reply is still pending
+            pending = asyncio.create_task(conn.execute("ECHO", "slow"))
+            await asyncio.sleep(SLOW_REPLY_SECONDS / 4)
+            pending.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await pending
+
+            # The next caller must get its own reply, not the cancelled one
+            assert await conn.execute("ECHO", "fast") == b"fast"
+        finally:
+            await conn.close()
+            server.close()
+            await server.wait_closed()
+
+    asyncio.run(scenario())
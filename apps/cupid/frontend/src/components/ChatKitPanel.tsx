@@ -9,6 +9,7 @@ import {
   STARTER_PROMPTS,
 } from "../lib/config";
 import { LEXEND_FONT_SOURCES } from "../lib/fonts";
+import { getUserId } from "../lib/userId";
 import { useAppStore } from "../store/useAppStore";
 
 export type ChatKitControl = ReturnType<typeof useChatKit>;
@@ -30,10 +31,14 @@ export function ChatKitPanel({ onChatKitReady, className }: ChatKitPanelProps) {
   // Track if we've already started the game
   const hasStartedGame = useRef(false);
 
-  // Custom fetch that passes match session ID via header
+  // Custom fetch that passes the user and match session IDs via headers
   const customFetch = useMemo(() => {
+    const userId = getUserId();
     return async (input: RequestInfo | URL, init?: RequestInit) => {
       const headers = new Headers(init?.headers ?? {});
+      if (userId) {
+        headers.set("x-user-id", userId);
+      }
       if (matchSessionId) {
         headers.set("x-match-session-id", matchSessionId);
       }
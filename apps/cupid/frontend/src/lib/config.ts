@@ -8,6 +8,8 @@ export const CHATKIT_API_DOMAIN_KEY =
 
 export const THEME_STORAGE_KEY = "cupid-theme";
 
+export const USER_ID_STORAGE_KEY = "cupid-user-id";
+
 export const GREETING = "CUPID";
 
 export const STARTER_PROMPTS: StartScreenPrompt[] = [
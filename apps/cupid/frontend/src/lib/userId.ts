@@ -0,0 +1,25 @@
+import { USER_ID_STORAGE_KEY } from "./config";
+
+/**
+ * Stable per-browser id sent as the x-user-id header.
+ *
+ * The backend partitions thread storage by it, so each browser only sees its
+ * own threads. It identifies a browser, not an authenticated user.
+ */
+export function getUserId(): string {
+  if (typeof window === "undefined") {
+    return "";
+  }
+  let userId = window.localStorage.getItem(USER_ID_STORAGE_KEY);
+  if (!userId) {
+    // randomUUID only exists in secure contexts (https or localhost)
+    userId =
+      typeof window.crypto.randomUUID === "function"
+        ? window.crypto.randomUUID()
+        : Array.from(window.crypto.getRandomValues(new Uint8Array(16)), (byte) =>
+            byte.toString(16).padStart(2, "0"),
+          ).join("");
+    window.localStorage.setItem(USER_ID_STORAGE_KEY, userId);
+  }
+  return userId;
+}
@@ -16,11 +16,11 @@ from chatkit.types import (
     UserMessageItem,
     WidgetItem,
 )
+from chatkit_store import ThreadStore, create_store
 from openai.types.responses import ResponseInputContentParam
 from pydantic import Field
 
 from .agents.simple_agent import simple_agent
-from .memory_store import MemoryStore
 from .thread_item_converter import BasicThreadItemConverter
 
 logging.basicConfig(level=logging.INFO)
@@ -28,7 +28,7 @@ logging.basicConfig(level=logging.INFO)
 
 class SimpleAgentContext(AgentContext):
     """Context for the simple chat agent."""
-    store: Annotated[MemoryStore, Field(exclude=True)]
+    store: Annotated[ThreadStore, Field(exclude=True)]
     request_context: dict[str, Any]
 
 
@@ -36,7 +36,7 @@ class SimpleChatServer(ChatKitServer[dict[str, Any]]):
     """ChatKit server for simple conversation."""
 
     def __init__(self) -> None:
-        self.store: MemoryStore = MemoryStore()
+        self.store: ThreadStore = create_store()
         super().__init__(self.store)
         self.thread_item_converter = BasicThreadItemConverter()
 
@@ -7,6 +7,21 @@ class Settings(BaseSettings):
     langfuse_base_url: str = "https://us.cloud.langfuse.com"
     database_path: str = "/app/data/cupid.db"
     sync_interval_seconds: int = 300
+    # SQLite pool: read-only connections next to the single writer, and per-connection pragmas
+    db_readers: int = 4
+    db_mmap_size: int = 268435456
+    db_cache_size_kib: int = 65536
+    # Rows per executemany call when the sync writes to SQLite
+    sync_batch_size: int = 1000
+    # Incremental sync: refetch this far behind each high-water mark, and list
+    # everything once per reconcile interval
+    sync_overlap_seconds: int = 600
+    sync_reconcile_interval_seconds: int = 86400
+    # Langfuse API: requests/second (token bucket, shared by concurrent page fetches),
+    # burst size and pages fetched at once
+    langfuse_requests_per_second: float = 5.0
+    langfuse_burst: int = 1
+    langfuse_max_concurrency: int = 4
 
     class Config:
         env_file = ".env"
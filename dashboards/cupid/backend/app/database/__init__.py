@@ -1,4 +1,4 @@
-from .connection import get_db, init_db
+from .connection import close_db, get_db, get_read_db, init_db
 from .schema import SCHEMA
 
-__all__ = ["get_db", "init_db", "SCHEMA"]
+__all__ = ["get_db", "get_read_db", "init_db", "close_db", "SCHEMA"]
@@ -1,26 +1,152 @@
-import aiosqlite
+"""SQLite connection pool: one serialized writer and a few readers.
+
+Every aiosqlite connection owns a worker thread, so opening one per `async with`
+paid for a thread, a file open and the pragmas on every call. The pool opens its
+connections once. The database runs in WAL mode, so readers see the last
+committed state and never wait for the writer: dashboard requests keep being
+served while a sync is writing.
+
+- `get_db()` lends out the writer. Callers take turns, and a transaction the
+  caller left open is rolled back when the block exits, as closing the
+  connection used to do.
+- `get_read_db()` lends out one of `settings.db_readers` read-only connections.
+"""
+
+import asyncio
+import logging
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
+import aiosqlite
+
 from app.config import settings
-from .schema import SCHEMA
+from .schema import MIGRATIONS, SCHEMA
+
+logger = logging.getLogger(__name__)
 
 _db_path: str = settings.database_path
 
 
+class ConnectionPool:
+    """Long-lived aiosqlite connections with the pragmas applied once at open."""
+
+    def __init__(self, path: str, readers: int = 4) -> None:
+        self.path = path
+        self.readers = readers
+        self._writer: aiosqlite.Connection | None = None
+        self._write_lock = asyncio.Lock()
+        self._idle_readers: asyncio.Queue[aiosqlite.Connection] = asyncio.Queue()
+        self._all_readers: list[aiosqlite.Connection] = []
+
+    async def open(self) -> None:
+        try:
+            # journal_mode is persistent, so the writer sets it once for everyone
+            self._writer = await self._connect("PRAGMA journal_mode=WAL;")
+            for _ in range(self.readers):
+                reader = await self._connect("PRAGMA query_only=ON;")
+                self._all_readers.append(reader)
+                self._idle_readers.put_nowait(reader)
+        except BaseException:
+            await self.close()
+            raise
+        logger.info(f"Opened SQLite pool on {self.path}: 1 writer, {self.readers} readers")
+
+    async def _connect(self, pragmas: str) -> aiosqlite.Connection:
+        db = await aiosqlite.connect(self.path)
+        db.row_factory = aiosqlite.Row
+        try:
+            # executescript runs each statement to completion, so no pragma result
+            # is left holding a lock
+            await db.executescript(
+                f"""
+                PRAGMA busy_timeout=5000;
+                {pragmas}
+                PRAGMA synchronous=NORMAL;
+                PRAGMA mmap_size={settings.db_mmap_size};
+                PRAGMA cache_size=-{settings.db_cache_size_kib};
+                PRAGMA temp_store=MEMORY;
+                """
+            )
+        except BaseException:
+            await db.close()
+            raise
+        return db
+
+    @asynccontextmanager
+    async def writer(self) -> AsyncGenerator[aiosqlite.Connection, None]:
+        assert self._writer is not None, "pool is not open"
+        async with self._write_lock:
+            try:
+                yield self._writer
+            finally:
+                if self._writer.in_transaction:
+                    await self._writer.rollback()
+
+    @asynccontextmanager
+    async def reader(self) -> AsyncGenerator[aiosqlite.Connection, None]:
+        db = await self._idle_readers.get()
+        try:
+            yield db
+        finally:
+            self._idle_readers.put_nowait(db)
+
+    async def close(self) -> None:
+        async with self._write_lock:
+            for db in self._all_readers:
+                await db.close()
+            self._all_readers.clear()
+            self._idle_readers = asyncio.Queue()
+            if self._writer is not None:
+                await self._writer.close()
+                self._writer = None
+
+
+_pool: ConnectionPool | None = None
+_pool_lock = asyncio.Lock()
+
+
+async def _get_pool() -> ConnectionPool:
+    global _pool
+    if _pool is None:
+        async with _pool_lock:
+            if _pool is None:
+                pool = ConnectionPool(_db_path, readers=settings.db_readers)
+                await pool.open()
+                _pool = pool
+    return _pool
+
+
 async def init_db() -> None:
-    """Initialize database with schema."""
-    async with aiosqlite.connect(_db_path) as db:
+    """Open the connection pool and initialize the schema."""
+    async with get_db() as db:
         await db.executescript(SCHEMA)
+        for table, column, definition in MIGRATIONS:
+            cursor = await db.execute(f"PRAGMA table_info({table})")
+            if column not in {row["name"] for row in await cursor.fetchall()}:
+                await db.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+                logger.info(f"Added column {table}.{column}")
         await db.commit()
 
 
+async def close_db() -> None:
+    """Close the pooled connections (app shutdown)."""
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
+
+
 @asynccontextmanager
 async def get_db() -> AsyncGenerator[aiosqlite.Connection, None]:
-    """Get database connection."""
-    db = await aiosqlite.connect(_db_path)
-    db.row_factory = aiosqlite.Row
-    try:
+    """Get the writer connection (serialized across callers)."""
+    pool = await _get_pool()
+    async with pool.writer() as db:
+        yield db
+
+
+@asynccontextmanager
+async def get_read_db() -> AsyncGenerator[aiosqlite.Connection, None]:
+    """Get a read-only connection; runs concurrently with the writer."""
+    pool = await _get_pool()
+    async with pool.reader() as db:
         yield db
-    finally:
-        await db.close()
@@ -4,11 +4,23 @@ CREATE TABLE IF NOT EXISTS sync_metadata (
     id INTEGER PRIMARY KEY CHECK (id = 1),
     last_sync_at TEXT,
     last_trace_timestamp TEXT,
+    last_session_created_at TEXT,
+    last_observation_start_time TEXT,
+    last_reconciled_at TEXT,
     sync_status TEXT DEFAULT 'idle',
     error_message TEXT,
     updated_at TEXT DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Last committed page of a sync that has not finished (one row per entity)
+CREATE TABLE IF NOT EXISTS sync_checkpoints (
+    entity TEXT PRIMARY KEY,
+    query_json TEXT NOT NULL,
+    page INTEGER NOT NULL,
+    items INTEGER DEFAULT 0,
+    updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+
 -- Sessions
 CREATE TABLE IF NOT EXISTS sessions (
     id TEXT PRIMARY KEY,
@@ -113,3 +125,12 @@ CREATE INDEX IF NOT EXISTS idx_daily_metrics_date ON daily_metrics(date DESC);
 -- Initialize sync metadata
 INSERT OR IGNORE INTO sync_metadata (id, sync_status) VALUES (1, 'idle');
 """
+
+# Columns added after a table was first created: (table, column, definition).
+# CREATE TABLE IF NOT EXISTS leaves existing databases alone, so init_db adds
+# any of these that are missing.
+MIGRATIONS = [
+    ("sync_metadata", "last_session_created_at", "TEXT"),
+    ("sync_metadata", "last_observation_start_time", "TEXT"),
+    ("sync_metadata", "last_reconciled_at", "TEXT"),
+]
@@ -0,0 +1,196 @@
+"""Full sync against a local stub of the Langfuse API, before and after the fetch scheduler.
+
+Usage (from backend/):
+    python -m app.fetch_bench
+    python -m app.fetch_bench --observations 5000 --rate 15 --server-limit 20 --latency-ms 150
+
+Serves sessions, traces and observations from a local HTTP server that adds
+`--latency-ms` to every response and answers 429 (Retry-After: 1) past
+`--server-limit` requests in any second. Runs a full sync into a temporary
+database twice: with the previous fetch path (a new connection per request,
+serial pages, 300 ms between pages) and with the pooled client, the token
+bucket at `--rate` requests/second and `--concurrency` pages in flight.
+Reports wall time, requests, 429s and the most requests the stub saw in any
+one second.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import tempfile
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, AsyncIterator
+
+import httpx
+import uvicorn
+from fastapi import FastAPI, Response
+
+from app.config import settings
+from app.database import close_db, connection, get_read_db, init_db
+from app.services.langfuse_client import LangfuseClient, RateLimitError
+from app.services.sync_service import PageFetcher, SyncService
+from app.sync_bench import synthetic_observations
+
+
+class StubLangfuse:
+    """In-memory /api/public listing endpoints with latency and a request limit."""
+
+    def __init__(self, sessions: int, traces: int, observations: int, latency: float, limit: int) -> None:
+        self.latency = latency
+        self.limit = limit
+        self.data = {
+            "sessions": [{"id": f"session-{i}", "createdAt": f"2025-01-01T00:00:{i % 60:02d}Z"} for i in range(sessions)],
+            "traces": [
+                {
+                    "id": f"trace-{i:06d}",
+                    "sessionId": f"session-{i % sessions}",
+                    "name": "Agent workflow",
+                    "timestamp": f"2025-01-01T{i // 3600 % 24:02d}:{i // 60 % 60:02d}:{i % 60:02d}Z",
+                    "tags": [f"chapter_{i % 7}"],
+                }
+                for i in range(traces)
+            ],
+            "observations": synthetic_observations(observations),
+        }
+        self.request_times: list[float] = []
+        self.rejected = 0
+        self._window: deque[float] = deque()
+
+    def app(self) -> FastAPI:
+        app = FastAPI()
+
+        @app.get("/api/public/{entity}")
+        async def listing(entity: str, response: Response, page: int = 1, limit: int = 50) -> dict[str, Any]:
+            now = time.monotonic()
+            self.request_times.append(now)
+            while self._window and now - self._window[0] >= 1.0:
+                self._window.popleft()
+            if len(self._window) >= self.limit:
+                self.rejected += 1
+                response.status_code = 429
+                response.headers["Retry-After"] = "1"
+                return {"message": "rate limited"}
+            self._window.append(now)
+            await asyncio.sleep(self.latency)
+            items = self.data[entity]
+            return {
+                "data": items[(page - 1) * limit : page * limit],
+                "meta": {"page": page, "limit": limit, "totalItems": len(items), "totalPages": -(-len(items) // limit)},
+            }
+
+        return app
+
+    def max_per_second(self, window: float = 1.0) -> int:
+        """Most requests (served or rejected) in any `window`-second span."""
+        most, start = 0, 0
+        for end, at in enumerate(self.request_times):
+            while at - self.request_times[start] >= window:
+                start += 1
+            most = max(most, end - start + 1)
+        return most
+
+
+class LegacyLangfuseClient(LangfuseClient):
+    """The previous request path: a new AsyncClient per request, sleep-based backoff."""
+
+    async def _request(self, endpoint: str, params: dict | None = None, max_retries: int = 5) -> dict[str, Any]:
+        headers = {"Authorization": f"Basic {self.auth_header}", "Content-Type": "application/json"}
+        async with httpx.AsyncClient(timeout=30.0) as client:
+            for attempt in range(max_retries):
+                response = await client.get(f"{self.base_url}{endpoint}", headers=headers, params=params)
+                if response.status_code == 429:
+                    self.rate_limited += 1
+                    await asyncio.sleep((2**attempt) * 2)
+                    continue
+                response.raise_for_status()
+                return response.json()
+        raise RateLimitError(f"Rate limited after {max_retries} retries")
+
+
+class LegacySyncService(SyncService):
+    """The previous pagination: one page at a time, 300 ms apart."""
+
+    async def _pages(
+        self, entity: str, fetch: PageFetcher, first_page: int
+    ) -> AsyncIterator[tuple[int, list[dict[str, Any]], dict[str, Any]]]:
+        page = first_page
+        while True:
+            result = await fetch(page)
+            batch = result.get("data", [])
+            meta = result.get("meta", {})
+            if not batch:
+                return
+            yield page, batch, meta
+            if page >= meta.get("totalPages", 1):
+                return
+            page += 1
+            await asyncio.sleep(0.3)
+
+
+async def _run_sync(label: str, service: SyncService, stub: StubLangfuse, database: Path) -> None:
+    connection._db_path = str(database)
+    stub.request_times.clear()
+    stub.rejected = 0
+    await init_db()
+    started = time.perf_counter()
+    try:
+        await service.sync()
+    finally:
+        seconds = time.perf_counter() - started
+        await service.client.aclose()
+    async with get_read_db() as db:
+        cursor = await db.execute("SELECT COUNT(*) AS cnt FROM observations")
+        observations = (await cursor.fetchone())["cnt"]
+    await close_db()
+    print(
+        f"{label:<8} {seconds:7.2f} s  {len(stub.request_times):4d} requests  {stub.rejected:3d} x 429"
+        f"  max {stub.max_per_second():3d} req/s  {observations:,} observations stored"
+    )
+
+
+async def run(args: argparse.Namespace) -> None:
+    stub = StubLangfuse(args.sessions, args.traces, args.observations, args.latency_ms / 1000, args.server_limit)
+    server = uvicorn.Server(uvicorn.Config(stub.app(), host="127.0.0.1", port=0, log_level="warning"))
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+    port = server.servers[0].sockets[0].getsockname()[1]
+
+    settings.langfuse_base_url = f"http://127.0.0.1:{port}"
+    settings.langfuse_requests_per_second = args.rate
+    settings.langfuse_max_concurrency = args.concurrency
+    print(
+        f"stub: {args.latency_ms} ms latency, {args.server_limit} req/s limit; "
+        f"client: {args.rate} req/s, {args.concurrency} pages in flight"
+    )
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            legacy = LegacySyncService()
+            legacy.client = LegacyLangfuseClient()
+            await _run_sync("before", legacy, stub, Path(directory) / "before.db")
+            await _run_sync("after", SyncService(), stub, Path(directory) / "after.db")
+    finally:
+        server.should_exit = True
+        await serving
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=300)
+    parser.add_argument("--traces", type=int, default=2000)
+    parser.add_argument("--observations", type=int, default=5000)
+    parser.add_argument("--latency-ms", type=float, default=150)
+    parser.add_argument("--server-limit", type=int, default=20)
+    parser.add_argument("--rate", type=float, default=15)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
 from app.config import settings
-from app.database import init_db
+from app.database import close_db, init_db
 from app.services import SyncService
 from app.routers import sessions_router, agents_router, metrics_router, sync_router
 
@@ -20,6 +20,7 @@ sync_service = SyncService()
 async def lifespan(app: FastAPI):
     # Initialize database
     await init_db()
+    app.state.sync_service = sync_service
 
     # Schedule background sync
     scheduler.add_job(
@@ -41,6 +42,8 @@ async def lifespan(app: FastAPI):
 
     # Cleanup
     scheduler.shutdown()
+    await sync_service.client.aclose()
+    await close_db()
 
 
 app = FastAPI(
@@ -1,19 +1,26 @@
-from fastapi import APIRouter, BackgroundTasks
+from fastapi import APIRouter, BackgroundTasks, Request
 
 from app.services import SyncService
 
 router = APIRouter(prefix="/api/sync", tags=["sync"])
-sync_service = SyncService()
+
+
+def _sync_service(request: Request) -> SyncService:
+    # The app's single service, so manual syncs share its client and rate limiter
+    return request.app.state.sync_service
 
 
 @router.get("/status")
-async def get_sync_status():
+async def get_sync_status(request: Request):
     """Get current sync status."""
-    return await sync_service.get_status()
+    return await _sync_service(request).get_status()
 
 
 @router.post("/trigger")
-async def trigger_sync(background_tasks: BackgroundTasks):
+async def trigger_sync(request: Request, background_tasks: BackgroundTasks):
     """Manually trigger a sync from Langfuse API."""
+    sync_service = _sync_service(request)
+    if sync_service.running:
+        return {"status": "running", "message": "A sync is already running"}
     background_tasks.add_task(sync_service.sync)
     return {"status": "started", "message": "Sync job started - fetching from Langfuse API"}
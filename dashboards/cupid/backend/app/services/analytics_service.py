@@ -2,7 +2,7 @@ import json
 from datetime import datetime, timedelta, timezone
 from typing import Any
 
-from app.database import get_db
+from app.database import get_read_db
 from app.constants import AGENT_CATEGORIES, CHAPTER_NAMES
 
 
@@ -54,7 +54,7 @@ class AnalyticsService:
 
         where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
 
-        async with get_db() as db:
+        async with get_read_db() as db:
             # Get total count
             cursor = await db.execute(
                 f"SELECT COUNT(*) as count FROM sessions {where_clause}",
@@ -128,7 +128,7 @@ class AnalyticsService:
 
         where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
 
-        async with get_db() as db:
+        async with get_read_db() as db:
             cursor = await db.execute(
                 f"""
                 SELECT
@@ -170,7 +170,7 @@ class AnalyticsService:
 
     async def get_conversation(self, session_id: str) -> dict[str, Any]:
         """Get full conversation for a session."""
-        async with get_db() as db:
+        async with get_read_db() as db:
             # Get session info
             cursor = await db.execute(
                 """
@@ -378,7 +378,7 @@ class AnalyticsService:
 
     async def get_agents(self) -> list[dict[str, Any]]:
         """Get all agents with stats."""
-        async with get_db() as db:
+        async with get_read_db() as db:
             cursor = await db.execute(
                 """
                 SELECT
@@ -405,7 +405,7 @@ class AnalyticsService:
 
     async def get_agent_detail(self, agent_name: str) -> dict[str, Any] | None:
         """Get agent detail with recent executions."""
-        async with get_db() as db:
+        async with get_read_db() as db:
             # Get stats
             cursor = await db.execute(
                 """
@@ -462,7 +462,7 @@ class AnalyticsService:
 
     async def get_agent_charts(self, agent_name: str) -> dict[str, Any]:
         """Get chart data for an agent."""
-        async with get_db() as db:
+        async with get_read_db() as db:
             # Latency over time (last 20 executions)
             cursor = await db.execute(
                 """
@@ -522,7 +522,7 @@ class AnalyticsService:
             session_params.append(time_filter)
         session_where = f"WHERE {' AND '.join(session_conditions)}" if session_conditions else ""
 
-        async with get_db() as db:
+        async with get_read_db() as db:
             # KPIs from sessions
             cursor = await db.execute(
                 f"""
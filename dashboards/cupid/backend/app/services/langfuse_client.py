@@ -1,8 +1,12 @@
 import asyncio
 import base64
-import httpx
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from typing import Any
 
+import httpx
+
 from app.config import settings
 
 
@@ -10,13 +14,102 @@ class RateLimitError(Exception):
     pass
 
 
+class TokenBucket:
+    """Request rate limiter shared by every call of a client.
+
+    Allows `rate` requests per second with bursts of up to `burst`. On a 429 the
+    rate is halved and all callers pause for the server's Retry-After; each
+    success then adds back 5% of the configured rate until it is reached again.
+    """
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait for a token; callers are served in arrival order."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def throttle(self, pause_seconds: float) -> None:
+        """Back off after a 429."""
+        self.rate = max(self.max_rate / 16, self.rate / 2)
+        self._tokens = 0.0
+        self._paused_until = max(self._paused_until, time.monotonic() + pause_seconds)
+
+    def succeeded(self) -> None:
+        self.rate = min(self.max_rate, self.rate + self.max_rate * 0.05)
+
+
+def _retry_after(response: httpx.Response) -> float | None:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
 class LangfuseClient:
-    """Async Langfuse API client with rate limit handling."""
+    """Async Langfuse API client with rate limit handling.
+
+    All requests share one `httpx.AsyncClient`, so connections (and their TLS
+    sessions) are kept alive across pages, and one `TokenBucket`, so concurrent
+    page fetches together stay under `langfuse_requests_per_second`.
+    """
 
     def __init__(self):
         self.base_url = f"{settings.langfuse_base_url}/api/public"
         credentials = f"{settings.langfuse_public_key}:{settings.langfuse_secret_key}"
         self.auth_header = base64.b64encode(credentials.encode()).decode()
+        self.limiter = TokenBucket(settings.langfuse_requests_per_second, settings.langfuse_burst)
+        self.rate_limited = 0
+        self._client: httpx.AsyncClient | None = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # Created on first use, inside the event loop that will use it
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers={
+                    "Authorization": f"Basic {self.auth_header}",
+                    "Content-Type": "application/json",
+                },
+                timeout=30.0,
+                limits=httpx.Limits(
+                    max_connections=settings.langfuse_max_concurrency,
+                    max_keepalive_connections=settings.langfuse_max_concurrency,
+                ),
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the pooled connections (app shutdown)."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
     async def _request(
         self,
@@ -24,38 +117,40 @@ class LangfuseClient:
         params: dict | None = None,
         max_retries: int = 5,
     ) -> dict[str, Any]:
-        """Make authenticated request with exponential backoff."""
-        url = f"{self.base_url}{endpoint}"
-        headers = {
-            "Authorization": f"Basic {self.auth_header}",
-            "Content-Type": "application/json",
-        }
-
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            for attempt in range(max_retries):
-                try:
-                    response = await client.get(url, headers=headers, params=params)
-
-                    if response.status_code == 429:
-                        wait_time = (2**attempt) * 2
-                        await asyncio.sleep(wait_time)
-                        continue
-
-                    response.raise_for_status()
-                    return response.json()
-
-                except httpx.HTTPStatusError as e:
-                    if e.response.status_code == 429 and attempt < max_retries - 1:
-                        wait_time = (2**attempt) * 2
-                        await asyncio.sleep(wait_time)
-                        continue
-                    raise
+        """Make authenticated request, backing off on 429 as the server asks."""
+        client = self._get_client()
+        for attempt in range(max_retries):
+            await self.limiter.acquire()
+            response = await client.get(endpoint, params=params)
+
+            if response.status_code == 429:
+                self.rate_limited += 1
+                wait_time = _retry_after(response)
+                if wait_time is None:
+                    wait_time = (2**attempt) * 2
+                self.limiter.throttle(wait_time)
+                continue
+
+            response.raise_for_status()
+            self.limiter.succeeded()
+            return response.json()
 
         raise RateLimitError(f"Rate limited after {max_retries} retries")
 
-    async def get_sessions(self, limit: int = 100, page: int = 1) -> dict[str, Any]:
-        """Fetch sessions."""
-        return await self._request("/sessions", {"limit": limit, "page": page})
+    async def get_sessions(
+        self,
+        limit: int = 100,
+        page: int = 1,
+        from_timestamp: str | None = None,
+        to_timestamp: str | None = None,
+    ) -> dict[str, Any]:
+        """Fetch sessions, optionally only those created in [from_timestamp, to_timestamp)."""
+        params = {"limit": limit, "page": page}
+        if from_timestamp:
+            params["fromTimestamp"] = from_timestamp
+        if to_timestamp:
+            params["toTimestamp"] = to_timestamp
+        return await self._request("/sessions", params)
 
     async def get_traces(
         self,
@@ -84,11 +179,17 @@ class LangfuseClient:
         limit: int = 500,
         page: int = 1,
         trace_id: str | None = None,
+        from_start_time: str | None = None,
+        to_start_time: str | None = None,
     ) -> dict[str, Any]:
-        """Fetch observations."""
+        """Fetch observations, optionally only those started in [from_start_time, to_start_time)."""
         params = {"limit": limit, "page": page}
         if trace_id:
             params["traceId"] = trace_id
+        if from_start_time:
+            params["fromStartTime"] = from_start_time
+        if to_start_time:
+            params["toStartTime"] = to_start_time
         return await self._request("/observations", params)
 
     async def check_connection(self) -> bool:
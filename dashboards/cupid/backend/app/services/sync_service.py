@@ -1,44 +1,216 @@
 import asyncio
 import json
 import logging
-from datetime import datetime, timezone
-from typing import Any
+from collections import deque
+from contextlib import aclosing
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, Sequence
 
-from app.database import get_db
+import aiosqlite
+
+from app.database import get_db, get_read_db
 from app.config import settings
 from .langfuse_client import LangfuseClient, RateLimitError
 
 logger = logging.getLogger(__name__)
 
-# Delay between paginated API requests to avoid rate limits
-REQUEST_DELAY_MS = 300
+
+def _upsert_sql(table: str, columns: Sequence[str], compare: Sequence[str]) -> str:
+    """INSERT ... ON CONFLICT(id) DO UPDATE that skips rows whose `compare` columns are unchanged.
+
+    Skipped rows are not rewritten at all (no page writes, no index updates), so
+    re-syncing the same history costs reads only. `synced_at` therefore records
+    when a row last changed.
+    """
+    updates = ", ".join(f"{c} = excluded.{c}" for c in columns if c != "id")
+    current = ", ".join(f"{table}.{c}" for c in compare)
+    incoming = ", ".join(f"excluded.{c}" for c in compare)
+    placeholders = ", ".join("?" for _ in columns)
+    return (
+        f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders}) "
+        f"ON CONFLICT(id) DO UPDATE SET {updates} "
+        f"WHERE ({current}) IS NOT ({incoming})"
+    )
+
+
+SESSION_COLUMNS = ("id", "created_at", "environment", "synced_at")
+TRACE_COLUMNS = (
+    "id", "session_id", "user_id", "name", "timestamp", "total_cost", "latency",
+    "metadata_json", "tags_json", "chapter", "mortal_name", "match_name", "synced_at",
+)
+OBSERVATION_COLUMNS = (
+    "id", "trace_id", "parent_observation_id", "type", "name", "start_time", "end_time",
+    "latency_ms", "model", "total_tokens", "prompt_tokens", "completion_tokens",
+    "calculated_total_cost", "input_json", "output_json", "metadata_json", "level", "synced_at",
+)
+
+UPSERT_SESSION = _upsert_sql("sessions", SESSION_COLUMNS, SESSION_COLUMNS[1:-1])
+UPSERT_TRACE = _upsert_sql("traces", TRACE_COLUMNS, TRACE_COLUMNS[1:-1])
+UPSERT_OBSERVATION = _upsert_sql("observations", OBSERVATION_COLUMNS, OBSERVATION_COLUMNS[1:-1])
+
+
+def session_row(session: dict[str, Any], synced_at: str) -> tuple:
+    return (
+        session["id"],
+        session.get("createdAt", ""),
+        session.get("environment", ""),
+        synced_at,
+    )
+
+
+def trace_row(trace: dict[str, Any], synced_at: str) -> tuple:
+    metadata = trace.get("metadata", {}) or {}
+    tags = trace.get("tags", []) or []
+    chapter = next(
+        (t for t in tags if t.startswith("chapter_")), None
+    )
+    return (
+        trace["id"],
+        trace.get("sessionId"),
+        trace.get("userId"),
+        trace.get("name"),
+        trace.get("timestamp"),
+        trace.get("totalCost", 0),
+        trace.get("latency", 0),
+        json.dumps(metadata),
+        json.dumps(tags),
+        chapter,
+        metadata.get("mortal"),
+        metadata.get("match"),
+        synced_at,
+    )
+
+
+def observation_row(obs: dict[str, Any], synced_at: str) -> tuple:
+    start_time = obs.get("startTime")
+    end_time = obs.get("endTime")
+    latency_ms = None
+    if start_time and end_time:
+        try:
+            start = datetime.fromisoformat(start_time.replace("Z", "+00:00"))
+            end = datetime.fromisoformat(end_time.replace("Z", "+00:00"))
+            latency_ms = (end - start).total_seconds() * 1000
+        except Exception:
+            pass
+    return (
+        obs["id"],
+        obs.get("traceId"),
+        obs.get("parentObservationId"),
+        obs.get("type"),
+        obs.get("name"),
+        start_time,
+        end_time,
+        latency_ms,
+        obs.get("model"),
+        obs.get("totalTokens"),
+        obs.get("promptTokens"),
+        obs.get("completionTokens"),
+        obs.get("calculatedTotalCost"),
+        json.dumps(obs.get("input")) if obs.get("input") else None,
+        json.dumps(obs.get("output")) if obs.get("output") else None,
+        json.dumps(obs.get("metadata")) if obs.get("metadata") else None,
+        obs.get("level"),
+        synced_at,
+    )
+
+
+async def upsert_rows(
+    db: aiosqlite.Connection,
+    sql: str,
+    rows: Iterable[tuple],
+    batch_size: int | None = None,
+) -> int:
+    """Write rows with one `executemany` per chunk, in the caller's transaction.
+
+    Each chunk crosses the aiosqlite thread boundary once instead of once per
+    row. Returns the number of rows inserted or changed.
+    """
+    batch_size = batch_size or settings.sync_batch_size
+    changes_before = db.total_changes
+    chunk: list[tuple] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= batch_size:
+            await db.executemany(sql, chunk)
+            chunk = []
+    if chunk:
+        await db.executemany(sql, chunk)
+    return db.total_changes - changes_before
+
+
+PageFetcher = Callable[[int], Awaitable[dict[str, Any]]]
 
 
 class SyncService:
-    """Background sync service for Langfuse data."""
+    """Background sync service for Langfuse data.
+
+    Each entity is ingested page by page: fetch a page, turn it into rows,
+    upsert them and record the page as a checkpoint in the same transaction.
+    Only the pages in flight are held in memory. If a sync stops part-way
+    (rate limit, error, restart), the next one resumes after the last
+    committed page, provided it lists the same query.
+
+    Every entity is fetched incrementally from a high-water mark in
+    `sync_metadata` (session createdAt, trace timestamp, observation
+    startTime), minus `sync_overlap_seconds` so that recent rows that are
+    still being updated (end time, cost) are fetched again. Once every
+    `sync_reconcile_interval_seconds`, a reconciliation pass lists everything
+    to pick up late updates to older rows.
+
+    One instance serves the whole app (scheduler, startup and the trigger
+    endpoint), so every fetch goes through one client and one rate limiter.
+    Syncs never overlap: a sync requested while one is running is skipped,
+    since two would race on the same checkpoints.
+    """
 
     def __init__(self):
         self.client = LangfuseClient()
         self._last_sync_counts: dict[str, int] = {}
+        self._running = asyncio.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._running.locked()
 
     async def sync(self) -> None:
         """Main sync entry point."""
+        if self._running.locked():
+            logger.info("Sync already running, skipping")
+            return
+        async with self._running:
+            await self._sync()
+
+    async def _sync(self) -> None:
         try:
             logger.info("Starting Langfuse sync...")
             await self._update_status("running")
 
+            marks = await self._get_high_water_marks()
+            reconcile = self._reconcile_due(marks["last_reconciled_at"])
+            if reconcile:
+                logger.info("Reconciliation pass: listing all sessions, traces and observations")
+
             # 1. Sync sessions
-            session_count = await self._sync_sessions()
+            session_count = await self._sync_sessions(
+                None if reconcile else marks["last_session_created_at"]
+            )
             logger.info(f"Synced {session_count} sessions")
 
             # 2. Sync traces
-            trace_count = await self._sync_traces()
+            trace_count = await self._sync_traces(
+                None if reconcile else marks["last_trace_timestamp"]
+            )
             logger.info(f"Synced {trace_count} traces")
 
             # 3. Sync observations for traces
-            obs_count = await self._sync_observations()
+            obs_count = await self._sync_observations(
+                None if reconcile else marks["last_observation_start_time"]
+            )
             logger.info(f"Synced {obs_count} observations")
 
+            if reconcile:
+                await self._set_reconciled()
+
             # 4. Refresh caches
             await self._refresh_session_stats()
             await self._refresh_agent_stats()
@@ -54,7 +226,7 @@ class SyncService:
         except RateLimitError as e:
             logger.warning(f"Rate limited during sync: {e}")
             await self._update_status("rate_limited", str(e))
-            # Will retry next cycle
+            # Will resume from the last checkpoint next cycle
 
         except Exception as e:
             logger.error(f"Sync failed: {e}")
@@ -78,251 +250,280 @@ class SyncService:
             )
             await db.commit()
 
-    async def _get_last_trace_timestamp(self) -> str | None:
-        """Get last synced trace timestamp for incremental sync."""
-        async with get_db() as db:
+    async def _get_high_water_marks(self) -> dict[str, str | None]:
+        """Per-entity high-water marks and the time of the last reconciliation."""
+        columns = (
+            "last_session_created_at",
+            "last_trace_timestamp",
+            "last_observation_start_time",
+            "last_reconciled_at",
+        )
+        async with get_read_db() as db:
             cursor = await db.execute(
-                "SELECT last_trace_timestamp FROM sync_metadata WHERE id = 1"
+                f"SELECT {', '.join(columns)} FROM sync_metadata WHERE id = 1"
             )
             row = await cursor.fetchone()
-            return row["last_trace_timestamp"] if row else None
+        return {column: row[column] if row else None for column in columns}
+
+    @staticmethod
+    def _reconcile_due(last_reconciled_at: str | None) -> bool:
+        if not last_reconciled_at:
+            return True
+        last = datetime.fromisoformat(last_reconciled_at.replace("Z", "+00:00"))
+        age = datetime.now(timezone.utc) - last
+        return age.total_seconds() >= settings.sync_reconcile_interval_seconds
 
-    async def _set_last_trace_timestamp(self, timestamp: str) -> None:
-        """Update last synced trace timestamp."""
+    async def _set_reconciled(self) -> None:
         async with get_db() as db:
             await db.execute(
-                "UPDATE sync_metadata SET last_trace_timestamp = ? WHERE id = 1",
-                (timestamp,),
+                "UPDATE sync_metadata SET last_reconciled_at = ? WHERE id = 1",
+                (datetime.now(timezone.utc).isoformat(),),
             )
             await db.commit()
 
-    async def _sync_sessions(self) -> int:
-        """Sync ALL sessions from Langfuse with full pagination."""
-        sessions = []
-        page = 1
-        total_items = None
-
-        while True:
-            result = await self.client.get_sessions(limit=100, page=page)
-            batch = result.get("data", [])
-            meta = result.get("meta", {})
-
-            if total_items is None:
-                total_items = meta.get("totalItems", 0)
-                logger.info(f"Langfuse reports {total_items} total sessions")
-
-            if not batch:
-                break
-            sessions.extend(batch)
-
-            # Check if we've fetched all pages
-            total_pages = meta.get("totalPages", 1)
-            if page >= total_pages:
-                break
-            page += 1
-            # Delay between requests to avoid rate limits
-            await asyncio.sleep(REQUEST_DELAY_MS / 1000)
-
-        # Verify we got all items
-        if total_items and len(sessions) < total_items:
-            logger.warning(
-                f"Session sync incomplete: got {len(sessions)} of {total_items}"
-            )
+    async def _advance_high_water_mark(self, column: str, query: str) -> None:
+        """Set `column` to the newest value of `query` once an entity is fully synced.
 
+        Sessions and observations are listed newest first (the API has no sort
+        order for them), so their mark can only move after every page has been
+        committed. Their listings end at the run's `_listing_end`, so rows that
+        arrive mid-run can't shift older rows past the last page.
+        """
         async with get_db() as db:
-            for session in sessions:
-                await db.execute(
-                    """
-                    INSERT OR REPLACE INTO sessions (id, created_at, environment, synced_at)
-                    VALUES (?, ?, ?, ?)
-                    """,
-                    (
-                        session["id"],
-                        session.get("createdAt", ""),
-                        session.get("environment", ""),
-                        datetime.now(timezone.utc).isoformat(),
-                    ),
-                )
+            await db.execute(
+                f"""
+                UPDATE sync_metadata SET {column} = ({query})
+                WHERE id = 1 AND ({query}) IS NOT NULL
+                """
+            )
             await db.commit()
 
-        self._last_sync_counts["sessions"] = len(sessions)
-        return len(sessions)
-
-    async def _sync_traces(self) -> int:
-        """Sync traces from Langfuse with incremental sync and full pagination."""
-        # Get last sync timestamp for incremental sync
-        last_timestamp = await self._get_last_trace_timestamp()
-        is_incremental = last_timestamp is not None
-
-        if is_incremental:
-            logger.info(f"Incremental trace sync from {last_timestamp}")
-        else:
-            logger.info("Full trace sync (initial)")
-
-        traces = []
-        page = 1
-        total_items = None
-        latest_timestamp = last_timestamp  # Track newest timestamp seen
-
-        while True:
-            result = await self.client.get_traces(
-                limit=100,
-                page=page,
-                from_timestamp=last_timestamp,
-                order_by="timestamp.asc",  # Oldest first for resume support
+    @staticmethod
+    def _fetch_from(high_water_mark: str | None) -> str | None:
+        """Lower bound of an incremental fetch: the mark minus the overlap window."""
+        if not high_water_mark:
+            return None
+        try:
+            mark = datetime.fromisoformat(high_water_mark.replace("Z", "+00:00"))
+        except ValueError:
+            return high_water_mark
+        start = mark - timedelta(seconds=settings.sync_overlap_seconds)
+        return start.astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
+
+    async def _listing_end(self, entity: str, query: dict[str, Any]) -> str:
+        """Upper time bound for a newest-first listing of `entity` with `query`.
+
+        Without one, rows created during the run would be inserted at the head of
+        the listing and push the oldest rows past the last page. A run resuming
+        a checkpoint reuses that run's bound, so its page numbers still line up.
+        """
+        async with get_read_db() as db:
+            cursor = await db.execute(
+                "SELECT query_json FROM sync_checkpoints WHERE entity = ?", (entity,)
             )
-            batch = result.get("data", [])
-            meta = result.get("meta", {})
-
-            if total_items is None:
-                total_items = meta.get("totalItems", 0)
-                logger.info(f"Langfuse reports {total_items} traces to sync")
-
-            if not batch:
-                break
-
-            traces.extend(batch)
-
-            # Track the latest timestamp for next incremental sync
-            for trace in batch:
-                ts = trace.get("timestamp")
-                if ts and (latest_timestamp is None or ts > latest_timestamp):
-                    latest_timestamp = ts
-
-            # Check if we've fetched all pages
-            total_pages = meta.get("totalPages", 1)
-            if page >= total_pages:
-                break
-            page += 1
-            # Delay between requests to avoid rate limits
-            await asyncio.sleep(REQUEST_DELAY_MS / 1000)
-
-        # Verify we got all items
-        if total_items and len(traces) < total_items:
-            logger.warning(
-                f"Trace sync incomplete: got {len(traces)} of {total_items}"
+            row = await cursor.fetchone()
+        if row is not None:
+            checkpoint = json.loads(row["query_json"])
+            end = checkpoint.pop("to", None)
+            if end and checkpoint == query:
+                return end
+        return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+    async def _load_checkpoint(self, entity: str, query: str) -> tuple[int, int]:
+        """(last committed page, items committed) of an interrupted run of `query`."""
+        async with get_read_db() as db:
+            cursor = await db.execute(
+                "SELECT query_json, page, items FROM sync_checkpoints WHERE entity = ?",
+                (entity,),
             )
-
+            row = await cursor.fetchone()
+        if row is None:
+            return 0, 0
+        if row["query_json"] != query:
+            logger.info(f"Discarding {entity} checkpoint for a different query")
+            return 0, 0
+        return row["page"], row["items"]
+
+    async def _clear_checkpoint(self, entity: str) -> None:
         async with get_db() as db:
-            for trace in traces:
-                metadata = trace.get("metadata", {}) or {}
-                tags = trace.get("tags", []) or []
-                chapter = next(
-                    (t for t in tags if t.startswith("chapter_")), None
-                )
-
-                await db.execute(
-                    """
-                    INSERT OR REPLACE INTO traces
-                    (id, session_id, user_id, name, timestamp, total_cost, latency,
-                     metadata_json, tags_json, chapter, mortal_name, match_name, synced_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        trace["id"],
-                        trace.get("sessionId"),
-                        trace.get("userId"),
-                        trace.get("name"),
-                        trace.get("timestamp"),
-                        trace.get("totalCost", 0),
-                        trace.get("latency", 0),
-                        json.dumps(metadata),
-                        json.dumps(tags),
-                        chapter,
-                        metadata.get("mortal"),
-                        metadata.get("match"),
-                        datetime.now(timezone.utc).isoformat(),
-                    ),
-                )
+            await db.execute("DELETE FROM sync_checkpoints WHERE entity = ?", (entity,))
             await db.commit()
 
-        # Update last trace timestamp for next incremental sync
-        if latest_timestamp:
-            await self._set_last_trace_timestamp(latest_timestamp)
-            logger.info(f"Updated last_trace_timestamp to {latest_timestamp}")
-
-        self._last_sync_counts["traces"] = len(traces)
-        return len(traces)
+    async def _pages(
+        self, entity: str, fetch: PageFetcher, first_page: int
+    ) -> AsyncIterator[tuple[int, list[dict[str, Any]], dict[str, Any]]]:
+        """Yield (page number, items, meta) from `first_page` until the last page.
+
+        The first page gives `totalPages`; the following pages are then fetched
+        up to `langfuse_max_concurrency` at a time (the client's token bucket
+        keeps the combined request rate in bounds) while earlier pages are
+        being written. Pages are still yielded in order, so a checkpoint at
+        page N means every page up to N is committed.
+        """
+        result = await fetch(first_page)
+        batch = result.get("data", [])
+        meta = result.get("meta", {})
+        logger.info(f"Langfuse reports {meta.get('totalItems', 0)} {entity} to sync")
+        if not batch:
+            return
+        yield first_page, batch, meta
+
+        total_pages = meta.get("totalPages", 1)
+        next_page = first_page + 1
+        in_flight: deque[tuple[int, asyncio.Task[dict[str, Any]]]] = deque()
+        try:
+            while next_page <= total_pages or in_flight:
+                while next_page <= total_pages and len(in_flight) < settings.langfuse_max_concurrency:
+                    in_flight.append((next_page, asyncio.create_task(fetch(next_page))))
+                    next_page += 1
+                page, task = in_flight.popleft()
+                result = await task
+                batch = result.get("data", [])
+                if not batch:
+                    return
+                yield page, batch, result.get("meta", {})
+        finally:
+            for _, task in in_flight:
+                task.cancel()
+            await asyncio.gather(*(task for _, task in in_flight), return_exceptions=True)
+
+    async def _ingest(
+        self,
+        entity: str,
+        fetch: PageFetcher,
+        query: dict[str, Any],
+        sql: str,
+        to_row: Callable[[dict[str, Any], str], tuple],
+        on_page: Callable[[aiosqlite.Connection, list[dict[str, Any]]], Awaitable[None]] | None = None,
+    ) -> int:
+        """Stream `entity` pages into SQLite, committing a checkpoint with each page.
+
+        `query` identifies the listing (its filters); a checkpoint is only resumed
+        by a run with the same query. `on_page` runs inside each page's
+        transaction. Returns the number of items ingested, including those
+        committed before a resume.
+        """
+        query_json = json.dumps(query, sort_keys=True)
+        last_page, items = await self._load_checkpoint(entity, query_json)
+        if last_page:
+            logger.info(f"Resuming {entity} sync after page {last_page} ({items} items committed)")
 
-    async def _sync_observations(self) -> int:
-        """Sync ALL observations from Langfuse with full pagination."""
-        observations = []
-        page = 1
         total_items = None
+        written = 0
+        async with aclosing(self._pages(entity, fetch, last_page + 1)) as pages:
+            async for page, batch, meta in pages:
+                if total_items is None:
+                    total_items = meta.get("totalItems", 0)
+                now = datetime.now(timezone.utc).isoformat()
+                async with get_db() as db:
+                    await db.execute("BEGIN")
+                    written += await upsert_rows(db, sql, (to_row(item, now) for item in batch))
+                    if on_page is not None:
+                        await on_page(db, batch)
+                    items += len(batch)
+                    await db.execute(
+                        """
+                        INSERT INTO sync_checkpoints (entity, query_json, page, items, updated_at)
+                        VALUES (?, ?, ?, ?, ?)
+                        ON CONFLICT(entity) DO UPDATE SET
+                            query_json = excluded.query_json, page = excluded.page,
+                            items = excluded.items, updated_at = excluded.updated_at
+                        """,
+                        (entity, query_json, page, items, now),
+                    )
+                    await db.commit()
+
+        await self._clear_checkpoint(entity)
 
-        while True:
-            result = await self.client.get_observations(limit=100, page=page)
-            batch = result.get("data", [])
-            meta = result.get("meta", {})
-
-            if total_items is None:
-                total_items = meta.get("totalItems", 0)
-                logger.info(f"Langfuse reports {total_items} total observations")
-
-            if not batch:
-                break
-            observations.extend(batch)
-
-            # Check if we've fetched all pages
-            total_pages = meta.get("totalPages", 1)
-            if page >= total_pages:
-                break
-            page += 1
-            # Delay between requests to avoid rate limits
-            await asyncio.sleep(REQUEST_DELAY_MS / 1000)
-
-        # Verify we got all items
-        if total_items and len(observations) < total_items:
+        # Verify we got all items (totalItems counts from the page we started at)
+        if not last_page and total_items and items < total_items:
             logger.warning(
-                f"Observation sync incomplete: got {len(observations)} of {total_items}"
+                f"{entity.capitalize()} sync incomplete: got {items} of {total_items}"
             )
+        logger.info(f"{entity.capitalize()}: {written} written, {items - written} unchanged")
+
+        self._last_sync_counts[entity] = items
+        return items
+
+    async def _sync_sessions(self, last_created_at: str | None) -> int:
+        """Sync sessions created since the high-water mark (all when None)."""
+        from_timestamp = self._fetch_from(last_created_at)
+        if from_timestamp:
+            logger.info(f"Incremental session sync from {from_timestamp}")
+        query: dict[str, Any] = {"from_timestamp": from_timestamp}
+        to_timestamp = await self._listing_end("sessions", query)
+        count = await self._ingest(
+            "sessions",
+            lambda page: self.client.get_sessions(
+                limit=100, page=page, from_timestamp=from_timestamp, to_timestamp=to_timestamp
+            ),
+            {**query, "to": to_timestamp},
+            UPSERT_SESSION,
+            session_row,
+        )
+        await self._advance_high_water_mark(
+            "last_session_created_at", "SELECT MAX(created_at) FROM sessions"
+        )
+        return count
 
-        async with get_db() as db:
-            for obs in observations:
-                start_time = obs.get("startTime")
-                end_time = obs.get("endTime")
-                latency_ms = None
-                if start_time and end_time:
-                    try:
-                        start = datetime.fromisoformat(start_time.replace("Z", "+00:00"))
-                        end = datetime.fromisoformat(end_time.replace("Z", "+00:00"))
-                        latency_ms = (end - start).total_seconds() * 1000
-                    except Exception:
-                        pass
+    async def _sync_traces(self, last_timestamp: str | None) -> int:
+        """Sync traces from Langfuse with incremental sync and full pagination.
 
+        Traces are listed oldest first, so `last_trace_timestamp` is advanced
+        with every committed page and is itself a resume point.
+        """
+        from_timestamp = self._fetch_from(last_timestamp)
+        if from_timestamp is not None:
+            logger.info(f"Incremental trace sync from {from_timestamp}")
+        else:
+            logger.info("Full trace sync")
+
+        async def advance_timestamp(db: aiosqlite.Connection, batch: list[dict[str, Any]]) -> None:
+            latest = max((t["timestamp"] for t in batch if t.get("timestamp")), default=None)
+            if latest:
+                # Track the latest timestamp for next incremental sync
                 await db.execute(
                     """
-                    INSERT OR REPLACE INTO observations
-                    (id, trace_id, parent_observation_id, type, name, start_time, end_time,
-                     latency_ms, model, total_tokens, prompt_tokens, completion_tokens,
-                     calculated_total_cost, input_json, output_json, metadata_json, level, synced_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    UPDATE sync_metadata SET last_trace_timestamp = ?
+                    WHERE id = 1 AND (last_trace_timestamp IS NULL OR last_trace_timestamp < ?)
                     """,
-                    (
-                        obs["id"],
-                        obs.get("traceId"),
-                        obs.get("parentObservationId"),
-                        obs.get("type"),
-                        obs.get("name"),
-                        start_time,
-                        end_time,
-                        latency_ms,
-                        obs.get("model"),
-                        obs.get("totalTokens"),
-                        obs.get("promptTokens"),
-                        obs.get("completionTokens"),
-                        obs.get("calculatedTotalCost"),
-                        json.dumps(obs.get("input")) if obs.get("input") else None,
-                        json.dumps(obs.get("output")) if obs.get("output") else None,
-                        json.dumps(obs.get("metadata")) if obs.get("metadata") else None,
-                        obs.get("level"),
-                        datetime.now(timezone.utc).isoformat(),
-                    ),
+                    (latest, latest),
                 )
-            await db.commit()
 
-        self._last_sync_counts["observations"] = len(observations)
-        return len(observations)
+        return await self._ingest(
+            "traces",
+            lambda page: self.client.get_traces(
+                limit=100,
+                page=page,
+                from_timestamp=from_timestamp,
+                order_by="timestamp.asc",  # Oldest first for resume support
+            ),
+            {"from_timestamp": from_timestamp},
+            UPSERT_TRACE,
+            trace_row,
+            on_page=advance_timestamp,
+        )
+
+    async def _sync_observations(self, last_start_time: str | None) -> int:
+        """Sync observations started since the high-water mark (all when None)."""
+        from_start_time = self._fetch_from(last_start_time)
+        if from_start_time:
+            logger.info(f"Incremental observation sync from {from_start_time}")
+        query: dict[str, Any] = {"from_start_time": from_start_time}
+        to_start_time = await self._listing_end("observations", query)
+        count = await self._ingest(
+            "observations",
+            lambda page: self.client.get_observations(
+                limit=100, page=page, from_start_time=from_start_time, to_start_time=to_start_time
+            ),
+            {**query, "to": to_start_time},
+            UPSERT_OBSERVATION,
+            observation_row,
+        )
+        await self._advance_high_water_mark(
+            "last_observation_start_time", "SELECT MAX(start_time) FROM observations"
+        )
+        return count
 
     async def _refresh_session_stats(self) -> None:
         """Refresh session statistics from traces."""
@@ -516,7 +717,7 @@ class SyncService:
 
     async def _verify_sync(self) -> None:
         """Verify sync completeness by comparing local counts vs synced counts."""
-        async with get_db() as db:
+        async with get_read_db() as db:
             # Get local counts
             cursor = await db.execute("SELECT COUNT(*) as cnt FROM sessions")
             local_sessions = (await cursor.fetchone())["cnt"]
@@ -546,7 +747,7 @@ class SyncService:
 
     async def get_status(self) -> dict[str, Any]:
         """Get current sync status."""
-        async with get_db() as db:
+        async with get_read_db() as db:
             cursor = await db.execute(
                 "SELECT sync_status, last_sync_at, error_message FROM sync_metadata WHERE id = 1"
             )
@@ -557,7 +758,6 @@ class SyncService:
                 if row["last_sync_at"]:
                     try:
                         last = datetime.fromisoformat(row["last_sync_at"].replace("Z", "+00:00"))
-                        from datetime import timedelta
                         next_sync = (last + timedelta(seconds=settings.sync_interval_seconds)).isoformat()
                     except Exception:
                         pass
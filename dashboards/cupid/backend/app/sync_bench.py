@@ -0,0 +1,127 @@
+"""Benchmark of the sync's SQLite write path on synthetic observations.
+
+Usage (from backend/):
+    python -m app.sync_bench
+    python -m app.sync_bench --rows 100000 --batch-size 1000
+
+Writes the same synthetic observations (Langfuse API shape) to a temporary
+database twice: once with the previous row-at-a-time `INSERT OR REPLACE`, one
+`await db.execute` per row, and once with the batched upserts the sync now uses.
+Each path ingests the rows into an empty table and then re-ingests them unchanged,
+which is what every sync cycle used to do for the whole history.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+import aiosqlite
+
+from app.database import SCHEMA
+from app.database.connection import ConnectionPool
+from app.services.sync_service import UPSERT_OBSERVATION, observation_row, upsert_rows
+
+LEGACY_INSERT = """
+    INSERT OR REPLACE INTO observations
+    (id, trace_id, parent_observation_id, type, name, start_time, end_time,
+     latency_ms, model, total_tokens, prompt_tokens, completion_tokens,
+     calculated_total_cost, input_json, output_json, metadata_json, level, synced_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+AGENTS = ["HasEnded", "Mortal", "Match", "CompatibilityAnalysis", "DisplayChoices", "End"]
+
+
+def synthetic_observations(count: int, seed: int = 0) -> list[dict[str, Any]]:
+    """Observations shaped like /api/public/observations results."""
+    rng = random.Random(seed)
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    observations = []
+    for i in range(count):
+        start = base + timedelta(seconds=i)
+        is_generation = i % 2 == 1
+        observations.append(
+            {
+                "id": f"obs-{i:07d}",
+                "traceId": f"trace-{i // 20:06d}",
+                "parentObservationId": f"obs-{i - 1:07d}" if is_generation else None,
+                "type": "GENERATION" if is_generation else "AGENT",
+                "name": rng.choice(AGENTS),
+                "startTime": start.isoformat().replace("+00:00", "Z"),
+                "endTime": (start + timedelta(milliseconds=rng.randint(200, 9000))).isoformat().replace("+00:00", "Z"),
+                "model": "gpt-5.1" if is_generation else None,
+                "totalTokens": rng.randint(100, 4000) if is_generation else None,
+                "promptTokens": rng.randint(50, 3000) if is_generation else None,
+                "completionTokens": rng.randint(50, 1000) if is_generation else None,
+                "calculatedTotalCost": rng.random() / 100 if is_generation else None,
+                "input": {"messages": [{"role": "user", "content": "x" * rng.randint(50, 400)}]},
+                "output": {"text": "y" * rng.randint(50, 400)},
+                "metadata": {"chapter": f"chapter_{i % 7}"},
+                "level": "DEFAULT",
+            }
+        )
+    return observations
+
+
+async def _legacy(db: aiosqlite.Connection, observations: list[dict[str, Any]]) -> int:
+    now = datetime.now(timezone.utc).isoformat()
+    for obs in observations:
+        await db.execute(LEGACY_INSERT, observation_row(obs, now))
+    await db.commit()
+    return len(observations)
+
+
+async def _batched(db: aiosqlite.Connection, observations: list[dict[str, Any]], batch_size: int) -> int:
+    now = datetime.now(timezone.utc).isoformat()
+    await db.execute("BEGIN")
+    written = await upsert_rows(db, UPSERT_OBSERVATION, (observation_row(obs, now) for obs in observations), batch_size)
+    await db.commit()
+    return written
+
+
+async def _measure(label: str, path: Path, observations: list[dict[str, Any]], batch_size: int | None) -> None:
+    pool = ConnectionPool(str(path), readers=0)
+    await pool.open()
+    try:
+        async with pool.writer() as db:
+            await db.executescript(SCHEMA)
+            await db.commit()
+            for phase in ("ingest", "re-sync"):
+                started = time.perf_counter()
+                if batch_size is None:
+                    written = await _legacy(db, observations)
+                else:
+                    written = await _batched(db, observations, batch_size)
+                seconds = time.perf_counter() - started
+                print(
+                    f"{label:<26} {phase:<8} {len(observations) / seconds:>10,.0f} rows/s"
+                    f"  ({seconds:6.2f} s, {written:,} rows written)"
+                )
+    finally:
+        await pool.close()
+
+
+async def run(rows: int, batch_size: int) -> None:
+    observations = synthetic_observations(rows)
+    with tempfile.TemporaryDirectory() as directory:
+        await _measure("row-at-a-time (before)", Path(directory) / "legacy.db", observations, None)
+        await _measure(f"executemany x{batch_size} (after)", Path(directory) / "batched.db", observations, batch_size)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(run(args.rows, args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
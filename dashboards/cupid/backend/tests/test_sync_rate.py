@@ -0,0 +1,108 @@
+"""Request-rate tests for SyncService against a local stub of the Langfuse API.
+
+Run from backend/ with `python -m pytest -q`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, AsyncIterator
+
+import pytest
+import uvicorn
+from fastapi import FastAPI, Response
+
+from app.config import settings
+from app.database import close_db, connection, get_read_db, init_db
+from app.fetch_bench import StubLangfuse
+from app.services import LangfuseClient, SyncService
+
+RATE = 20.0
+
+
+@asynccontextmanager
+async def _serve(app: FastAPI) -> AsyncIterator[str]:
+    """Serve `app` on a free local port and yield its base URL."""
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=0, log_level="warning"))
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+    port = server.servers[0].sockets[0].getsockname()[1]
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        server.should_exit = True
+        await serving
+
+
+@pytest.fixture(autouse=True)
+def _client_settings(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setattr(settings, "langfuse_requests_per_second", RATE)
+    monkeypatch.setattr(settings, "langfuse_burst", 1)
+    monkeypatch.setattr(settings, "langfuse_max_concurrency", 4)
+    monkeypatch.setattr(connection, "_db_path", str(tmp_path / "sync.db"))
+
+
+def test_sync_stays_under_the_configured_rate(monkeypatch: pytest.MonkeyPatch) -> None:
+    async def scenario() -> None:
+        # The stub itself never pushes back, so only the client limits the rate
+        stub = StubLangfuse(sessions=300, traces=2000, observations=2000, latency=0.05, limit=1000)
+        async with _serve(stub.app()) as base_url:
+            monkeypatch.setattr(settings, "langfuse_base_url", base_url)
+            await init_db()
+            service = SyncService()
+            try:
+                await service.sync()
+            finally:
+                await service.client.aclose()
+            async with get_read_db() as db:
+                cursor = await db.execute("SELECT COUNT(*) AS cnt FROM observations")
+                observations = (await cursor.fetchone())["cnt"]
+            await close_db()
+
+        # 3 + 20 + 20 pages, fetched 4 at a time
+        assert len(stub.request_times) == 43
+        assert stub.rejected == 0
+        # Requests reach the stub a few ms after they take their token, so a full
+        # second can catch one extra; a slightly shorter span cannot
+        assert stub.max_per_second(window=0.95) <= RATE
+        assert observations == 2000
+
+    asyncio.run(scenario())
+
+
+def test_retry_after_pauses_every_caller(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "langfuse_requests_per_second", 5.0)
+    arrivals: list[float] = []
+
+    app = FastAPI()
+
+    @app.get("/api/public/sessions")
+    async def sessions(response: Response, page: int = 1) -> dict[str, Any]:
+        arrivals.append(time.monotonic())
+        if len(arrivals) == 1:
+            response.status_code = 429
+            response.headers["Retry-After"] = "1"
+            return {"message": "rate limited"}
+        return {"data": [{"id": f"session-{page}"}], "meta": {"page": page, "totalPages": 4}}
+
+    async def scenario() -> None:
+        async with _serve(app) as base_url:
+            monkeypatch.setattr(settings, "langfuse_base_url", base_url)
+            client = LangfuseClient()
+            try:
+                results = await asyncio.gather(*(client.get_sessions(page=p) for p in range(1, 5)))
+            finally:
+                await client.aclose()
+
+        assert [r["data"][0]["id"] for r in results] == [f"session-{p}" for p in range(1, 5)]
+        assert client.rate_limited == 1
+        # The 429 came back before the next token, so no caller sent anything during the pause
+        rejected_at, *retried = arrivals
+        assert len(retried) == 4
+        assert min(retried) - rejected_at >= 1.0
+
+    asyncio.run(scenario())
@@ -11,11 +11,11 @@ from chatkit.types import (
     HiddenContextItem,
     ThreadItemDoneEvent,
 )
+from chatkit_store import ThreadStore
 from pydantic import ConfigDict, Field, ValidationError
 
 from .cat_state import CatState
 from .cat_store import CatStore
-from .memory_store import MemoryStore
 from .name_suggestions_widget import CatNameSuggestion, build_name_suggestions_widget
 from .profile_card_widget import profile_widget_copy_text, render_profile_card
 
@@ -67,7 +67,7 @@ MODEL = "gpt-4.1-mini"
 
 class CatAgentContext(AgentContext):
     model_config = ConfigDict(arbitrary_types_allowed=True)
-    store: Annotated[MemoryStore, Field(exclude=True)]
+    store: Annotated[ThreadStore, Field(exclude=True)]
     cats: Annotated[CatStore, Field(exclude=True)]
     request_context: dict[str, Any]
 
@@ -24,12 +24,12 @@ from chatkit.types import (
     UserMessageItem,
     WidgetItem,
 )
+from chatkit_store import ThreadStore, create_store
 from openai.types.responses import ResponseInputContentParam
 from pydantic import ValidationError
 
 from .cat_agent import CatAgentContext, cat_agent
 from .cat_store import CatStore
-from .memory_store import MemoryStore
 from .name_suggestions_widget import (
     SELECT_CAT_NAME_ACTION_TYPE,
     CatNameSelectionPayload,
@@ -45,7 +45,7 @@ class CatAssistantServer(ChatKitServer[dict[str, Any]]):
     """ChatKit server wired up with the virtual cat caretaker."""
 
     def __init__(self) -> None:
-        self.store: MemoryStore = MemoryStore()
+        self.store: ThreadStore = create_store()
         super().__init__(self.store)
 
         # Define additional instance variables for convenience.
@@ -23,6 +23,7 @@ from chatkit.types import (
     WidgetItem,
     WidgetRootUpdated,
 )
+from chatkit_store import create_store
 from fastapi import Depends, FastAPI, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import Response, StreamingResponse
@@ -41,7 +42,6 @@ from .meal_preferences import (
     build_meal_preference_widget,
     meal_preference_label,
 )
-from .memory_store import MemoryStore
 from .support_agent import state_manager, support_agent
 from .thread_item_converter import CustomerSupportThreadItemConverter
 from .title_agent import title_agent
@@ -87,7 +87,7 @@ class CustomerSupportServer(ChatKitServer[dict[str, Any]]):
         self,
         agent_state: AirlineStateManager,
     ) -> None:
-        store = MemoryStore()
+        store = create_store()
         super().__init__(store)
         self.store = store
         self.agent_state = agent_state
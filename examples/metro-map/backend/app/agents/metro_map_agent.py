@@ -13,10 +13,10 @@ from chatkit.types import (
     ProgressUpdateEvent,
     ThreadItemDoneEvent,
 )
+from chatkit_store import ThreadStore
 from pydantic import BaseModel, ConfigDict, Field
 
 from ..data.metro_map_store import Line, MetroMap, MetroMapStore, Station
-from ..memory_store import MemoryStore
 from ..request_context import RequestContext
 from ..widgets.line_select_widget import build_line_select_widget
 
@@ -69,7 +69,7 @@ INSTRUCTIONS = """
 
 class MetroAgentContext(AgentContext):
     model_config = ConfigDict(arbitrary_types_allowed=True)
-    store: Annotated[MemoryStore, Field(exclude=True)]
+    store: Annotated[ThreadStore, Field(exclude=True)]
     metro: Annotated[MetroMapStore, Field(exclude=True)]
     request_context: Annotated[RequestContext, Field(exclude=True)]
 
@@ -26,13 +26,13 @@ from chatkit.types import (
     UserMessageItem,
     WidgetItem,
 )
+from chatkit_store import ThreadStore, create_store
 from openai.types.responses import ResponseInputContentParam
 from pydantic import ValidationError
 
 from .agents.metro_map_agent import MetroAgentContext, metro_map_agent
 from .agents.title_agent import title_agent
 from .data.metro_map_store import MetroMapStore
-from .memory_store import MemoryStore
 from .request_context import RequestContext
 from .thread_item_converter import MetroMapThreadItemConverter
 from .widgets.line_select_widget import build_line_select_widget
@@ -42,7 +42,7 @@ class MetroMapServer(ChatKitServer[RequestContext]):
     """ChatKit server wired up with the metro map assistant."""
 
     def __init__(self) -> None:
-        self.store: MemoryStore = MemoryStore()
+        self.store: ThreadStore = create_store()
         super().__init__(self.store)
 
         data_dir = Path(__file__).resolve().parent / "data"
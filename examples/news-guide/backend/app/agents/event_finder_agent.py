@@ -11,10 +11,10 @@ from chatkit.types import (
     ProgressUpdateEvent,
     ThreadItemDoneEvent,
 )
+from chatkit_store import ThreadStore
 from pydantic import BaseModel, ConfigDict, Field
 
 from ..data.event_store import EventRecord, EventStore
-from ..memory_store import MemoryStore
 from ..request_context import RequestContext
 from ..widgets.event_list_widget import build_event_list_widget
 
@@ -45,7 +45,7 @@ MODEL = "gpt-4.1-mini"
 
 class EventFinderContext(AgentContext):
     model_config = ConfigDict(arbitrary_types_allowed=True)
-    store: Annotated[MemoryStore, Field(exclude=True)]
+    store: Annotated[ThreadStore, Field(exclude=True)]
     events: Annotated[EventStore, Field(exclude=True)]
     request_context: Annotated[RequestContext, Field(exclude=True, default_factory=RequestContext)]
 
@@ -157,7 +157,7 @@ def _events_to_json(events: List[EventRecord]) -> List[dict[str, Any]]:
 
 class EventSummaryContext(AgentContext):
     model_config = ConfigDict(arbitrary_types_allowed=True)
-    store: Annotated[MemoryStore, Field(exclude=True)]
+    store: Annotated[ThreadStore, Field(exclude=True)]
     events: Annotated[EventStore, Field(exclude=True)]
     request_context: Annotated[RequestContext, Field(exclude=True, default_factory=RequestContext)]
 
@@ -11,12 +11,12 @@ from chatkit.types import (
     ProgressUpdateEvent,
     ThreadItemDoneEvent,
 )
+from chatkit_store import ThreadStore
 from pydantic import BaseModel, ConfigDict, Field
 
 from ..agents.event_finder_agent import event_finder_agent
 from ..agents.puzzle_agent import puzzle_agent
 from ..data.article_store import ArticleMetadata, ArticleRecord, ArticleStore
-from ..memory_store import MemoryStore
 from ..request_context import RequestContext
 from ..widgets.article_list_widget import build_article_list_widget
 
@@ -80,7 +80,7 @@ FEATURED_PAGE_ID = "featured"
 
 class NewsAgentContext(AgentContext):
     model_config = ConfigDict(arbitrary_types_allowed=True)
-    store: Annotated[MemoryStore, Field(exclude=True)]
+    store: Annotated[ThreadStore, Field(exclude=True)]
     articles: Annotated[ArticleStore, Field(exclude=True)]
     request_context: Annotated[RequestContext, Field(exclude=True)]
 
@@ -4,9 +4,9 @@ from typing import Annotated
 
 from agents import Agent
 from chatkit.agents import AgentContext
+from chatkit_store import ThreadStore
 from pydantic import ConfigDict, Field
 
-from ..memory_store import MemoryStore
 from ..request_context import RequestContext
 
 INSTRUCTIONS = """
@@ -47,7 +47,7 @@ MODEL = "gpt-4.1-mini"
 
 class PuzzleAgentContext(AgentContext):
     model_config = ConfigDict(arbitrary_types_allowed=True)
-    store: Annotated[MemoryStore, Field(exclude=True)]
+    store: Annotated[ThreadStore, Field(exclude=True)]
     request_context: Annotated[RequestContext, Field(exclude=True, default_factory=RequestContext)]
 
 
@@ -26,6 +26,7 @@ from chatkit.types import (
     WidgetRootUpdated,
 )
 from chatkit.widgets import ListView
+from chatkit_store import ThreadStore, create_store
 from openai.types.responses import ResponseInputContentParam
 
 from .agents.event_finder_agent import EventFinderContext, event_finder_agent
@@ -34,7 +35,6 @@ from .agents.puzzle_agent import PuzzleAgentContext, puzzle_agent
 from .agents.title_agent import title_agent
 from .data.article_store import ArticleStore
 from .data.event_store import EventRecord, EventStore
-from .memory_store import MemoryStore
 from .request_context import RequestContext
 from .thread_item_converter import NewsGuideThreadItemConverter
 from .widgets.event_list_widget import build_event_list_widget
@@ -44,7 +44,7 @@ class NewsAssistantServer(ChatKitServer[RequestContext]):
     """ChatKit server wired up with the News Guide editorial assistant."""
 
     def __init__(self) -> None:
-        self.store: MemoryStore = MemoryStore()
+        self.store: ThreadStore = create_store()
         super().__init__(self.store)
 
         data_dir = Path(__file__).resolve().parent / "data"
@@ -0,0 +1,30 @@
+"""ChatKit Store implementations shared by the apps and examples.
+
+Backends:
+- `MemoryStore`: process-local, optional memory budget with spill-to-disk.
+- `SQLiteStore`: durable SQLite (WAL) store with a pooled async connection layer.
+- `LogStore`: MemoryStore made durable by an append-only log.
+
+Use `create_store()` to pick one from environment variables.
+"""
+
+from .base import DEFAULT_OWNER, LogCursor, ThreadItemLog, owner_of
+from .config import ThreadStore, create_store
+from .log import LogStore
+from .memory import MemoryBudget, MemoryStore, MemoryStoreMetrics
+from .sqlite import SQLiteConnectionPool, SQLiteStore
+
+__all__ = [
+    "DEFAULT_OWNER",
+    "LogCursor",
+    "LogStore",
+    "MemoryBudget",
+    "MemoryStore",
+    "MemoryStoreMetrics",
+    "SQLiteConnectionPool",
+    "SQLiteStore",
+    "ThreadItemLog",
+    "ThreadStore",
+    "create_store",
+    "owner_of",
+]
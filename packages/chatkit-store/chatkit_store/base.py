@@ -0,0 +1,84 @@
+"""Helpers shared by every store backend."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, List, Tuple, TypeVar
+
+from chatkit.types import Thread, ThreadItem, ThreadMetadata
+from pydantic import TypeAdapter
+
+TContext = TypeVar("TContext")
+
+# Partition shared by requests that don't identify a user.
+DEFAULT_OWNER = "anonymous"
+
+item_adapter: TypeAdapter[ThreadItem] = TypeAdapter(ThreadItem)
+
+
+def owner_of(context: Any) -> str:
+    """Return the storage partition for a context; unknown contexts share one partition.
+
+    Contexts opt into per-user partitioning by exposing an `owner_id` attribute.
+    """
+    return getattr(context, "owner_id", None) or DEFAULT_OWNER
+
+
+def sort_key(value: datetime) -> datetime:
+    """Normalize naive and aware timestamps so they can be compared."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def timestamp(value: datetime) -> float:
+    """Sortable epoch timestamp; naive datetimes are treated as UTC."""
+    return sort_key(value).timestamp()
+
+
+def thread_key(thread: ThreadMetadata) -> Tuple[datetime, str]:
+    """Position of a thread in the (created_at, id) thread index."""
+    return sort_key(thread.created_at), thread.id
+
+
+def thread_metadata(thread: ThreadMetadata | Thread) -> ThreadMetadata:
+    """Return a copy of the thread metadata without any embedded items."""
+    has_items = isinstance(thread, Thread) or "items" in getattr(
+        thread, "model_fields_set", set()
+    )
+    if not has_items:
+        return thread.model_copy(deep=True)
+
+    data = thread.model_dump()
+    data.pop("items", None)
+    return ThreadMetadata(**data).model_copy(deep=True)
+
+
+@dataclass(frozen=True)
+class LogCursor:
+    """Position in a thread's item log.
+
+    `seq` increases with every item appended to the thread. `epoch` changes
+    whenever existing history changes (an older item is saved or deleted, an
+    item is inserted out of order, or the thread is deleted or reloaded), which
+    invalidates everything a reader derived from the log.
+    """
+
+    epoch: int
+    seq: int
+
+
+@dataclass
+class ThreadItemLog:
+    """Items read from a thread's log by `load_item_log`.
+
+    `items` holds (seq, item) pairs in thread order. When `reset` is false they
+    are the items appended after the cursor the caller passed in; when it is
+    true the caller's view is stale and `items` holds the latest items instead.
+    Items are not copied and must be treated as read-only.
+    """
+
+    cursor: LogCursor
+    items: List[Tuple[int, ThreadItem]]
+    reset: bool
@@ -0,0 +1,136 @@
+"""Benchmark the store backends on the operations ChatKit servers hit hardest.
+
+Usage:
+    python -m chatkit_store.bench
+    python -m chatkit_store.bench --backends memory sqlite --sizes 1000 10000
+    python -m chatkit_store.bench --scenarios threads --sizes 1000 1000000
+
+Scenarios:
+- threads: `load_threads` pages (first pages and deep cursors) as the thread
+  count grows. Listing uses keyset pagination, so latency should stay flat.
+- append: `add_thread_item` into one thread, the write on every turn.
+- history: `load_thread_items` of the latest 100 items, the read on every turn.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, List
+
+from chatkit.store import Store
+from chatkit.types import InferenceOptions, ThreadMetadata, UserMessageItem, UserMessageTextContent
+
+from .log import LogStore
+from .memory import MemoryStore
+from .sqlite import SQLiteStore
+
+CONTEXT: dict[str, Any] = {}
+BASE_TIME = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def _make_store(backend: str, directory: Path) -> Store[Any]:
+    if backend == "memory":
+        return MemoryStore()
+    if backend == "sqlite":
+        return SQLiteStore(directory / "bench.db")
+    if backend == "log":
+        return LogStore(directory / "bench.jsonl")
+    raise ValueError(f"Unknown backend: {backend}")
+
+
+def _message(thread_id: str, index: int) -> UserMessageItem:
+    return UserMessageItem(
+        id=f"msg_{index:08d}",
+        thread_id=thread_id,
+        created_at=BASE_TIME + timedelta(seconds=index),
+        content=[UserMessageTextContent(text=f"Message number {index}")],
+        attachments=[],
+        inference_options=InferenceOptions(),
+    )
+
+
+async def _timed(operation: Callable[[int], Awaitable[Any]], count: int) -> List[float]:
+    timings = []
+    for i in range(count):
+        start = time.perf_counter()
+        await operation(i)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+async def bench_threads(store: Store[Any], size: int, operations: int) -> List[float]:
+    thread_ids = []
+    for i in range(size):
+        thread = ThreadMetadata(id=f"thr_{i:08d}", created_at=BASE_TIME + timedelta(seconds=i))
+        await store.save_thread(thread, CONTEXT)
+        thread_ids.append(thread.id)
+
+    async def list_page(i: int) -> None:
+        # Alternate first pages and deep cursors in both directions.
+        after = random.choice(thread_ids) if i % 2 else None
+        order = "desc" if i % 4 < 2 else "asc"
+        await store.load_threads(20, after, order, CONTEXT)
+
+    return await _timed(list_page, operations)
+
+
+async def bench_append(store: Store[Any], size: int, operations: int) -> List[float]:
+    for i in range(size):
+        await store.add_thread_item("thr_bench", _message("thr_bench", i), CONTEXT)
+
+    async def append(i: int) -> None:
+        await store.add_thread_item("thr_bench", _message("thr_bench", size + i), CONTEXT)
+
+    return await _timed(append, operations)
+
+
+async def bench_history(store: Store[Any], size: int, operations: int) -> List[float]:
+    for i in range(size):
+        await store.add_thread_item("thr_bench", _message("thr_bench", i), CONTEXT)
+
+    async def history(i: int) -> None:
+        await store.load_thread_items("thr_bench", None, 100, "desc", CONTEXT)
+
+    return await _timed(history, operations)
+
+
+SCENARIOS = {
+    "threads": bench_threads,
+    "append": bench_append,
+    "history": bench_history,
+}
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backends", nargs="+", default=["memory", "sqlite", "log"])
+    parser.add_argument("--scenarios", nargs="+", default=list(SCENARIOS), choices=SCENARIOS)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000])
+    parser.add_argument("--operations", type=int, default=1_000)
+    args = parser.parse_args()
+
+    print(f"{'scenario':>10}  {'backend':>8}  {'size':>10}  {'p50 ms':>8}  {'p99 ms':>8}")
+    for scenario in args.scenarios:
+        for backend in args.backends:
+            for size in args.sizes:
+                with tempfile.TemporaryDirectory(prefix="chatkit-store-bench-") as directory:
+                    store = _make_store(backend, Path(directory))
+                    timings = sorted(await SCENARIOS[scenario](store, size, args.operations))
+                    if isinstance(store, SQLiteStore):
+                        await store.pool.close()
+                    elif isinstance(store, LogStore):
+                        store.close()
+                p50 = statistics.median(timings)
+                p99 = timings[max(0, int(len(timings) * 0.99) - 1)]
+                print(f"{scenario:>10}  {backend:>8}  {size:>10}  {p50:>8.3f}  {p99:>8.3f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,69 @@
+"""Build a store from environment variables."""
+
+from __future__ import annotations
+
+import logging
+import os
+from pathlib import Path
+from typing import Any
+
+from .log import LogStore
+from .memory import MemoryBudget, MemoryStore
+from .sqlite import SQLiteStore
+
+logger = logging.getLogger(__name__)
+
+# Any backend returned by `create_store`; LogStore is a MemoryStore.
+ThreadStore = MemoryStore | SQLiteStore
+
+BACKENDS = ("memory", "sqlite", "log")
+
+
+def create_store(
+    env_prefix: str = "CHATKIT_STORE",
+    data_dir: str | Path = "data",
+    name: str = "threads",
+) -> ThreadStore:
+    """Build the thread store selected by `{env_prefix}_BACKEND`.
+
+    - `memory` (default): process-local, optionally bounded by a memory budget.
+    - `sqlite`: durable, shareable by several workers on one host.
+    - `log`: in-memory reads with an append-only log replayed on restart.
+
+    Durable backends write to `{env_prefix}_PATH`, defaulting to
+    `data_dir/name.db` (SQLite) or `data_dir/name.jsonl` (log). The memory and
+    log backends read an optional budget from `{env_prefix}_MAX_THREADS`,
+    `_MAX_ITEMS`, `_MAX_BYTES`, `_IDLE_TTL` and `_SPILL_DIR`.
+    """
+    backend = os.getenv(f"{env_prefix}_BACKEND", "memory").lower()
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown {env_prefix}_BACKEND: {backend}")
+
+    if backend == "memory":
+        return MemoryStore(**_memory_options(env_prefix))
+
+    suffix = ".db" if backend == "sqlite" else ".jsonl"
+    path = os.getenv(f"{env_prefix}_PATH") or str(Path(data_dir) / f"{name}{suffix}")
+    logger.info(f"Using {backend} thread store at {path}")
+    if backend == "sqlite":
+        return SQLiteStore(path)
+    return LogStore(path, **_memory_options(env_prefix))
+
+
+def _memory_options(env_prefix: str) -> dict[str, Any]:
+    """Read the optional MemoryStore budget and spill directory."""
+
+    def env_number(name: str, cast: type) -> Any:
+        value = os.getenv(f"{env_prefix}_{name}")
+        return cast(value) if value else None
+
+    budget = MemoryBudget(
+        max_threads=env_number("MAX_THREADS", int),
+        max_items=env_number("MAX_ITEMS", int),
+        max_bytes=env_number("MAX_BYTES", int),
+        idle_ttl_seconds=env_number("IDLE_TTL", float),
+    )
+    return {
+        "budget": None if budget == MemoryBudget() else budget,
+        "spill_dir": os.getenv(f"{env_prefix}_SPILL_DIR"),
+    }
@@ -0,0 +1,337 @@
+"""Append-only log store: MemoryStore semantics, made durable with a JSON lines op log.
+
+Every mutation is appended to a single log file as one JSON line and the log is
+replayed on startup. Writes are sequential appends, which makes this backend a
+cheap way to survive restarts without running a database; call `compact()`
+periodically to rewrite the log down to the live threads.
+
+A crash mid-append can leave a torn last line. Replay drops it and truncates the
+file back to the last complete record, so later appends start on a fresh line.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, BinaryIO, Dict, Iterator, List, Tuple
+
+from chatkit.types import Page, ThreadItem, ThreadMetadata
+
+from .base import LogCursor, TContext, ThreadItemLog, item_adapter, owner_of
+from .memory import MemoryBudget, MemoryStore
+
+logger = logging.getLogger(__name__)
+
+
+class LogStore(MemoryStore[TContext]):
+    """MemoryStore whose mutations are persisted to an append-only log file.
+
+    Reads are served from memory exactly as in `MemoryStore` (including the
+    optional memory budget); the log is only read back when the store opens.
+    With `fsync=True` every append is flushed to disk before returning; the
+    fsync runs on a worker thread so it doesn't block the event loop.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        budget: MemoryBudget | None = None,
+        spill_dir: str | Path | None = None,
+        fsync: bool = False,
+    ) -> None:
+        super().__init__(budget=budget, spill_dir=spill_dir)
+        self._path = Path(path)
+        self._fsync = fsync
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._log: BinaryIO | None = None
+        self._open_lock = asyncio.Lock()
+        # Held while syncing the log to disk and while compaction swaps the file
+        self._io_lock = asyncio.Lock()
+        self._compact_lock = asyncio.Lock()
+        # While compacting: records written since the snapshot, and spill files
+        # whose removal waits until the snapshot has been copied
+        self._compact_tail: List[Dict[str, Any]] | None = None
+        self._deferred_unlinks: List[Path] = []
+        # Held from applying a mutation until its record is written: the in-memory
+        # methods may await (spilling, rehydrating), and the log must keep their order
+        self._write_lock = asyncio.Lock()
+
+    # -- Log file --------------------------------------------------------
+    async def open(self) -> None:
+        """Replay the log into memory (idempotent)."""
+        if self._log is not None:
+            return
+        async with self._open_lock:
+            # Concurrent first requests must not replay the log twice
+            if self._log is not None:
+                return
+            if self._path.exists():
+                await self._replay()
+            self._log = self._path.open("ab")
+
+    def close(self) -> None:
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+    async def _replay(self) -> None:
+        count = 0
+        # Byte offset just past the last complete (newline-terminated) line
+        complete = 0
+        with self._path.open("rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # A crash mid-append leaves at most one torn line at the end.
+                    logger.warning(f"Dropping torn record at the end of {self._path}")
+                    break
+                complete += len(line)
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"Skipping unreadable record in {self._path}")
+                    continue
+                await self._apply(record)
+                count += 1
+        if complete < self._path.stat().st_size:
+            os.truncate(self._path, complete)
+        logger.info(f"Replayed {count} records from {self._path}")
+
+    async def _apply(self, record: Dict[str, Any]) -> None:
+        """Apply one record through the in-memory implementation, without logging it."""
+        op = record["op"]
+        context: Any = SimpleNamespace(owner_id=record.get("owner"))
+        if op == "thread":
+            await super().save_thread(ThreadMetadata.model_validate(record["data"]), context)
+        elif op == "item":
+            item = item_adapter.validate_python(record["data"])
+            await super().save_item(record["thread_id"], item, context)
+        elif op == "delete_item":
+            await super().delete_thread_item(record["thread_id"], record["item_id"], context)
+        elif op == "delete_thread":
+            await super().delete_thread(record["thread_id"], context)
+        elif op == "evict_owner":
+            await super().evict_owner(record["owner"])
+        else:
+            raise ValueError(f"Unknown log record: {op}")
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        assert self._log is not None
+        self._log.write(_encode(record))
+        if self._compact_tail is not None:
+            self._compact_tail.append(record)
+        if not self._fsync:
+            self._log.flush()
+
+    async def _sync(self) -> None:
+        """With `fsync=True`, flush and fsync the log on a worker thread."""
+        if not self._fsync:
+            return
+        async with self._io_lock:
+            log = self._log
+            if log is not None:
+                await asyncio.to_thread(_flush_and_sync, log)
+
+    async def compact(self) -> int:
+        """Rewrite the log so it only holds the live threads; returns the record count.
+
+        The live threads are snapshotted on the loop and written out on a worker
+        thread; spilled threads are copied from their spill files line by line,
+        so compaction doesn't pull them back into memory. Records written while
+        it runs are appended to the new log before it replaces the old one.
+        """
+        await self.open()
+        tmp_path = self._path.with_suffix(self._path.suffix + ".tmp")
+        async with self._compact_lock:
+            # No mutation is between applying and logging while the lock is held
+            async with self._write_lock:
+                snapshot = self._snapshot()
+                self._compact_tail = []
+            try:
+                count = await asyncio.to_thread(_write_snapshot, tmp_path, snapshot)
+                async with self._io_lock:
+                    while self._compact_tail:
+                        tail, self._compact_tail = self._compact_tail, []
+                        await asyncio.to_thread(_append_records, tmp_path, tail)
+                        count += len(tail)
+                    # Nothing awaits from the last check to the swap
+                    self.close()
+                    os.replace(tmp_path, self._path)
+                    self._log = self._path.open("ab")
+            finally:
+                self._compact_tail = None
+                tmp_path.unlink(missing_ok=True)
+                for path in self._deferred_unlinks:
+                    super()._unlink_spill(path)
+                self._deferred_unlinks.clear()
+        return count
+
+    def _snapshot(self) -> List[Tuple[str, ThreadMetadata, List[ThreadItem] | Path]]:
+        """(owner, thread, items or spill file) for every live thread, taken on the loop."""
+        snapshot: List[Tuple[str, ThreadMetadata, List[ThreadItem] | Path]] = []
+        for owner, index in self._owner_indexes.items():
+            for _, thread_id in index:
+                state = self._threads.get(thread_id)
+                if state is not None:
+                    # Stored items are never mutated in place, so references will do
+                    items = list(state.iter_from(None, "asc"))
+                    snapshot.append((owner, state.thread, items))
+                else:
+                    _, thread, path = self._spilled[thread_id]
+                    snapshot.append((owner, thread, path))
+        return snapshot
+
+    def _unlink_spill(self, path: Path) -> None:
+        # A running compaction may still have to copy this file
+        if self._compact_tail is not None:
+            self._deferred_unlinks.append(path)
+        else:
+            super()._unlink_spill(path)
+
+    # -- Mutations -------------------------------------------------------
+    async def save_thread(self, thread: ThreadMetadata, context: TContext) -> None:
+        await self.open()
+        async with self._write_lock:
+            await super().save_thread(thread, context)
+            self._write(_thread_record(owner_of(context), thread))
+        await self._sync()
+
+    async def delete_thread(self, thread_id: str, context: TContext) -> None:
+        await self.open()
+        async with self._write_lock:
+            await super().delete_thread(thread_id, context)
+            self._write({"op": "delete_thread", "owner": owner_of(context), "thread_id": thread_id})
+        await self._sync()
+
+    async def evict_owner(self, owner: str) -> int:
+        await self.open()
+        async with self._write_lock:
+            removed = await super().evict_owner(owner)
+            self._write({"op": "evict_owner", "owner": owner})
+        await self._sync()
+        return removed
+
+    async def add_thread_item(self, thread_id: str, item: ThreadItem, context: TContext) -> None:
+        await self.open()
+        async with self._write_lock:
+            await super().add_thread_item(thread_id, item, context)
+            self._write(_item_record(owner_of(context), thread_id, item))
+        await self._sync()
+
+    async def save_item(self, thread_id: str, item: ThreadItem, context: TContext) -> None:
+        await self.open()
+        async with self._write_lock:
+            await super().save_item(thread_id, item, context)
+            self._write(_item_record(owner_of(context), thread_id, item))
+        await self._sync()
+
+    async def delete_thread_item(self, thread_id: str, item_id: str, context: TContext) -> None:
+        await self.open()
+        async with self._write_lock:
+            await super().delete_thread_item(thread_id, item_id, context)
+            self._write(
+                {
+                    "op": "delete_item",
+                    "owner": owner_of(context),
+                    "thread_id": thread_id,
+                    "item_id": item_id,
+                }
+            )
+        await self._sync()
+
+    # -- Reads -----------------------------------------------------------
+    async def load_thread(self, thread_id: str, context: TContext) -> ThreadMetadata:
+        await self.open()
+        return await super().load_thread(thread_id, context)
+
+    async def load_threads(
+        self, limit: int, after: str | None, order: str, context: TContext
+    ) -> Page[ThreadMetadata]:
+        await self.open()
+        return await super().load_threads(limit, after, order, context)
+
+    async def load_thread_items(
+        self,
+        thread_id: str,
+        after: str | None,
+        limit: int,
+        order: str,
+        context: TContext,
+        *,
+        copy: bool = True,
+    ) -> Page[ThreadItem]:
+        await self.open()
+        return await super().load_thread_items(
+            thread_id, after, limit, order, context, copy=copy
+        )
+
+    async def load_item_log(
+        self, thread_id: str, after: LogCursor | None, limit: int, context: TContext
+    ) -> ThreadItemLog:
+        await self.open()
+        return await super().load_item_log(thread_id, after, limit, context)
+
+    async def load_item(self, thread_id: str, item_id: str, context: TContext) -> ThreadItem:
+        await self.open()
+        return await super().load_item(thread_id, item_id, context)
+
+
+def _thread_record(owner: str, thread: ThreadMetadata) -> Dict[str, Any]:
+    return {
+        "op": "thread",
+        "owner": owner,
+        "data": json.loads(thread.model_dump_json(exclude={"items"})),
+    }
+
+
+def _item_record(owner: str, thread_id: str, item: ThreadItem) -> Dict[str, Any]:
+    return _item_data_record(owner, thread_id, json.loads(item_adapter.dump_json(item)))
+
+
+def _item_data_record(owner: str, thread_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    return {"op": "item", "owner": owner, "thread_id": thread_id, "data": data}
+
+
+def _encode(record: Dict[str, Any]) -> bytes:
+    return (json.dumps(record, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def _snapshot_records(
+    snapshot: List[Tuple[str, ThreadMetadata, List[ThreadItem] | Path]],
+) -> Iterator[Dict[str, Any]]:
+    for owner, thread, items in snapshot:
+        yield _thread_record(owner, thread)
+        if isinstance(items, Path):
+            for line in MemoryStore._spilled_item_lines(items):
+                yield _item_data_record(owner, thread.id, json.loads(line))
+        else:
+            for item in items:
+                yield _item_record(owner, thread.id, item)
+
+
+def _write_snapshot(
+    path: Path, snapshot: List[Tuple[str, ThreadMetadata, List[ThreadItem] | Path]]
+) -> int:
+    count = 0
+    with path.open("wb") as f:
+        for record in _snapshot_records(snapshot):
+            f.write(_encode(record))
+            count += 1
+        f.flush()
+        os.fsync(f.fileno())
+    return count
+
+
+def _append_records(path: Path, records: List[Dict[str, Any]]) -> None:
+    with path.open("ab") as f:
+        f.writelines(_encode(record) for record in records)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _flush_and_sync(log: BinaryIO) -> None:
+    log.flush()
+    os.fsync(log.fileno())
@@ -0,0 +1,658 @@
+"""In-memory store compatible with the ChatKit Store interface."""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import itertools
+import json
+import logging
+import tempfile
+import time
+from bisect import bisect_left, bisect_right, insort
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+from chatkit.store import NotFoundError, Store
+from chatkit.types import Attachment, Page, ThreadItem, ThreadMetadata
+
+from .base import (
+    DEFAULT_OWNER,
+    LogCursor,
+    TContext,
+    ThreadItemLog,
+    item_adapter,
+    owner_of,
+    sort_key,
+    thread_key,
+    thread_metadata,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class MemoryBudget:
+    """Limits on what a MemoryStore keeps resident; `None` means unlimited.
+
+    When a limit is exceeded, or a thread has been idle for `idle_ttl_seconds`,
+    the least recently used threads are spilled to disk.
+    """
+
+    max_threads: int | None = None
+    max_items: int | None = None
+    max_bytes: int | None = None
+    idle_ttl_seconds: float | None = None
+
+
+@dataclass
+class MemoryStoreMetrics:
+    """Counters describing residency, spills and rehydrations."""
+
+    resident_threads: int = 0
+    resident_items: int = 0
+    resident_bytes: int = 0
+    spilled_threads: int = 0
+    spill_count: int = 0
+    rehydrate_count: int = 0
+    rehydrate_seconds_total: float = 0.0
+    last_rehydrate_ms: float = 0.0
+
+
+@dataclass
+class _ThreadState:
+    """Thread metadata plus its items kept in `created_at` order.
+
+    `items` is append-mostly: deleted items leave a `None` tombstone so that the
+    positions recorded in `positions` stay valid, and the list is compacted once
+    tombstones make up half of it. `sizes` holds the serialized size of each item
+    when the store tracks a byte budget.
+
+    Every write stamps the item with the next value of `seq`, giving each thread
+    an append-only log; `epoch` is replaced by the store whenever a write changes
+    existing history (see `LogCursor`).
+    """
+
+    thread: ThreadMetadata
+    owner: str = DEFAULT_OWNER
+    items: List[ThreadItem | None] = field(default_factory=list)
+    positions: Dict[str, int] = field(default_factory=dict)
+    sizes: Dict[str, int] = field(default_factory=dict)
+    tombstones: int = 0
+    nbytes: int = 0
+    epoch: int = 0
+    seq: int = 0
+    seqs: Dict[str, int] = field(default_factory=dict)
+
+    def get(self, item_id: str) -> ThreadItem | None:
+        position = self.positions.get(item_id)
+        return None if position is None else self.items[position]
+
+    def add(self, item: ThreadItem, size: int = 0) -> bool:
+        """Add an item; returns False if it had to be inserted before existing items."""
+        self._track(item.id, size)
+        self._stamp(item.id)
+        last = self._last()
+        if last is None or sort_key(last.created_at) <= sort_key(item.created_at):
+            self.positions[item.id] = len(self.items)
+            self.items.append(item)
+            return True
+
+        # Out-of-order insert (rare): place it after any items with the same timestamp.
+        self._compact()
+        position = bisect_right(
+            self.items,
+            sort_key(item.created_at),
+            key=lambda existing: sort_key(existing.created_at),
+        )
+        self.items.insert(position, item)
+        self._reindex(position)
+        return False
+
+    def replace(self, item: ThreadItem, size: int = 0) -> bool:
+        position = self.positions.get(item.id)
+        if position is None:
+            return False
+        self._track(item.id, size)
+        self._stamp(item.id)
+        self.items[position] = item
+        return True
+
+    def remove(self, item_id: str) -> bool:
+        position = self.positions.pop(item_id, None)
+        if position is None:
+            return False
+        self.nbytes -= self.sizes.pop(item_id, 0)
+        self.seqs.pop(item_id, None)
+        self.items[position] = None
+        self.tombstones += 1
+        if self.tombstones * 2 >= len(self.items):
+            self._compact()
+        return True
+
+    def iter_from(self, after: str | None, order: str) -> Iterator[ThreadItem]:
+        """Yield live items in `order`, starting just past `after` when it is known."""
+        descending = order == "desc"
+        position = self.positions.get(after) if after else None
+
+        if descending:
+            start = len(self.items) - 1 if position is None else position - 1
+            indexes = range(start, -1, -1)
+        else:
+            start = 0 if position is None else position + 1
+            indexes = range(start, len(self.items))
+
+        for index in indexes:
+            item = self.items[index]
+            if item is not None:
+                yield item
+
+    def iter_since(self, seq: int) -> Iterator[Tuple[int, ThreadItem]]:
+        """Yield (seq, item) for items appended after `seq`, in thread order.
+
+        Only valid while the epoch is unchanged: appends then only ever land at
+        the end of `items`, so this walks back from the end.
+        """
+        start = len(self.items)
+        while start > 0:
+            item = self.items[start - 1]
+            if item is not None and self.seqs[item.id] <= seq:
+                break
+            start -= 1
+        for item in self.items[start:]:
+            if item is not None:
+                yield self.seqs[item.id], item
+
+    def _stamp(self, item_id: str) -> None:
+        self.seq += 1
+        self.seqs[item_id] = self.seq
+
+    def _track(self, item_id: str, size: int) -> None:
+        self.nbytes += size - self.sizes.get(item_id, 0)
+        if size:
+            self.sizes[item_id] = size
+
+    def _last(self) -> ThreadItem | None:
+        for item in reversed(self.items):
+            if item is not None:
+                return item
+        return None
+
+    def _compact(self) -> None:
+        if not self.tombstones:
+            return
+        self.items = [item for item in self.items if item is not None]
+        self.tombstones = 0
+        self._reindex(0)
+
+    def _reindex(self, start: int) -> None:
+        for index in range(start, len(self.items)):
+            self.positions[self.items[index].id] = index
+
+
+class MemoryStore(Store[TContext]):
+    """In-memory store compatible with the ChatKit Store interface.
+
+    Items are copied on write, so the stored instances are never shared with
+    callers. Reads copy by default; hot paths that only read items (e.g. building
+    agent input) can pass `copy=False` to `load_thread_items` and must then treat
+    the returned items as read-only.
+
+    Threads are partitioned by owner (see `owner_of`): each owner has its own
+    thread index, so listing scales with that owner's threads and threads are
+    invisible to other owners.
+
+    `load_item_log` exposes each thread as an append-only log, so readers that
+    derive state from the history (e.g. converted agent input) can catch up on
+    just the new items.
+
+    With a `budget`, least recently used and idle threads are spilled to
+    gzip-compressed JSON lines files under `spill_dir` and rehydrated lazily the
+    next time they are accessed. Encoding, decoding and file I/O run on a worker
+    thread; only the swap between resident and spilled state happens on the loop.
+    """
+
+    def __init__(
+        self,
+        budget: MemoryBudget | None = None,
+        spill_dir: str | Path | None = None,
+    ) -> None:
+        self._threads: Dict[str, _ThreadState] = {}
+        # Per-owner sorted (created_at, id) keys so listing is a bisect plus a slice.
+        # Spilled threads keep their keys, so listings stay complete.
+        self._owner_indexes: Dict[str, List[Tuple[datetime, str]]] = {}
+        self._budget = budget
+        self._spill_dir = Path(spill_dir) if spill_dir else None
+        if budget is not None and self._spill_dir is None:
+            self._spill_dir = Path(tempfile.mkdtemp(prefix="chatkit-spill-"))
+        if self._spill_dir is not None:
+            self._spill_dir.mkdir(parents=True, exist_ok=True)
+        # thread id -> (owner, metadata, spill file) for threads that live on disk;
+        # listing reads the metadata from here without touching the spill file
+        self._spilled: Dict[str, Tuple[str, ThreadMetadata, Path]] = {}
+        # Rehydrations in progress, shared by every caller that needs the thread
+        self._rehydrating: Dict[str, asyncio.Task[_ThreadState | None]] = {}
+        # Each spill gets its own file, so a late writer or reader never touches
+        # the file of a newer spill of the same thread
+        self._spill_ids = itertools.count(1)
+        self._enforcing = False
+        # Resident thread ids, least recently used first, with last access time.
+        self._lru: OrderedDict[str, float] = OrderedDict()
+        self._metrics = MemoryStoreMetrics()
+        # Log epochs are unique across threads, so a deleted and recreated (or
+        # rehydrated) thread never reuses an epoch a reader may still hold.
+        self._epochs = itertools.count(1)
+
+    # -- Residency -------------------------------------------------------
+    def metrics(self) -> Dict[str, Any]:
+        """Return residency, spill and rehydration metrics."""
+        self._metrics.resident_threads = len(self._threads)
+        self._metrics.spilled_threads = len(self._spilled)
+        return asdict(self._metrics)
+
+    def _measure(self, item: ThreadItem) -> int:
+        if self._budget is None or self._budget.max_bytes is None:
+            return 0
+        return len(item_adapter.dump_json(item))
+
+    async def _resident(self, thread_id: str) -> _ThreadState | None:
+        """Return the thread's state, rehydrating it from disk if it was spilled."""
+        state = self._threads.get(thread_id)
+        if state is None and thread_id in self._spilled:
+            task = self._rehydrating.get(thread_id)
+            if task is None:
+                task = asyncio.ensure_future(self._rehydrate(thread_id))
+                task.add_done_callback(_consume_outcome)
+                self._rehydrating[thread_id] = task
+            # Shielded: a cancelled caller must not abort the swap for the others
+            await asyncio.shield(task)
+            # None if it was deleted meanwhile; it may also have been recreated
+            state = self._threads.get(thread_id)
+        if state is not None and self._budget is not None:
+            self._lru[thread_id] = time.monotonic()
+            self._lru.move_to_end(thread_id)
+        return state
+
+    async def _spill(self, thread_id: str) -> None:
+        """Write a resident thread to disk, then drop it from memory.
+
+        The thread stays resident while its file is written. If it is used or
+        changed in the meantime, the file is discarded and the thread kept.
+        """
+        assert self._spill_dir is not None
+        state = self._threads[thread_id]
+        thread, epoch, seq = state.thread, state.epoch, state.seq
+        last_access = self._lru.get(thread_id)
+        # Stored items are never mutated in place, so references are a snapshot
+        items = list(state.iter_from(None, "asc"))
+        path = self._spill_dir / f"{thread_id}.{next(self._spill_ids)}.jsonl.gz"
+        await asyncio.to_thread(_write_spill, path, state.owner, thread, items)
+
+        if (
+            self._threads.get(thread_id) is not state
+            or self._lru.get(thread_id) != last_access
+            or (state.thread, state.epoch, state.seq) != (thread, epoch, seq)
+        ):
+            path.unlink(missing_ok=True)
+            return
+        del self._threads[thread_id]
+        self._lru.pop(thread_id, None)
+        self._spilled[thread_id] = (state.owner, state.thread, path)
+        self._metrics.resident_items -= len(state.positions)
+        self._metrics.resident_bytes -= state.nbytes
+        self._metrics.spill_count += 1
+        logger.debug(f"Spilled thread {thread_id} ({len(state.positions)} items)")
+
+    @staticmethod
+    def _spilled_item_lines(path: Path) -> Iterator[str]:
+        """Stream the items of a spill file as JSON lines, without rehydrating them."""
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            f.readline()  # owner header
+            f.readline()  # thread metadata
+            for line in f:
+                yield line.rstrip("\n")
+
+    async def _rehydrate(self, thread_id: str) -> _ThreadState | None:
+        """Load a spilled thread back into memory; None if it was deleted meanwhile."""
+        started = time.perf_counter()
+        entry = self._spilled.get(thread_id)
+        try:
+            if entry is None:
+                return None
+            state = await asyncio.to_thread(_read_spill, entry[2], self._measure)
+        except FileNotFoundError:
+            if self._spilled.get(thread_id) is entry:
+                raise
+            return None
+        finally:
+            del self._rehydrating[thread_id]
+        if self._spilled.get(thread_id) is not entry:
+            return None
+        del self._spilled[thread_id]
+        self._unlink_spill(entry[2])
+        state.epoch = next(self._epochs)
+        self._threads[thread_id] = state
+        self._metrics.resident_items += len(state.positions)
+        self._metrics.resident_bytes += state.nbytes
+
+        elapsed = time.perf_counter() - started
+        self._metrics.rehydrate_count += 1
+        self._metrics.rehydrate_seconds_total += elapsed
+        self._metrics.last_rehydrate_ms = elapsed * 1000
+        return state
+
+    def _unlink_spill(self, path: Path) -> None:
+        path.unlink(missing_ok=True)
+
+    def _forget(self, thread_id: str) -> None:
+        """Remove a thread from memory and disk (the owner index is handled by callers)."""
+        state = self._threads.pop(thread_id, None)
+        self._lru.pop(thread_id, None)
+        if state is not None:
+            self._metrics.resident_items -= len(state.positions)
+            self._metrics.resident_bytes -= state.nbytes
+        else:
+            entry = self._spilled.pop(thread_id, None)
+            if entry is not None:
+                self._unlink_spill(entry[2])
+
+    def _over_budget(self) -> bool:
+        budget = self._budget
+        assert budget is not None
+        return (
+            (budget.max_threads is not None and len(self._threads) > budget.max_threads)
+            or (budget.max_items is not None and self._metrics.resident_items > budget.max_items)
+            or (budget.max_bytes is not None and self._metrics.resident_bytes > budget.max_bytes)
+        )
+
+    async def _enforce_budget(self, keep: str | None = None) -> None:
+        """Spill idle threads, then least recently used ones until under budget.
+
+        `keep` (the thread being worked on) is never spilled. Only one caller
+        spills at a time; the others leave it to that one.
+        """
+        if self._budget is None or self._enforcing:
+            return
+        self._enforcing = True
+        try:
+            ttl = self._budget.idle_ttl_seconds
+            now = time.monotonic()
+            for thread_id, last_access in list(self._lru.items()):
+                # Skip the caller's thread and threads used since the snapshot
+                if thread_id == keep or self._lru.get(thread_id) != last_access:
+                    continue
+                idle = ttl is not None and now - last_access > ttl
+                if not idle and not self._over_budget():
+                    break
+                await self._spill(thread_id)
+        finally:
+            self._enforcing = False
+
+    # -- Thread metadata -------------------------------------------------
+    async def load_thread(self, thread_id: str, context: TContext) -> ThreadMetadata:
+        state = await self._resident(thread_id)
+        if not state or state.owner != owner_of(context):
+            raise NotFoundError(f"Thread {thread_id} not found")
+        await self._enforce_budget(keep=thread_id)
+        return thread_metadata(state.thread)
+
+    async def save_thread(self, thread: ThreadMetadata, context: TContext) -> None:
+        metadata = thread_metadata(thread)
+        state = await self._resident(thread.id)
+        if state and state.owner != owner_of(context):
+            raise NotFoundError(f"Thread {thread.id} not found")
+        if state:
+            old_key = thread_key(state.thread)
+            state.thread = metadata
+            if old_key != thread_key(metadata):
+                self._unindex_thread(state.owner, old_key)
+                insort(self._owner_indexes.setdefault(state.owner, []), thread_key(metadata))
+        else:
+            self._add_thread_state(_ThreadState(thread=metadata, owner=owner_of(context)))
+        await self._enforce_budget(keep=thread.id)
+
+    async def load_threads(
+        self,
+        limit: int,
+        after: str | None,
+        order: str,
+        context: TContext,
+    ) -> Page[ThreadMetadata]:
+        """Return a page of the owner's threads by keyset pagination.
+
+        Costs O(log N + limit) in the owner's thread count; an unknown `after`
+        starts from the first page.
+        """
+        owner = owner_of(context)
+        index = self._owner_indexes.get(owner, [])
+        cursor = self._index_key(after, owner) if after else None
+
+        if order == "desc":
+            end = bisect_left(index, cursor) if cursor else len(index)
+            keys = index[max(0, end - limit - 1) : end][::-1]
+        else:
+            start = bisect_right(index, cursor) if cursor else 0
+            keys = index[start : start + limit + 1]
+
+        has_more = len(keys) > limit
+        slice_threads = [
+            thread_metadata(self._thread_metadata(thread_id)) for _, thread_id in keys[:limit]
+        ]
+        next_after = slice_threads[-1].id if has_more and slice_threads else None
+        return Page(data=slice_threads, has_more=has_more, after=next_after)
+
+    async def delete_thread(self, thread_id: str, context: TContext) -> None:
+        key = self._index_key(thread_id, owner_of(context))
+        if key is not None:
+            self._forget(thread_id)
+            self._unindex_thread(owner_of(context), key)
+
+    async def evict_owner(self, owner: str) -> int:
+        """Drop every thread belonging to `owner` in O(that owner's threads).
+
+        Returns the number of threads removed.
+        """
+        index = self._owner_indexes.pop(owner, [])
+        for _, thread_id in index:
+            self._forget(thread_id)
+        return len(index)
+
+    def _index_key(self, thread_id: str, owner: str) -> Tuple[datetime, str] | None:
+        """Return the thread's index key if it exists and belongs to `owner`."""
+        state = self._threads.get(thread_id)
+        if state is not None:
+            return thread_key(state.thread) if state.owner == owner else None
+        spilled = self._spilled.get(thread_id)
+        if spilled is not None and spilled[0] == owner:
+            return thread_key(spilled[1])
+        return None
+
+    def _thread_metadata(self, thread_id: str) -> ThreadMetadata:
+        """Metadata of a resident or spilled thread, without rehydrating it."""
+        state = self._threads.get(thread_id)
+        if state is not None:
+            return state.thread
+        return self._spilled[thread_id][1]
+
+    def _add_thread_state(self, state: _ThreadState) -> None:
+        state.epoch = next(self._epochs)
+        self._threads[state.thread.id] = state
+        insort(self._owner_indexes.setdefault(state.owner, []), thread_key(state.thread))
+        if self._budget is not None:
+            self._lru[state.thread.id] = time.monotonic()
+
+    def _unindex_thread(self, owner: str, key: Tuple[datetime, str]) -> None:
+        index = self._owner_indexes.get(owner)
+        if index is None:
+            return
+        position = bisect_left(index, key)
+        if position < len(index) and index[position] == key:
+            del index[position]
+        if not index:
+            del self._owner_indexes[owner]
+
+    # -- Thread items ----------------------------------------------------
+    async def _thread_state(self, thread_id: str, context: TContext) -> _ThreadState:
+        """Return the caller's thread, creating it if it doesn't exist yet.
+
+        A thread that belongs to another owner is reported as not found.
+        """
+        state = await self._resident(thread_id)
+        if state is None:
+            state = _ThreadState(
+                thread=ThreadMetadata(id=thread_id, created_at=datetime.now(timezone.utc)),
+                owner=owner_of(context),
+            )
+            self._add_thread_state(state)
+        elif state.owner != owner_of(context):
+            raise NotFoundError(f"Thread {thread_id} not found")
+        return state
+
+    async def load_thread_items(
+        self,
+        thread_id: str,
+        after: str | None,
+        limit: int,
+        order: str,
+        context: TContext,
+        *,
+        copy: bool = True,
+    ) -> Page[ThreadItem]:
+        """Return a page of items.
+
+        With `copy=False` the stored instances are returned as-is; callers must not
+        mutate them (writes go through `save_item`, which replaces the stored copy).
+        """
+        slice_items: List[ThreadItem] = []
+        state = await self._thread_state(thread_id, context)
+        for item in state.iter_from(after, order):
+            slice_items.append(item)
+            if len(slice_items) > limit:
+                break
+
+        has_more = len(slice_items) > limit
+        slice_items = slice_items[:limit]
+        if copy:
+            slice_items = [item.model_copy(deep=True) for item in slice_items]
+        await self._enforce_budget(keep=thread_id)
+        next_after = slice_items[-1].id if has_more and slice_items else None
+        return Page(data=slice_items, has_more=has_more, after=next_after)
+
+    async def load_item_log(
+        self,
+        thread_id: str,
+        after: LogCursor | None,
+        limit: int,
+        context: TContext,
+    ) -> ThreadItemLog:
+        """Return the items appended to the thread since `after`, without copying.
+
+        If `after` is None or from an older epoch, the log is reset and the latest
+        `limit` items are returned instead.
+        """
+        state = await self._thread_state(thread_id, context)
+        if after is not None and after.epoch == state.epoch:
+            items = list(state.iter_since(after.seq))
+            reset = False
+        else:
+            items = []
+            for item in state.iter_from(None, "desc"):
+                if len(items) == limit:
+                    break
+                items.append((state.seqs[item.id], item))
+            items.reverse()
+            reset = True
+        await self._enforce_budget(keep=thread_id)
+        return ThreadItemLog(cursor=LogCursor(state.epoch, state.seq), items=items, reset=reset)
+
+    async def add_thread_item(
+        self, thread_id: str, item: ThreadItem, context: TContext
+    ) -> None:
+        state = await self._thread_state(thread_id, context)
+        stored = item.model_copy(deep=True)
+        size = self._measure(stored)
+        if not state.add(stored, size):
+            state.epoch = next(self._epochs)
+        self._metrics.resident_items += 1
+        self._metrics.resident_bytes += size
+        await self._enforce_budget(keep=thread_id)
+
+    async def save_item(self, thread_id: str, item: ThreadItem, context: TContext) -> None:
+        state = await self._thread_state(thread_id, context)
+        stored = item.model_copy(deep=True)
+        size = self._measure(stored)
+        nbytes = state.nbytes
+        if state.replace(stored, size):
+            state.epoch = next(self._epochs)
+        else:
+            if not state.add(stored, size):
+                state.epoch = next(self._epochs)
+            self._metrics.resident_items += 1
+        self._metrics.resident_bytes += state.nbytes - nbytes
+        await self._enforce_budget(keep=thread_id)
+
+    async def load_item(self, thread_id: str, item_id: str, context: TContext) -> ThreadItem:
+        item = (await self._thread_state(thread_id, context)).get(item_id)
+        if item is None:
+            raise NotFoundError(f"Item {item_id} not found")
+        await self._enforce_budget(keep=thread_id)
+        return item.model_copy(deep=True)
+
+    async def delete_thread_item(
+        self, thread_id: str, item_id: str, context: TContext
+    ) -> None:
+        state = await self._thread_state(thread_id, context)
+        nbytes = state.nbytes
+        if state.remove(item_id):
+            state.epoch = next(self._epochs)
+            self._metrics.resident_items -= 1
+            self._metrics.resident_bytes += state.nbytes - nbytes
+        await self._enforce_budget(keep=thread_id)
+
+    # -- Files -----------------------------------------------------------
+    async def save_attachment(self, attachment: Attachment, context: TContext) -> None:
+        raise NotImplementedError(
+            "MemoryStore does not persist attachments. Provide a Store implementation "
+            "that enforces authentication and authorization before enabling uploads."
+        )
+
+    async def load_attachment(self, attachment_id: str, context: TContext) -> Attachment:
+        raise NotImplementedError(
+            "MemoryStore does not load attachments. Provide a Store implementation "
+            "that enforces authentication and authorization before enabling uploads."
+        )
+
+    async def delete_attachment(self, attachment_id: str, context: TContext) -> None:
+        raise NotImplementedError(
+            "MemoryStore does not delete attachments because they are never stored."
+        )
+
+
+def _write_spill(path: Path, owner: str, thread: ThreadMetadata, items: List[ThreadItem]) -> None:
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        f.write(json.dumps({"owner": owner}) + "\n")
+        f.write(thread.model_dump_json() + "\n")
+        for item in items:
+            f.write(item_adapter.dump_json(item).decode() + "\n")
+
+
+def _read_spill(path: Path, measure: Callable[[ThreadItem], int]) -> _ThreadState:
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        header = json.loads(f.readline())
+        state = _ThreadState(
+            thread=ThreadMetadata.model_validate_json(f.readline()),
+            owner=header["owner"],
+        )
+        for line in f:
+            item = item_adapter.validate_json(line)
+            state.add(item, measure(item))
+    return state
+
+
+def _consume_outcome(task: asyncio.Task[Any]) -> None:
+    # Callers that were cancelled never see the error; don't report it as unretrieved
+    if not task.cancelled():
+        task.exception()
@@ -0,0 +1,477 @@
+"""Durable SQLite-backed store compatible with the ChatKit Store interface.
+
+Threads and items are stored as JSON blobs (serialized once on write) next to
+the columns needed for keyset pagination. The database runs in WAL mode so
+readers never block the single writer, which lets several workers share one
+database file on the same host.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import AsyncIterator, List
+
+import aiosqlite
+from chatkit.store import NotFoundError, Store
+from chatkit.types import Attachment, Page, Thread, ThreadItem, ThreadMetadata
+
+from .base import LogCursor, TContext, ThreadItemLog, item_adapter, owner_of, timestamp
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS threads (
+    id TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    data TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_threads_owner_created_at ON threads(owner, created_at, id);
+
+CREATE TABLE IF NOT EXISTS thread_items (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    thread_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    data TEXT NOT NULL,
+    UNIQUE (thread_id, id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_thread_items_thread_created_at
+    ON thread_items(thread_id, created_at, seq);
+
+-- Log epoch per thread (see LogCursor); a missing row means epoch 0.
+CREATE TABLE IF NOT EXISTS thread_log_epochs (
+    thread_id TEXT PRIMARY KEY,
+    epoch INTEGER NOT NULL
+);
+"""
+
+# Item queries only see threads owned by the caller; binds (thread_id, owner).
+OWNED_THREAD = "thread_id IN (SELECT id FROM threads WHERE id = ? AND owner = ?)"
+
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+)
+
+
+class SQLiteConnectionPool:
+    """A single serialized writer connection plus a pool of reader connections.
+
+    WAL mode allows the readers to run concurrently with the writer, so
+    concurrent streaming responses don't queue up behind one connection.
+    Connections are opened lazily on first use, inside the running event loop.
+    """
+
+    def __init__(self, path: str | Path, readers: int = 4) -> None:
+        self._path = str(path)
+        self._reader_count = max(1, readers)
+        self._writer: aiosqlite.Connection | None = None
+        self._readers: asyncio.Queue[aiosqlite.Connection] = asyncio.Queue()
+        self._all_readers: List[aiosqlite.Connection] = []
+        self._write_lock = asyncio.Lock()
+        self._open_lock = asyncio.Lock()
+
+    async def _connect(self) -> aiosqlite.Connection:
+        db = await aiosqlite.connect(self._path)
+        for pragma in PRAGMAS:
+            await db.execute(pragma)
+        return db
+
+    async def open(self) -> None:
+        """Open the connections and create the schema (idempotent)."""
+        async with self._open_lock:
+            if self._writer is not None:
+                return
+            Path(self._path).parent.mkdir(parents=True, exist_ok=True)
+            writer = await self._connect()
+            await writer.executescript(SCHEMA)
+            await writer.commit()
+            for _ in range(self._reader_count):
+                reader = await self._connect()
+                self._all_readers.append(reader)
+                self._readers.put_nowait(reader)
+            self._writer = writer
+            logger.info(f"Opened SQLite store at {self._path} ({self._reader_count} readers)")
+
+    async def close(self) -> None:
+        """Close every connection in the pool."""
+        async with self._open_lock:
+            for reader in self._all_readers:
+                await reader.close()
+            self._all_readers.clear()
+            self._readers = asyncio.Queue()
+            if self._writer is not None:
+                await self._writer.close()
+                self._writer = None
+
+    @asynccontextmanager
+    async def reader(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Borrow a reader connection for the duration of the block."""
+        await self.open()
+        db = await self._readers.get()
+        try:
+            yield db
+        finally:
+            self._readers.put_nowait(db)
+
+    @asynccontextmanager
+    async def writer(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Run the block as one transaction on the serialized writer connection."""
+        await self.open()
+        async with self._write_lock:
+            assert self._writer is not None
+            try:
+                yield self._writer
+                await self._writer.commit()
+            except BaseException:
+                await self._writer.rollback()
+                raise
+
+
+class SQLiteStore(Store[TContext]):
+    """SQLite store compatible with the ChatKit Store interface.
+
+    Threads are partitioned by owner (see `owner_of`), matching `MemoryStore`.
+    The autoincrement `seq` of `thread_items` doubles as the item log sequence
+    for `load_item_log`.
+    """
+
+    def __init__(self, path: str | Path, readers: int = 4) -> None:
+        self.pool = SQLiteConnectionPool(path, readers=readers)
+
+    @staticmethod
+    def _serialize_thread(thread: ThreadMetadata | Thread) -> str:
+        """Serialize thread metadata without any embedded items."""
+        return thread.model_dump_json(exclude={"items"})
+
+    def _serialize_item(self, item: ThreadItem) -> str:
+        return item_adapter.dump_json(item).decode()
+
+    def _deserialize_item(self, data: str) -> ThreadItem:
+        return item_adapter.validate_json(data)
+
+    # -- Thread metadata -------------------------------------------------
+    async def load_thread(self, thread_id: str, context: TContext) -> ThreadMetadata:
+        async with self.pool.reader() as db:
+            cursor = await db.execute(
+                "SELECT data FROM threads WHERE id = ? AND owner = ?",
+                (thread_id, owner_of(context)),
+            )
+            row = await cursor.fetchone()
+        if row is None:
+            raise NotFoundError(f"Thread {thread_id} not found")
+        return ThreadMetadata.model_validate_json(row[0])
+
+    async def save_thread(self, thread: ThreadMetadata, context: TContext) -> None:
+        owner = owner_of(context)
+        async with self.pool.writer() as db:
+            cursor = await db.execute(
+                """
+                INSERT INTO threads (id, owner, created_at, data) VALUES (?, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET
+                    created_at = excluded.created_at,
+                    data = excluded.data
+                WHERE threads.owner = excluded.owner
+                """,
+                (thread.id, owner, timestamp(thread.created_at), self._serialize_thread(thread)),
+            )
+            if cursor.rowcount == 0:
+                raise NotFoundError(f"Thread {thread.id} not found")
+
+    async def load_threads(
+        self,
+        limit: int,
+        after: str | None,
+        order: str,
+        context: TContext,
+    ) -> Page[ThreadMetadata]:
+        descending = order == "desc"
+        direction = "DESC" if descending else "ASC"
+        comparison = "<" if descending else ">"
+        owner = owner_of(context)
+
+        async with self.pool.reader() as db:
+            cursor_row = None
+            if after:
+                cursor = await db.execute(
+                    "SELECT created_at, id FROM threads WHERE id = ? AND owner = ?",
+                    (after, owner),
+                )
+                cursor_row = await cursor.fetchone()
+
+            if cursor_row is None:
+                cursor = await db.execute(
+                    f"""
+                    SELECT data FROM threads
+                    WHERE owner = ?
+                    ORDER BY created_at {direction}, id {direction}
+                    LIMIT ?
+                    """,
+                    (owner, limit + 1),
+                )
+            else:
+                cursor = await db.execute(
+                    f"""
+                    SELECT data FROM threads
+                    WHERE owner = ? AND (created_at, id) {comparison} (?, ?)
+                    ORDER BY created_at {direction}, id {direction}
+                    LIMIT ?
+                    """,
+                    (owner, cursor_row[0], cursor_row[1], limit + 1),
+                )
+            rows = await cursor.fetchall()
+
+        threads = [ThreadMetadata.model_validate_json(row[0]) for row in rows]
+        has_more = len(threads) > limit
+        threads = threads[:limit]
+        next_after = threads[-1].id if has_more and threads else None
+        return Page(data=threads, has_more=has_more, after=next_after)
+
+    async def delete_thread(self, thread_id: str, context: TContext) -> None:
+        async with self.pool.writer() as db:
+            cursor = await db.execute(
+                "DELETE FROM threads WHERE id = ? AND owner = ?",
+                (thread_id, owner_of(context)),
+            )
+            if cursor.rowcount:
+                await db.execute("DELETE FROM thread_items WHERE thread_id = ?", (thread_id,))
+                await self._bump_epoch(db, thread_id)
+
+    async def evict_owner(self, owner: str) -> int:
+        """Drop every thread belonging to `owner`; returns the number removed."""
+        async with self.pool.writer() as db:
+            await db.execute(
+                """
+                INSERT INTO thread_log_epochs (thread_id, epoch)
+                SELECT id, 1 FROM threads WHERE owner = ?
+                ON CONFLICT(thread_id) DO UPDATE SET epoch = epoch + 1
+                """,
+                (owner,),
+            )
+            await db.execute(
+                """
+                DELETE FROM thread_items
+                WHERE thread_id IN (SELECT id FROM threads WHERE owner = ?)
+                """,
+                (owner,),
+            )
+            cursor = await db.execute("DELETE FROM threads WHERE owner = ?", (owner,))
+            return cursor.rowcount
+
+    # -- Thread items ----------------------------------------------------
+    @staticmethod
+    async def _bump_epoch(db: aiosqlite.Connection, thread_id: str) -> None:
+        """Invalidate readers of the thread's item log."""
+        await db.execute(
+            """
+            INSERT INTO thread_log_epochs (thread_id, epoch) VALUES (?, 1)
+            ON CONFLICT(thread_id) DO UPDATE SET epoch = epoch + 1
+            """,
+            (thread_id,),
+        )
+
+    async def _ensure_thread(
+        self, db: aiosqlite.Connection, thread_id: str, context: TContext
+    ) -> None:
+        """Create a placeholder thread row so items never reference a missing thread.
+
+        Raises NotFoundError if the thread belongs to another owner.
+        """
+        owner = owner_of(context)
+        thread = ThreadMetadata(id=thread_id, created_at=datetime.now(timezone.utc))
+        await db.execute(
+            "INSERT OR IGNORE INTO threads (id, owner, created_at, data) VALUES (?, ?, ?, ?)",
+            (thread_id, owner, timestamp(thread.created_at), self._serialize_thread(thread)),
+        )
+        cursor = await db.execute(
+            "SELECT 1 FROM threads WHERE id = ? AND owner = ?", (thread_id, owner)
+        )
+        if await cursor.fetchone() is None:
+            raise NotFoundError(f"Thread {thread_id} not found")
+
+    async def load_thread_items(
+        self,
+        thread_id: str,
+        after: str | None,
+        limit: int,
+        order: str,
+        context: TContext,
+        *,
+        copy: bool = True,
+    ) -> Page[ThreadItem]:
+        """Return a page of items.
+
+        Items are always freshly deserialized, so `copy` is accepted only for
+        interface parity with `MemoryStore`.
+        """
+        descending = order == "desc"
+        direction = "DESC" if descending else "ASC"
+        comparison = "<" if descending else ">"
+        owned = (thread_id, owner_of(context))
+
+        async with self.pool.reader() as db:
+            cursor_row = None
+            if after:
+                cursor = await db.execute(
+                    f"""
+                    SELECT created_at, seq FROM thread_items
+                    WHERE thread_id = ? AND id = ? AND {OWNED_THREAD}
+                    """,
+                    (thread_id, after, *owned),
+                )
+                cursor_row = await cursor.fetchone()
+
+            if cursor_row is None:
+                cursor = await db.execute(
+                    f"""
+                    SELECT data FROM thread_items
+                    WHERE thread_id = ? AND {OWNED_THREAD}
+                    ORDER BY created_at {direction}, seq {direction}
+                    LIMIT ?
+                    """,
+                    (thread_id, *owned, limit + 1),
+                )
+            else:
+                cursor = await db.execute(
+                    f"""
+                    SELECT data FROM thread_items
+                    WHERE thread_id = ? AND {OWNED_THREAD}
+                        AND (created_at, seq) {comparison} (?, ?)
+                    ORDER BY created_at {direction}, seq {direction}
+                    LIMIT ?
+                    """,
+                    (thread_id, *owned, cursor_row[0], cursor_row[1], limit + 1),
+                )
+            rows = await cursor.fetchall()
+
+        items = [self._deserialize_item(row[0]) for row in rows]
+        has_more = len(items) > limit
+        items = items[:limit]
+        next_after = items[-1].id if has_more and items else None
+        return Page(data=items, has_more=has_more, after=next_after)
+
+    async def add_thread_item(
+        self, thread_id: str, item: ThreadItem, context: TContext
+    ) -> None:
+        await self.save_item(thread_id, item, context)
+
+    async def load_item_log(
+        self,
+        thread_id: str,
+        after: LogCursor | None,
+        limit: int,
+        context: TContext,
+    ) -> ThreadItemLog:
+        """Return the items appended to the thread since `after` (see `MemoryStore`).
+
+        Raises NotFoundError if the thread belongs to another owner.
+        """
+        async with self.pool.reader() as db:
+            # One read transaction so the owner, the epoch and the items come from
+            # the same snapshot.
+            await db.execute("BEGIN")
+            try:
+                cursor = await db.execute(
+                    """
+                    SELECT
+                        (SELECT owner FROM threads WHERE id = ?),
+                        (SELECT epoch FROM thread_log_epochs WHERE thread_id = ?),
+                        (SELECT MAX(seq) FROM thread_items WHERE thread_id = ?)
+                    """,
+                    (thread_id, thread_id, thread_id),
+                )
+                owner, epoch, head = await cursor.fetchone()
+                if owner is not None and owner != owner_of(context):
+                    raise NotFoundError(f"Thread {thread_id} not found")
+                epoch, head = epoch or 0, head or 0
+                reset = after is None or after.epoch != epoch
+                if reset:
+                    cursor = await db.execute(
+                        """
+                        SELECT seq, data FROM thread_items
+                        WHERE thread_id = ?
+                        ORDER BY created_at DESC, seq DESC
+                        LIMIT ?
+                        """,
+                        (thread_id, limit),
+                    )
+                    rows = list(reversed(await cursor.fetchall()))
+                else:
+                    cursor = await db.execute(
+                        """
+                        SELECT seq, data FROM thread_items
+                        WHERE thread_id = ? AND seq > ?
+                        ORDER BY created_at, seq
+                        """,
+                        (thread_id, after.seq),
+                    )
+                    rows = await cursor.fetchall()
+            finally:
+                await db.commit()
+
+        items = [(seq, self._deserialize_item(data)) for seq, data in rows]
+        return ThreadItemLog(cursor=LogCursor(epoch, head), items=items, reset=reset)
+
+    async def save_item(self, thread_id: str, item: ThreadItem, context: TContext) -> None:
+        async with self.pool.writer() as db:
+            await self._ensure_thread(db, thread_id, context)
+            cursor = await db.execute(
+                """
+                SELECT
+                    EXISTS(SELECT 1 FROM thread_items WHERE thread_id = ? AND id = ?),
+                    COALESCE(
+                        (SELECT MAX(created_at) FROM thread_items WHERE thread_id = ?), 0
+                    ) > ?
+                """,
+                (thread_id, item.id, thread_id, timestamp(item.created_at)),
+            )
+            rewrites_history = any(await cursor.fetchone())
+            await db.execute(
+                """
+                INSERT INTO thread_items (thread_id, id, created_at, data) VALUES (?, ?, ?, ?)
+                ON CONFLICT(thread_id, id) DO UPDATE SET data = excluded.data
+                """,
+                (thread_id, item.id, timestamp(item.created_at), self._serialize_item(item)),
+            )
+            if rewrites_history:
+                await self._bump_epoch(db, thread_id)
+
+    async def load_item(self, thread_id: str, item_id: str, context: TContext) -> ThreadItem:
+        async with self.pool.reader() as db:
+            cursor = await db.execute(
+                f"SELECT data FROM thread_items WHERE thread_id = ? AND id = ? AND {OWNED_THREAD}",
+                (thread_id, item_id, thread_id, owner_of(context)),
+            )
+            row = await cursor.fetchone()
+        if row is None:
+            raise NotFoundError(f"Item {item_id} not found")
+        return self._deserialize_item(row[0])
+
+    async def delete_thread_item(
+        self, thread_id: str, item_id: str, context: TContext
+    ) -> None:
+        async with self.pool.writer() as db:
+            cursor = await db.execute(
+                f"DELETE FROM thread_items WHERE thread_id = ? AND id = ? AND {OWNED_THREAD}",
+                (thread_id, item_id, thread_id, owner_of(context)),
+            )
+            if cursor.rowcount:
+                await self._bump_epoch(db, thread_id)
+
+    # -- Files -----------------------------------------------------------
+    async def save_attachment(self, attachment: Attachment, context: TContext) -> None:
+        raise NotImplementedError("Attachments not supported")
+
+    async def load_attachment(self, attachment_id: str, context: TContext) -> Attachment:
+        raise NotImplementedError("Attachments not supported")
+
+    async def delete_attachment(self, attachment_id: str, context: TContext) -> None:
+        raise NotImplementedError("Attachments not supported")
@@ -0,0 +1,145 @@
+"""Randomized checks of `load_item_log` against full reads, on every backend.
+
+A reader that keeps the latest `limit` items by applying log deltas (as Cupid's
+incremental agent-input converter does) must always see the same window as a
+fresh `load_thread_items` call, through appends, rewrites, deletes, out-of-order
+inserts and spill/rehydrate cycles.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Deque, Tuple
+
+import pytest
+from chatkit.store import NotFoundError, Store
+from chatkit.types import InferenceOptions, ThreadMetadata, UserMessageItem, UserMessageTextContent
+
+from chatkit_store import LogCursor, LogStore, MemoryBudget, MemoryStore, SQLiteStore
+
+BASE_TIME = datetime(2025, 1, 1, tzinfo=timezone.utc)
+ALICE: Any = SimpleNamespace(owner_id="alice")
+BOB: Any = SimpleNamespace(owner_id="bob")
+LIMIT = 20
+
+
+def _message(thread_id: str, item_id: str, seconds: float, text: str) -> UserMessageItem:
+    return UserMessageItem(
+        id=item_id,
+        thread_id=thread_id,
+        created_at=BASE_TIME + timedelta(seconds=seconds),
+        content=[UserMessageTextContent(text=text)],
+        attachments=[],
+        inference_options=InferenceOptions(),
+    )
+
+
+def _make_store(backend: str, directory: Path) -> Store[Any]:
+    # A one-thread budget makes every switch between threads spill and rehydrate
+    budget = MemoryBudget(max_threads=1)
+    if backend == "memory":
+        return MemoryStore(budget=budget, spill_dir=directory / "spill")
+    if backend == "sqlite":
+        return SQLiteStore(directory / "store.db")
+    return LogStore(directory / "store.jsonl", budget=budget, spill_dir=directory / "spill")
+
+
+def _view(item: Any) -> Tuple[str, str]:
+    return item.id, item.content[0].text
+
+
+class _Reader:
+    """The converter's bookkeeping: a cursor plus the latest `limit` items."""
+
+    def __init__(self) -> None:
+        self.cursor: LogCursor | None = None
+        self.items: Deque[Tuple[str, str]] = deque(maxlen=LIMIT)
+
+    async def catch_up(self, store: Store[Any], thread_id: str) -> list[Tuple[str, str]]:
+        load_item_log = store.load_item_log  # type: ignore[attr-defined]
+        log = await load_item_log(thread_id, self.cursor, LIMIT, ALICE)
+        if self.cursor is None or log.reset:
+            self.items = deque(maxlen=LIMIT)
+        self.cursor = log.cursor
+        self.items.extend(_view(item) for _, item in log.items)
+        return list(self.items)
+
+
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("backend", ["memory", "sqlite", "log"])
+def test_item_log_matches_full_reads(backend: str, seed: int, tmp_path: Path) -> None:
+    async def scenario() -> None:
+        rng = random.Random(seed)
+        store = _make_store(backend, tmp_path)
+        thread_ids = ["thr_a", "thr_b"]
+        for thread_id in thread_ids:
+            await store.save_thread(ThreadMetadata(id=thread_id, created_at=BASE_TIME), ALICE)
+        readers = {thread_id: _Reader() for thread_id in thread_ids}
+        live: dict[str, list[str]] = {thread_id: [] for thread_id in thread_ids}
+        clock = 0.0
+
+        for step in range(150):
+            thread_id = rng.choice(thread_ids)
+            op = rng.random()
+            if op < 0.6 or not live[thread_id]:
+                clock += 1
+                item_id = f"msg_{step:04d}"
+                await store.add_thread_item(
+                    thread_id, _message(thread_id, item_id, clock, f"v0 {step}"), ALICE
+                )
+                live[thread_id].append(item_id)
+            elif op < 0.7:
+                # Out-of-order insert somewhere in the past
+                item_id = f"msg_{step:04d}"
+                seconds = rng.uniform(0, clock)
+                await store.add_thread_item(
+                    thread_id, _message(thread_id, item_id, seconds, f"v0 {step}"), ALICE
+                )
+                live[thread_id].append(item_id)
+            elif op < 0.85:
+                # Rewrite an existing item in place
+                item_id = rng.choice(live[thread_id])
+                item = await store.load_item(thread_id, item_id, ALICE)
+                item.content = [UserMessageTextContent(text=f"v{step} {item_id}")]
+                await store.save_item(thread_id, item, ALICE)
+            else:
+                item_id = rng.choice(live[thread_id])
+                await store.delete_thread_item(thread_id, item_id, ALICE)
+                live[thread_id].remove(item_id)
+
+            for reader_thread in rng.sample(thread_ids, k=rng.randint(1, 2)):
+                seen = await readers[reader_thread].catch_up(store, reader_thread)
+                page = await store.load_thread_items(reader_thread, None, LIMIT, "desc", ALICE)
+                assert seen == [_view(item) for item in reversed(page.data)], (step, reader_thread)
+
+        if isinstance(store, SQLiteStore):
+            await store.pool.close()
+        elif isinstance(store, LogStore):
+            store.close()
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("backend", ["memory", "sqlite", "log"])
+def test_item_log_is_isolated_by_owner(backend: str, tmp_path: Path) -> None:
+    async def scenario() -> None:
+        store = _make_store(backend, tmp_path)
+        await store.save_thread(ThreadMetadata(id="thr_a", created_at=BASE_TIME), ALICE)
+        await store.add_thread_item("thr_a", _message("thr_a", "msg_1", 1, "hi"), ALICE)
+
+        with pytest.raises(NotFoundError):
+            await store.load_item_log("thr_a", None, LIMIT, BOB)  # type: ignore[attr-defined]
+        log = await store.load_item_log("thr_a", None, LIMIT, ALICE)  # type: ignore[attr-defined]
+        assert [item.id for _, item in log.items] == ["msg_1"]
+
+        if isinstance(store, SQLiteStore):
+            await store.pool.close()
+        elif isinstance(store, LogStore):
+            store.close()
+
+    asyncio.run(scenario())
@@ -0,0 +1,287 @@
+"""Behaviour tests for the store backends: owner isolation, spilling and log replay.
+
+Run from packages/chatkit-store with `python -m pytest -q`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from chatkit.store import NotFoundError, Store
+from chatkit.types import InferenceOptions, ThreadMetadata, UserMessageItem, UserMessageTextContent
+
+from chatkit_store import LogStore, MemoryBudget, MemoryStore, SQLiteStore
+
+BASE_TIME = datetime(2025, 1, 1, tzinfo=timezone.utc)
+ALICE: Any = SimpleNamespace(owner_id="alice")
+BOB: Any = SimpleNamespace(owner_id="bob")
+
+
+def _thread(index: int) -> ThreadMetadata:
+    return ThreadMetadata(id=f"thr_{index:04d}", created_at=BASE_TIME + timedelta(seconds=index))
+
+
+def _message(thread_id: str, index: int) -> UserMessageItem:
+    return UserMessageItem(
+        id=f"msg_{thread_id}_{index:04d}",
+        thread_id=thread_id,
+        created_at=BASE_TIME + timedelta(seconds=index),
+        content=[UserMessageTextContent(text=f"Message number {index}")],
+        attachments=[],
+        inference_options=InferenceOptions(),
+    )
+
+
+async def _populate(store: Store[Any], threads: int, items: int, context: Any = ALICE) -> None:
+    for i in range(threads):
+        thread = _thread(i)
+        await store.save_thread(thread, context)
+        for j in range(items):
+            await store.add_thread_item(thread.id, _message(thread.id, j), context)
+
+
+async def _item_ids(store: Store[Any], thread_id: str, context: Any = ALICE) -> list[str]:
+    page = await store.load_thread_items(thread_id, None, 1000, "asc", context)
+    return [item.id for item in page.data]
+
+
+def _make_store(backend: str, directory: Path) -> Store[Any]:
+    if backend == "memory":
+        return MemoryStore()
+    if backend == "sqlite":
+        return SQLiteStore(directory / "store.db")
+    return LogStore(directory / "store.jsonl")
+
+
+@pytest.mark.parametrize("backend", ["memory", "sqlite", "log"])
+def test_items_are_isolated_by_owner(backend: str, tmp_path: Path) -> None:
+    async def scenario() -> None:
+        store = _make_store(backend, tmp_path)
+        await _populate(store, threads=1, items=3)
+        thread_id = _thread(0).id
+        item_id = _message(thread_id, 0).id
+
+        # Another owner's reads come back empty or not found, never with alice's items
+        assert (await store.load_threads(10, None, "asc", BOB)).data == []
+        try:
+            assert await _item_ids(store, thread_id, BOB) == []
+        except NotFoundError:
+            pass
+        with pytest.raises(NotFoundError):
+            await store.load_item(thread_id, item_id, BOB)
+        with pytest.raises(NotFoundError):
+            await store.add_thread_item(thread_id, _message(thread_id, 9), BOB)
+        try:
+            await store.delete_thread_item(thread_id, item_id, BOB)
+        except NotFoundError:
+            pass
+
+        assert len(await _item_ids(store, thread_id)) == 3
+        if isinstance(store, SQLiteStore):
+            await store.pool.close()
+
+    asyncio.run(scenario())
+
+
+def test_spilled_threads_are_listed_without_rehydrating(tmp_path: Path) -> None:
+    async def scenario() -> None:
+        store: MemoryStore[Any] = MemoryStore(
+            budget=MemoryBudget(max_threads=2), spill_dir=tmp_path / "spill"
+        )
+        await _populate(store, threads=5, items=3)
+        assert store.metrics()["spilled_threads"] == 3
+
+        page = await store.load_threads(10, None, "asc", ALICE)
+        assert [thread.id for thread in page.data] == [_thread(i).id for i in range(5)]
+        assert store.metrics()["rehydrate_count"] == 0
+
+        # Reading a spilled thread brings its items back intact
+        thread_id = _thread(0).id
+        assert await _item_ids(store, thread_id) == [_message(thread_id, j).id for j in range(3)]
+        assert store.metrics()["rehydrate_count"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_concurrent_reads_share_one_rehydration(tmp_path: Path) -> None:
+    async def scenario() -> None:
+        store: MemoryStore[Any] = MemoryStore(
+            budget=MemoryBudget(max_threads=1), spill_dir=tmp_path / "spill"
+        )
+        await _populate(store, threads=2, items=3)
+        thread_id = _thread(0).id
+        pages = await asyncio.gather(*(_item_ids(store, thread_id) for _ in range(5)))
+
+        assert pages == [[_message(thread_id, j).id for j in range(3)]] * 5
+        assert store.metrics()["rehydrate_count"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_concurrent_writes_survive_spilling(tmp_path: Path) -> None:
+    async def scenario() -> None:
+        store: MemoryStore[Any] = MemoryStore(
+            budget=MemoryBudget(max_threads=2), spill_dir=tmp_path / "spill"
+        )
+        await _populate(store, threads=6, items=2)
+
+        async def append(i: int) -> None:
+            thread_id = _thread(i % 6).id
+            await store.add_thread_item(thread_id, _message(thread_id, 2 + i // 6), ALICE)
+
+        await asyncio.gather(*(append(i) for i in range(36)))
+        for i in range(6):
+            thread_id = _thread(i).id
+            assert await _item_ids(store, thread_id) == [
+                _message(thread_id, j).id for j in range(8)
+            ]
+        metrics = store.metrics()
+        assert metrics["resident_threads"] + metrics["spilled_threads"] == 6
+        assert metrics["resident_items"] == 8 * metrics["resident_threads"]
+
+    asyncio.run(scenario())
+
+
+def test_deleting_an_item_enforces_the_budget(tmp_path: Path) -> None:
+    async def scenario() -> None:
+        store: MemoryStore[Any] = MemoryStore(
+            budget=MemoryBudget(max_threads=1), spill_dir=tmp_path / "spill"
+        )
+        await _populate(store, threads=2, items=2)
+        thread_id = _thread(0).id
+        await store.delete_thread_item(thread_id, _message(thread_id, 0).id, ALICE)
+
+        assert store.metrics()["rehydrate_count"] == 1
+        assert store.metrics()["resident_threads"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_log_replays_after_restart(tmp_path: Path) -> None:
+    async def scenario() -> None:
+        path = tmp_path / "store.jsonl"
+        store: LogStore[Any] = LogStore(path, fsync=True)
+        await _populate(store, threads=2, items=3)
+        await store.delete_thread_item(_thread(1).id, _message(_thread(1).id, 1).id, ALICE)
+        store.close()
+
+        reopened: LogStore[Any] = LogStore(path)
+        assert len(await _item_ids(reopened, _thread(0).id)) == 3
+        assert await _item_ids(reopened, _thread(1).id) == [
+            _message(_thread(1).id, 0).id,
+            _message(_thread(1).id, 2).id,
+        ]
+        reopened.close()
+
+    asyncio.run(scenario())
+
+
+def test_log_truncates_torn_tail_before_appending(tmp_path: Path) -> None:
+    async def scenario() -> None:
+        path = tmp_path / "store.jsonl"
+        store: LogStore[Any] = LogStore(path)
+        await _populate(store, threads=1, items=2)
+        store.close()
+        with path.open("ab") as f:
+            f.write(b'{"op":"item","owner":"alice","thre')
+
+        thread_id = _thread(0).id
+        reopened: LogStore[Any] = LogStore(path)
+        await reopened.add_thread_item(thread_id, _message(thread_id, 2), ALICE)
+        reopened.close()
+
+        assert path.read_bytes().endswith(b"\n")
+        restarted: LogStore[Any] = LogStore(path)
+        assert await _item_ids(restarted, thread_id) == [
+            _message(thread_id, j).id for j in range(3)
+        ]
+        restarted.close()
+
+    asyncio.run(scenario())
+
+
+def test_log_compaction_streams_spilled_threads(tmp_path: Path) -> None:
+    async def scenario() -> None:
+        path = tmp_path / "store.jsonl"
+        store: LogStore[Any] = LogStore(
+            path, budget=MemoryBudget(max_threads=1), spill_dir=tmp_path / "spill"
+        )
+        await _populate(store, threads=3, items=2)
+        await store.delete_thread(_thread(2).id, ALICE)
+        spilled = store.metrics()["spilled_threads"]
+
+        assert await store.compact() == 2 * 3
+        assert store.metrics()["spilled_threads"] == spilled
+        assert store.metrics()["rehydrate_count"] == 0
+        store.close()
+
+        reopened: LogStore[Any] = LogStore(path)
+        for i in range(2):
+            thread_id = _thread(i).id
+            assert await _item_ids(reopened, thread_id) == [
+                _message(thread_id, j).id for j in range(2)
+            ]
+        assert len((await reopened.load_threads(10, None, "asc", ALICE)).data) == 2
+        reopened.close()
+
+    asyncio.run(scenario())
+
+
+def test_concurrent_first_requests_replay_the_log_once(tmp_path: Path) -> None:
+    async def scenario() -> None:
+        path = tmp_path / "store.jsonl"
+        store: LogStore[Any] = LogStore(path)
+        await _populate(store, threads=2, items=3)
+        store.close()
+
+        reopened: LogStore[Any] = LogStore(path)
+        applied = 0
+        apply = reopened._apply
+
+        async def counting_apply(record: dict[str, Any]) -> None:
+            nonlocal applied
+            applied += 1
+            await asyncio.sleep(0)
+            await apply(record)
+
+        reopened._apply = counting_apply  # type: ignore[method-assign]
+        await asyncio.gather(*(_item_ids(reopened, _thread(i % 2).id) for i in range(4)))
+        assert applied == 2 * (1 + 3)
+        reopened.close()
+
+    asyncio.run(scenario())
+
+
+def test_log_compaction_keeps_writes_made_while_it_runs(tmp_path: Path) -> None:
+    async def scenario() -> None:
+        path = tmp_path / "store.jsonl"
+        store: LogStore[Any] = LogStore(
+            path, budget=MemoryBudget(max_threads=1), spill_dir=tmp_path / "spill"
+        )
+        await _populate(store, threads=3, items=2)
+
+        async def write() -> None:
+            for j in range(2, 5):
+                for i in range(3):
+                    thread_id = _thread(i).id
+                    await store.add_thread_item(thread_id, _message(thread_id, j), ALICE)
+                    await asyncio.sleep(0)
+
+        await asyncio.gather(store.compact(), write())
+        store.close()
+
+        reopened: LogStore[Any] = LogStore(path)
+        for i in range(3):
+            thread_id = _thread(i).id
+            assert await _item_ids(reopened, thread_id) == [
+                _message(thread_id, j).id for j in range(5)
+            ]
+        reopened.close()
+        assert not path.with_suffix(".jsonl.tmp").exists()
+
+    asyncio.run(scenario())